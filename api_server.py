@@ -0,0 +1,326 @@
+# api_server.py
+"""HTTP JSON API for YouTube Video Analyzer Pro"""
+import argparse
+import asyncio
+import json
+import logging
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from aiohttp import web
+
+from config.settings import API_SERVER_CONFIG, FEATURE_FLAGS
+
+logger = logging.getLogger(__name__)
+
+SESSION_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+EXPORT_KINDS = ('summary', 'full_report', 'transcript')
+MAX_PAGE_SIZE = 100
+
+def _json_error(error_class, message: str, **headers) -> web.HTTPException:
+    return error_class(
+        text=json.dumps({'error': message}),
+        content_type='application/json',
+        headers=headers or None
+    )
+
+class RequestGate:
+    """Admission control for blocking work handed to worker threads.
+    
+    At most `limit` requests run at once and up to `backlog` more wait for a slot;
+    anything beyond that is turned away with 429 at once, so overload shows up
+    as fast rejections rather than an ever-growing queue of slow requests.
+    """
+    
+    def __init__(self, limit: int, backlog: int):
+        self.limit = limit
+        self.backlog = backlog
+        self.running = 0
+        self.waiting = 0
+        self.rejected = 0
+        self._slots = asyncio.Semaphore(limit)
+    
+    async def run(self, fn, *args, **kwargs) -> Any:
+        if self._slots.locked() and self.waiting >= self.backlog:
+            self.rejected += 1
+            raise _json_error(web.HTTPTooManyRequests, "Server is busy, retry shortly", **{'Retry-After': '1'})
+        
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        
+        self.running += 1
+        try:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+        finally:
+            self.running -= 1
+            self._slots.release()
+
+def build_components(sessions_dir: Optional[Path] = None, jobs_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """The core objects the API serves, configured for a headless process"""
+    from core.youtube_handler import YouTubeHandler
+    from core.ai_processor import AIProcessor
+    from core.export_handler import ExportHandler
+    from core.session_manager import SessionManager
+    from core.analysis_jobs import AnalysisJobRunner
+    from core.task_pool import TaskPool
+    
+    task_pool = TaskPool()
+    youtube_handler = YouTubeHandler(task_pool=task_pool)
+    ai_processor = AIProcessor()
+    session_manager = SessionManager(sessions_dir)
+    
+    return {
+        'youtube_handler': youtube_handler,
+        'ai_processor': ai_processor,
+        'session_manager': session_manager,
+        'export_handler': ExportHandler(task_pool=task_pool),
+        'analysis_jobs': AnalysisJobRunner(youtube_handler, ai_processor, session_manager, jobs_dir=jobs_dir),
+        'task_pool': task_pool
+    }
+
+class ApiService:
+    """JSON endpoints over the same core objects the Streamlit app uses.
+    
+    Analyses run on the background job runner: submitting returns 202 with a job
+    ID to poll, and new submissions get 429 while max_pending_jobs are queued or
+    running. Reads and exports run on worker threads behind a RequestGate.
+    """
+    
+    def __init__(self, components: Dict[str, Any], config: Optional[Dict[str, Any]] = None):
+        self.components = components
+        self.config = {**API_SERVER_CONFIG, **(config or {})}
+        self.gate = RequestGate(self.config['max_concurrent_requests'], self.config['request_backlog'])
+        self.stats = {'submitted': 0, 'rejected_jobs': 0}
+        self._admitting = 0  # Submissions past the queue check but not yet queued
+    
+    def create_app(self) -> web.Application:
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.add_routes([
+            web.get('/api/health', self.health),
+            web.post('/api/analyses', self.submit_analysis),
+            web.get('/api/analyses/{job_id}', self.analysis_status),
+            web.delete('/api/analyses/{job_id}', self.cancel_analysis),
+            web.get('/api/sessions', self.list_sessions),
+            web.get('/api/sessions/{session_id}', self.get_session),
+            web.get('/api/sessions/{session_id}/export/{kind}', self.export_session)
+        ])
+        app.on_cleanup.append(self._shutdown)
+        return app
+    
+    async def health(self, request: web.Request) -> web.Response:
+        """Liveness plus queue and pool figures for monitoring"""
+        jobs = self.components['analysis_jobs'].get_stats()
+        return web.json_response({
+            'status': 'ok',
+            'jobs': jobs,
+            'pending_jobs': self._pending_jobs(jobs),
+            'max_pending_jobs': self.config['max_pending_jobs'],
+            'requests': {
+                'running': self.gate.running,
+                'waiting': self.gate.waiting,
+                'rejected': self.gate.rejected
+            },
+            'analyses': self.stats,
+            'cancellations': self.components['analysis_jobs'].stats,
+            'task_pool': self.components['task_pool'].get_metrics()
+        })
+    
+    async def submit_analysis(self, request: web.Request) -> web.Response:
+        """Queue an analysis of {"url", "settings"?, "video_info"?, "transcript"?}"""
+        from utils.validators import validate_youtube_url, validate_analysis_settings, validate_transcript_data
+        
+        body = await self._read_json(request)
+        url = body.get('url')
+        if not validate_youtube_url(url):
+            raise _json_error(web.HTTPBadRequest, "A valid YouTube URL is required")
+        
+        transcript_data = body.get('transcript')
+        if transcript_data is not None and not validate_transcript_data(transcript_data):
+            raise _json_error(web.HTTPBadRequest, "Invalid transcript")
+        
+        analysis_jobs = self.components['analysis_jobs']
+        if self._pending_jobs(analysis_jobs.get_stats()) + self._admitting >= self.config['max_pending_jobs']:
+            self.stats['rejected_jobs'] += 1
+            raise _json_error(web.HTTPTooManyRequests, "Analysis queue is full, retry shortly", **{'Retry-After': '5'})
+        
+        settings = validate_analysis_settings(body.get('settings') or {})
+        settings.pop('export_format')
+        
+        self._admitting += 1
+        try:
+            video_info = body.get('video_info')
+            if not video_info:
+                video_info = await self.gate.run(self.components['youtube_handler'].get_video_info, url)
+                if not video_info:
+                    raise _json_error(web.HTTPBadRequest, "Could not read video information")
+            
+            job_id = await asyncio.to_thread(analysis_jobs.submit, url, video_info, settings, transcript_data)
+        finally:
+            self._admitting -= 1
+        self.stats['submitted'] += 1
+        
+        location = f"/api/analyses/{job_id}"
+        return web.json_response({'job_id': job_id, 'status_url': location}, status=202,
+                                 headers={'Location': location})
+    
+    async def analysis_status(self, request: web.Request) -> web.Response:
+        status = self.components['analysis_jobs'].get_status(request.match_info['job_id'])
+        if status is None:
+            raise _json_error(web.HTTPNotFound, "Unknown job")
+        
+        if status['session_id']:
+            status['session_url'] = f"/api/sessions/{status['session_id']}"
+        return web.json_response(status, dumps=self._dumps)
+    
+    async def cancel_analysis(self, request: web.Request) -> web.Response:
+        """Stop a queued or running analysis; the sections it finished stay in its status"""
+        analysis_jobs = self.components['analysis_jobs']
+        job_id = request.match_info['job_id']
+        status = analysis_jobs.get_status(job_id)
+        if status is None:
+            raise _json_error(web.HTTPNotFound, "Unknown job")
+        
+        if not await asyncio.to_thread(analysis_jobs.cancel, job_id, "Cancelled through the API"):
+            raise _json_error(web.HTTPConflict, f"Job is {status['status']} and cannot be cancelled")
+        
+        return web.json_response(analysis_jobs.get_status(job_id), status=202, dumps=self._dumps)
+    
+    async def list_sessions(self, request: web.Request) -> web.Response:
+        """Newest-first session pages (cursor, limit, channel, summary_type, since, until) or ?q= search"""
+        session_manager = self.components['session_manager']
+        query = request.query
+        
+        try:
+            limit = min(MAX_PAGE_SIZE, max(1, int(query.get('limit', 20))))
+        except ValueError:
+            raise _json_error(web.HTTPBadRequest, "limit must be an integer")
+        
+        if query.get('q'):
+            sessions = await self.gate.run(session_manager.search_sessions, query['q'], limit)
+            return web.json_response({'sessions': sessions, 'next_cursor': None}, dumps=self._dumps)
+        
+        page = await self.gate.run(
+            session_manager.list_sessions,
+            cursor=query.get('cursor'), page_size=limit, channel=query.get('channel'),
+            summary_type=query.get('summary_type'), since=query.get('since'), until=query.get('until')
+        )
+        return web.json_response(page, dumps=self._dumps)
+    
+    async def get_session(self, request: web.Request) -> web.Response:
+        """A stored session; ?fields=analysis.main_summary,video_info loads only those parts"""
+        session_id = self._session_id(request)
+        session_manager = self.components['session_manager']
+        fields = [field for field in request.query.get('fields', '').split(',') if field]
+        
+        if fields:
+            session_data = await self.gate.run(session_manager.load_session, session_id, fields)
+        else:
+            session_data = await self.gate.run(session_manager.read_session, session_id)
+        
+        if not session_data:
+            raise _json_error(web.HTTPNotFound, "Unknown session")
+        return web.json_response(session_data, dumps=self._dumps)
+    
+    async def export_session(self, request: web.Request) -> web.Response:
+        """Render a summary, full report or transcript of a session (?format=PDF by default)"""
+        from utils.validators import validate_export_format
+        
+        session_id = self._session_id(request)
+        kind = request.match_info['kind']
+        if kind not in EXPORT_KINDS:
+            raise _json_error(web.HTTPNotFound, f"Unknown export kind; use one of {', '.join(EXPORT_KINDS)}")
+        
+        export_handler = self.components['export_handler']
+        requested = request.query.get('format', 'PDF')
+        if kind == 'transcript' and requested.upper() in export_handler.TRANSCRIPT_FORMATS:
+            format_type = requested.upper()
+        else:
+            format_type = validate_export_format(requested)
+        
+        data = await self.gate.run(self._render_export, session_id, kind, format_type)
+        if data is None:
+            raise _json_error(web.HTTPNotFound, "Unknown session")
+        
+        filename = f"{session_id}-{kind}.{export_handler.get_file_extension(format_type)}"
+        return web.Response(
+            body=data,
+            content_type=export_handler.get_mime_type(format_type),
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+        )
+    
+    def _render_export(self, session_id: str, kind: str, format_type: str) -> Optional[bytes]:
+        """Worker-thread body of export_session"""
+        session_data = self.components['session_manager'].read_session(session_id)
+        if not session_data or not session_data.get('analysis'):
+            return None
+        
+        export_handler = self.components['export_handler']
+        analysis = session_data['analysis']
+        transcript_data = session_data.get('transcript', {})
+        
+        if kind == 'summary':
+            return export_handler.export_summary(analysis, format_type)
+        if kind == 'transcript':
+            return export_handler.export_transcript(transcript_data, format_type, analysis)
+        return export_handler.export_full_report(analysis, transcript_data, session_data.get('video_info', {}), format_type)
+    
+    async def _shutdown(self, app: web.Application) -> None:
+        self.components['analysis_jobs'].shutdown()
+        self.components['task_pool'].shutdown(wait=False)
+    
+    @staticmethod
+    async def _read_json(request: web.Request) -> Dict[str, Any]:
+        try:
+            body = await request.json()
+        except ValueError:
+            raise _json_error(web.HTTPBadRequest, "Request body must be JSON")
+        if not isinstance(body, dict):
+            raise _json_error(web.HTTPBadRequest, "Request body must be a JSON object")
+        return body
+    
+    @staticmethod
+    def _session_id(request: web.Request) -> str:
+        session_id = request.match_info['session_id']
+        if not SESSION_ID_PATTERN.match(session_id):
+            raise _json_error(web.HTTPBadRequest, "Invalid session ID")
+        return session_id
+    
+    @staticmethod
+    def _pending_jobs(job_stats: Dict[str, int]) -> int:
+        return job_stats.get('queued', 0) + job_stats.get('running', 0)
+    
+    @staticmethod
+    def _dumps(data: Any) -> str:
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="YouTube Video Analyzer Pro HTTP API")
+    parser.add_argument('--host', default=API_SERVER_CONFIG['host'], help="Interface to bind (default API_HOST)")
+    parser.add_argument('--port', type=int, default=API_SERVER_CONFIG['port'], help="Port to listen on (default API_PORT)")
+    args = parser.parse_args(argv)
+    
+    if not FEATURE_FLAGS['api_access']:
+        print("The HTTP API is disabled - set ENABLE_API=true to enable it", file=sys.stderr)
+        return 2
+    
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    
+    components = build_components()
+    components['analysis_jobs'].resume_interrupted()
+    
+    # Keep-alive lets API clients reuse one connection for submit-then-poll loops
+    web.run_app(
+        ApiService(components).create_app(),
+        host=args.host,
+        port=args.port,
+        keepalive_timeout=API_SERVER_CONFIG['keepalive_timeout']
+    )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
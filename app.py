@@ -9,10 +9,21 @@ from pathlib import Path
 from core.youtube_handler import YouTubeHandler
 from core.ai_processor import AIProcessor
 from core.export_handler import ExportHandler
+from core.export_jobs import ExportJobQueue, ExportQueueFull
+from core.analysis_jobs import AnalysisJobRunner
+from core.prefetch import TranscriptPrefetcher
 from core.session_manager import SessionManager
+from core.retention import RetentionService
+from core.task_pool import TaskPool
 from components.chat_interface import ChatInterface
-from utils.validators import validate_youtube_url
-from config.settings import APP_CONFIG
+from components.transcript_viewer import render_transcript_viewer
+from components import streamlit_adapter
+from components.fragments import timed_fragment, rerun_fragment, script_timer, timing_summary
+from utils.validators import validate_youtube_url, extract_canonical_video_id
+from config.settings import APP_CONFIG, SESSION_CONFIG, EXPORT_CONFIG, ANALYSIS_CONFIG, EXPORTS_DIR
+
+# Core modules report errors and read secrets through the host; route both through Streamlit
+streamlit_adapter.install()
 
 # Page configuration
 st.set_page_config(
@@ -61,16 +72,44 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Seconds between progress-fragment reruns while a background export is rendering
+EXPORT_POLL_INTERVAL = 0.5
+
+# Seconds between progress-fragment reruns while a background analysis is running
+ANALYSIS_POLL_INTERVAL = 1.0
+
 # Initialize components
 @st.cache_resource
 def initialize_components():
     ai_processor = AIProcessor()
+    session_manager = SessionManager(state=st.session_state)
+    
+    # One process pool per server for CPU-bound work; it shuts down with the process
+    task_pool = TaskPool()
+    export_handler = ExportHandler(task_pool=task_pool)
+    
+    # One retention loop per server process; quota runs serialize on the store lock
+    retention_service = RetentionService(session_manager)
+    if SESSION_CONFIG['auto_cleanup']:
+        retention_service.start()
+    
+    # Analyses outlive the script run that started them; pick up any cut short by a restart
+    youtube_handler = YouTubeHandler(task_pool=task_pool)
+    prefetcher = TranscriptPrefetcher(youtube_handler)
+    analysis_jobs = AnalysisJobRunner(youtube_handler, ai_processor, session_manager, prefetcher=prefetcher)
+    analysis_jobs.resume_interrupted()
+    
     return {
-        'youtube_handler': YouTubeHandler(),
+        'youtube_handler': youtube_handler,
+        'prefetcher': prefetcher,
+        'analysis_jobs': analysis_jobs,
         'ai_processor': ai_processor,
-        'export_handler': ExportHandler(),
-        'session_manager': SessionManager(),
-        'chat_interface': ChatInterface(ai_processor)
+        'export_handler': export_handler,
+        'export_jobs': ExportJobQueue(export_handler),
+        'session_manager': session_manager,
+        'retention_service': retention_service,
+        'chat_interface': ChatInterface(ai_processor),
+        'task_pool': task_pool
     }
 
 def main():
@@ -78,8 +117,8 @@ def main():
     
     # Check if we have existing analysis data to display
     if (st.session_state.get('analysis_complete', False) and 
-        'analysis_results' in st.session_state and 
-        'transcript_data' in st.session_state and 
+        'analysis_ref' in st.session_state and 
+        'transcript_ref' in st.session_state and 
         'video_info' in st.session_state):
         
         # Display existing results immediately
@@ -106,19 +145,24 @@ def main():
             st.markdown(f"**Duration:** {video_info['duration']}")
             
             if st.button("🔄 Analyze New Video", type="secondary"):
-                # Clear session state for new analysis
-                for key in ['analysis_complete', 'analysis_results', 'transcript_data', 'video_info']:
+                cancel_tracked_job(components['analysis_jobs'], "Cancelled to analyze a new video")
+                
+                # Clear session state for new analysis; dropping the handles releases the shared objects
+                for key in ['analysis_complete', 'analysis_ref', 'transcript_ref', 'video_info', 'transcript_index', 'chat_context']:
                     if key in st.session_state:
                         del st.session_state[key]
                 st.rerun()
         
         # Display the results
         display_analysis_results(
-            st.session_state.analysis_results,
-            st.session_state.transcript_data,
+            st.session_state.analysis_ref,
+            st.session_state.transcript_ref,
             st.session_state.video_info,
             components
         )
+        
+        with st.sidebar:
+            render_script_timings()
         return
     
     # Sidebar
@@ -127,19 +171,9 @@ def main():
         
         # Session Management
         st.subheader("📊 Session History")
-        sessions = components['session_manager'].get_recent_sessions()
-        
-        if sessions:
-            selected_session = st.selectbox(
-                "Load Previous Analysis:",
-                options=["New Analysis"] + [f"{s['title'][:30]}..." for s in sessions],
-                key="session_selector"
-            )
-            
-            if selected_session != "New Analysis":
-                session_idx = sessions[st.session_state.session_selector.split("...")[0]]
-                # Load session data
-                pass
+        render_session_history(components['session_manager'])
+        render_analysis_jobs(components['analysis_jobs'])
+        render_history_export(components['session_manager'])
         
         st.divider()
         
@@ -157,6 +191,9 @@ def main():
             - Use session history to revisit previous analyses
             """)
         
+        render_task_pool_metrics(components['task_pool'])
+        render_script_timings()
+        
         # Settings
         st.subheader("⚙️ Settings")
         
@@ -187,9 +224,9 @@ def main():
         st.subheader("📥 Export Options")
         export_format = st.selectbox(
             "Export Format:",
-            ["PDF", "Word Document", "Text File", "JSON"]
+            ["PDF", "Word Document", "Text File", "Markdown", "JSON"]
         )
-
+    
     # Main content
     st.markdown("""
     <div class="main-header">
@@ -197,7 +234,7 @@ def main():
         <p>Transform any YouTube video into comprehensive insights with AI-powered analysis</p>
     </div>
     """, unsafe_allow_html=True)
-
+    
     # Input section
     col1, col2 = st.columns([3, 1])
     
@@ -215,11 +252,18 @@ def main():
             type="primary",
             use_container_width=True
         )
-
+    
     # URL validation and preview
+    valid_url = bool(youtube_url) and validate_youtube_url(youtube_url)
+    if track_prefetch(components['prefetcher'], youtube_url if valid_url else None) and valid_url:
+        cancel_tracked_job(components['analysis_jobs'], "A different video was entered", keep_if_url=youtube_url)
+    
     if youtube_url:
-        if validate_youtube_url(youtube_url):
-            video_info = components['youtube_handler'].get_video_info(youtube_url)
+        if valid_url:
+            # Metadata and transcript download in the background from the moment the URL is entered
+            video_info = components['prefetcher'].video_info(youtube_url, timeout=ANALYSIS_CONFIG['prefetch_info_timeout'])
+            if not video_info:
+                video_info = components['youtube_handler'].get_video_info(youtube_url)
             
             if video_info:
                 col1, col2 = st.columns([1, 2])
@@ -240,125 +284,334 @@ def main():
                     if video_info['description']:
                         with st.expander("📝 Description"):
                             st.write(video_info['description'][:500] + "..." if len(video_info['description']) > 500 else video_info['description'])
+                
+                # Offer the stored result before spending API quota on a new run
+                previous_sessions = components['session_manager'].find_sessions_for_video(youtube_url)
+                if previous_sessions:
+                    latest = previous_sessions[0]
+                    analysed_on = (latest.get('created_at') or '')[:10] or 'an earlier session'
+                    
+                    st.info(f"✅ This video was already analysed on {analysed_on} ({latest.get('summary_type', 'Comprehensive')}). Open it instantly or run a fresh analysis.")
+                    if st.button("📂 Open Previous Analysis", key="open_previous_analysis"):
+                        if open_saved_session(components['session_manager'], latest['session_id']):
+                            st.rerun()
+                        else:
+                            st.error("❌ Could not load the previous analysis")
         else:
             st.error("❌ Please enter a valid YouTube URL")
-
-    # Analysis processing
+    
+    # Analysis runs on a background worker; the page only submits and polls it
     if analyze_button and youtube_url:
-        if validate_youtube_url(youtube_url):
-            with st.spinner("🔄 Processing video... This may take a moment"):
-                
-                # Create progress bar
-                progress_bar = st.progress(0)
-                status_text = st.empty()
-                
-                try:
-                    # Step 1: Extract transcript
-                    status_text.text("📥 Extracting transcript...")
-                    progress_bar.progress(20)
-                    
-                    transcript_data = components['youtube_handler'].extract_transcript(youtube_url)
-                    
-                    if not transcript_data:
-                        st.error("❌ Failed to extract transcript. Video may not have captions.")
-                        return
-                    
-                    # Step 2: Process with AI
-                    status_text.text("🤖 Analyzing content with AI...")
-                    progress_bar.progress(50)
-                    
-                    analysis_results = components['ai_processor'].comprehensive_analysis(
-                        transcript_data['text'],
-                        summary_type=summary_type,
-                        language=language,
-                        include_timestamps=include_timestamps,
-                        include_sentiment=include_sentiment,
-                        include_topics=include_topics,
-                        video_info=video_info
-                    )
-                    
-                    # Step 3: Save session
-                    status_text.text("💾 Saving analysis...")
-                    progress_bar.progress(80)
-                    
-                    session_data = {
-                        'url': youtube_url,
-                        'video_info': video_info,
-                        'transcript': transcript_data,
-                        'analysis': analysis_results,
-                        'settings': {
-                            'summary_type': summary_type,
-                            'language': language,
-                            'include_timestamps': include_timestamps,
-                            'include_sentiment': include_sentiment,
-                            'include_topics': include_topics
-                        },
-                        'timestamp': datetime.now().isoformat()
-                    }
-                    
-                    components['session_manager'].save_session(session_data)
-                    
-                    # Step 4: Display results
-                    status_text.text("✅ Analysis complete!")
-                    progress_bar.progress(100)
-                    
-                    # Clear progress indicators
-                    progress_bar.empty()
-                    status_text.empty()
-                    
-                    # Display results
-                    display_analysis_results(analysis_results, transcript_data, video_info, components)
-                    
-                except Exception as e:
-                    error_msg = str(e)
-                    progress_bar.empty()
-                    status_text.empty()
-                    
-                    # Handle different types of errors
-                    if "429" in error_msg or "rate limit" in error_msg.lower():
-                        st.error("🚫 **API Rate Limit Exceeded**")
-                        st.info("""
-                        **What happened:** You've exceeded the Google Gemini API quota limit.
-                        
-                        **Solutions:**
-                        1. ⏰ **Wait 1-2 minutes** and try again
-                        2. 🔄 Try analyzing a **shorter video**
-                        3. 📚 Use **session history** to view previous analyses
-                        4. 💰 Consider upgrading your Google API plan for higher limits
-                        
-                        **Current status:** API temporarily blocked - please wait before retrying.
-                        """)
-                        st.session_state.api_error = True
-                    elif "quota" in error_msg.lower():
-                        st.error("📊 **API Quota Exceeded**")
-                        st.info("""
-                        **Daily/Monthly quota reached.** 
-                        
-                        **Solutions:**
-                        1. ⏰ Wait until quota resets (usually next day/month)
-                        2. 💰 Upgrade your Google API plan
-                        3. 📚 Review previous analyses in session history
-                        """)
-                    else:
-                        st.error(f"❌ **Analysis Error:** {error_msg}")
-                        st.info("""
-                        **Troubleshooting steps:**
-                        1. 🔄 Try again with a different video
-                        2. ✅ Ensure the video has captions/subtitles
-                        3. 🔗 Verify the YouTube URL is correct
-                        4. ⏰ Wait a moment and retry
-                        """)
+        if validate_youtube_url(youtube_url) and video_info:
+            settings = {
+                'summary_type': summary_type,
+                'language': language,
+                'include_timestamps': include_timestamps,
+                'include_sentiment': include_sentiment,
+                'include_topics': include_topics
+            }
+            st.session_state.analysis_job_id = components['analysis_jobs'].submit(youtube_url, video_info, settings)
         else:
             st.error("❌ Please enter a valid YouTube URL")
+    
+    if st.session_state.get('analysis_job_id'):
+        render_analysis_job(components)
 
-def display_analysis_results(analysis_results, transcript_data, video_info, components):
-    """Display the comprehensive analysis results"""
+def track_prefetch(prefetcher, url):
+    """Keep this session's prefetch on the URL in the box; changing or clearing it cancels the old one.
+    
+    Returns whether the URL changed since the previous run.
+    """
+    previous = st.session_state.get('prefetch_url')
+    if previous == url:
+        return False
+    
+    if previous:
+        prefetcher.release(previous)
+    if url:
+        prefetcher.start(url)
+    st.session_state.prefetch_url = url
+    return True
+
+def cancel_tracked_job(analysis_jobs, reason, keep_if_url=None):
+    """Cancel the analysis this session is tracking, unless it is for the video at keep_if_url"""
+    job_id = st.session_state.get('analysis_job_id')
+    job = analysis_jobs.get_status(job_id) if job_id else None
+    if not job or job['status'] not in AnalysisJobRunner.ACTIVE_STATES:
+        return
+    
+    if keep_if_url and extract_canonical_video_id(keep_if_url) == extract_canonical_video_id(job['url']):
+        return
+    analysis_jobs.cancel(job_id, reason)
+
+def render_analysis_job(components):
+    """Progress of the tracked background analysis; opens its results once it finishes"""
+    analysis_jobs = components['analysis_jobs']
+    job_id = st.session_state.analysis_job_id
+    job = analysis_jobs.get_status(job_id)
+    
+    if not job:
+        del st.session_state['analysis_job_id']
+        return
+    
+    if job['status'] == 'done':
+        del st.session_state['analysis_job_id']
+        reset_session_history()
+        if open_saved_session(components['session_manager'], job['session_id']):
+            st.rerun()
+        st.error("❌ The analysis finished but its saved session could not be loaded")
+        return
+    
+    st.markdown(f"**Analyzing:** {job['video_info'].get('title', job['url'])}")
+    finished = sum(1 for state in job['sections'].values() if state == 'done')
     
-    # Store in session state for persistence
-    st.session_state.analysis_results = analysis_results
-    st.session_state.transcript_data = transcript_data
-    st.session_state.video_info = video_info
+    if job['status'] in ('failed', 'interrupted', 'cancelled'):
+        if job['status'] == 'failed':
+            show_analysis_error(job['error'] or 'Unknown error')
+        elif job['status'] == 'cancelled':
+            st.info(f"⏹️ {job['error'] or 'Analysis cancelled'}: {finished}/{len(job['sections'])} sections were kept "
+                    f"and {job.get('calls_avoided', 0)} LLM call(s) avoided.")
+        else:
+            st.warning("⚠️ This analysis was interrupted by a server restart.")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button(f"🔁 Resume Analysis ({finished}/{len(job['sections'])} sections done)", key="resume_analysis_job"):
+                analysis_jobs.resume(job_id)
+                st.rerun()
+        with col2:
+            if st.button("✖️ Dismiss", key="dismiss_analysis_job"):
+                del st.session_state['analysis_job_id']
+                st.rerun()
+        return
+    
+    render_analysis_progress(analysis_jobs, job_id)
+    if st.button("⏹️ Cancel Analysis", key="cancel_analysis_job", disabled=job['stage'] == 'Cancelling'):
+        analysis_jobs.cancel(job_id)
+        st.rerun()
+    st.caption("The analysis keeps running if you leave this page; reopen it from Background Analyses in the sidebar.")
+
+@timed_fragment('analysis_progress', run_every=ANALYSIS_POLL_INTERVAL)
+def render_analysis_progress(analysis_jobs, job_id):
+    """Progress of a running analysis, polled by rerunning only this fragment"""
+    job = analysis_jobs.get_status(job_id)
+    if not job or job['status'] not in AnalysisJobRunner.ACTIVE_STATES:
+        # Finished, failed or gone: render_analysis_job takes it from here
+        st.rerun()
+    
+    finished = sum(1 for state in job['sections'].values() if state == 'done')
+    st.progress(job['progress'], text=f"🔄 {job['stage']}")
+    with st.expander(f"Sections ({finished}/{len(job['sections'])})"):
+        icons = {'pending': '⏳', 'done': '✅', 'failed': '❌', 'cancelled': '⏹️'}
+        for section, state in job['sections'].items():
+            st.write(f"{icons.get(state, '⏳')} {section.replace('_', ' ').title()}")
+
+def render_analysis_jobs(analysis_jobs):
+    """Sidebar list of unfinished background analyses, so a new tab can reattach to them"""
+    jobs = [job for job in analysis_jobs.list_jobs() if job['status'] != 'done']
+    if not jobs:
+        return
+    
+    with st.expander(f"⚙️ Background Analyses ({len(jobs)})"):
+        for job in jobs[:10]:
+            title = job['video_info'].get('title', job['url'])
+            st.write(f"**{title[:40]}** · {job['status']} · {job['progress']:.0%}")
+            if st.button("Track", key=f"track_job_{job['job_id']}"):
+                st.session_state.analysis_job_id = job['job_id']
+                st.rerun()
+
+def show_analysis_error(error_msg):
+    """Explain a failed analysis, with specific advice for API quota errors"""
+    # Handle different types of errors
+    if "429" in error_msg or "rate limit" in error_msg.lower():
+        st.error("🚫 **API Rate Limit Exceeded**")
+        st.info("""
+        **What happened:** You've exceeded the Google Gemini API quota limit.
+        
+        **Solutions:**
+        1. ⏰ **Wait 1-2 minutes** and try again
+        2. 🔄 Try analyzing a **shorter video**
+        3. 📚 Use **session history** to view previous analyses
+        4. 💰 Consider upgrading your Google API plan for higher limits
+        
+        **Current status:** API temporarily blocked - please wait before retrying.
+        """)
+        st.session_state.api_error = True
+    elif "quota" in error_msg.lower():
+        st.error("📊 **API Quota Exceeded**")
+        st.info("""
+        **Daily/Monthly quota reached.** 
+        
+        **Solutions:**
+        1. ⏰ Wait until quota resets (usually next day/month)
+        2. 💰 Upgrade your Google API plan
+        3. 📚 Review previous analyses in session history
+        """)
+    else:
+        st.error(f"❌ **Analysis Error:** {error_msg}")
+        st.info("""
+        **Troubleshooting steps:**
+        1. 🔄 Try again with a different video
+        2. ✅ Ensure the video has captions/subtitles
+        3. 🔗 Verify the YouTube URL is correct
+        4. ⏰ Wait a moment and retry
+        """)
+
+HISTORY_PAGE_SIZE = 20
+HISTORY_STATE_KEYS = ['history_sessions', 'history_cursor', 'history_filters']
+
+def reset_session_history():
+    """Drop the loaded history pages so the sidebar starts again from the newest session"""
+    for key in HISTORY_STATE_KEYS:
+        if key in st.session_state:
+            del st.session_state[key]
+
+def render_task_pool_metrics(task_pool):
+    """Sidebar panel with the worker pool's queue depth and task latency"""
+    with st.expander("⚡ Worker Pool"):
+        metrics = task_pool.get_metrics()
+        latency = metrics['latency']
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("In Flight", metrics['in_flight'])
+            st.metric("p50 Latency", f"{latency['p50']:.2f}s")
+        with col2:
+            st.metric("Queued", metrics['queue_depth'])
+            st.metric("p95 Latency", f"{latency['p95']:.2f}s")
+        
+        st.caption(
+            f"{metrics['workers']} workers · {metrics['completed']} completed · "
+            f"{metrics['failed']} failed · avg queue wait {metrics['queue_wait']['avg']:.2f}s"
+        )
+
+def render_script_timings():
+    """Sidebar panel with how long full-app runs and each fragment take to execute"""
+    timings = timing_summary()
+    if not timings:
+        return
+    
+    with st.expander("⏱️ Script Timings"):
+        for name, timing in timings.items():
+            st.write(
+                f"**{name.replace('_', ' ').title()}** · last {timing['last_ms']:.0f} ms · "
+                f"median {timing['median_ms']:.0f} ms · {timing['runs']} runs"
+            )
+        st.caption("Fragments rerun on their own, so a chat turn or history filter only costs its fragment's time.")
+
+@timed_fragment('session_history')
+def render_session_history(session_manager):
+    """Sidebar history, loaded one page at a time so cost does not grow with total history.
+    
+    A fragment: filtering and paging rerun only the history panel.
+    """
+    with st.expander("🔎 Filter History"):
+        summary_filter = st.selectbox(
+            "Summary Style:",
+            ["All", "Comprehensive", "Brief", "Bullet Points", "Academic", "Business", "Creative"],
+            key="history_summary_filter"
+        )
+        channel_filter = st.text_input("Channel:", key="history_channel_filter").strip()
+        date_range = st.date_input("Created between:", value=(), key="history_date_filter")
+    
+    filters = {
+        'summary_type': None if summary_filter == "All" else summary_filter,
+        'channel': channel_filter or None,
+        'since': date_range[0].isoformat() if len(date_range) > 0 else None,
+        'until': date_range[1].isoformat() if len(date_range) > 1 else None
+    }
+    
+    # Changing a filter restarts paging from the first page
+    if st.session_state.get('history_filters') != filters:
+        reset_session_history()
+        st.session_state.history_filters = filters
+    
+    if 'history_sessions' not in st.session_state:
+        page = session_manager.list_sessions(page_size=HISTORY_PAGE_SIZE, **filters)
+        st.session_state.history_sessions = page['sessions']
+        st.session_state.history_cursor = page['next_cursor']
+    
+    sessions = st.session_state.history_sessions
+    if not sessions:
+        st.caption("No saved analyses yet.")
+        return
+    
+    sessions_by_id = {s['session_id']: s for s in sessions}
+    selected_id = st.selectbox(
+        "Load Previous Analysis:",
+        options=["New Analysis"] + list(sessions_by_id),
+        format_func=lambda sid: sid if sid == "New Analysis" else
+            f"{sessions_by_id[sid]['title'][:30]}... ({(sessions_by_id[sid].get('created_at') or '')[:10]})",
+        key="session_selector"
+    )
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        if selected_id != "New Analysis" and st.button("📂 Open", use_container_width=True):
+            if open_saved_session(session_manager, selected_id):
+                st.rerun()
+            else:
+                st.error("❌ Could not load this analysis")
+    
+    with col2:
+        if st.session_state.history_cursor and st.button("⬇️ Load more", use_container_width=True):
+            page = session_manager.list_sessions(
+                cursor=st.session_state.history_cursor,
+                page_size=HISTORY_PAGE_SIZE,
+                **st.session_state.history_filters
+            )
+            st.session_state.history_sessions = sessions + page['sessions']
+            st.session_state.history_cursor = page['next_cursor']
+            rerun_fragment()
+
+def render_history_export(session_manager):
+    """Sidebar export of the whole session history as gzip'd NDJSON"""
+    with st.expander("📤 Export History"):
+        include_payloads = st.checkbox("Include transcripts and analyses", key="history_export_payloads")
+        
+        if st.button("Prepare Export", use_container_width=True):
+            # Streamed to disk one session at a time; only the compressed file is handed to the download
+            export_path = EXPORTS_DIR / f"session_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.ndjson.gz"
+            
+            try:
+                with st.spinner("Exporting session history..."):
+                    session_manager.write_session_history(export_path, include_payloads=include_payloads, compress=True)
+                st.session_state.history_export_path = str(export_path)
+            except Exception as e:
+                st.error(f"Error exporting session history: {e}")
+        
+        export_path = st.session_state.get('history_export_path')
+        if export_path and Path(export_path).exists():
+            with open(export_path, 'rb') as f:
+                st.download_button(
+                    label="📥 Download History",
+                    data=f,
+                    file_name=Path(export_path).name,
+                    mime="application/gzip",
+                    use_container_width=True
+                )
+
+def open_saved_session(session_manager, session_id):
+    """Point session state at a stored session so its results are displayed.
+    
+    The transcript and analysis live in the process-wide object store, shared by
+    every user viewing them; session state only holds handles, which release the
+    shared copies when this session is cleared or expires.
+    """
+    session_data = session_manager.open_shared(session_id)
+    if not session_data or not session_data.get('analysis') or not session_data.get('transcript'):
+        return False
+    
+    st.session_state.analysis_ref = session_data['analysis']
+    st.session_state.transcript_ref = session_data['transcript']
+    st.session_state.video_info = session_data['video_info']
     st.session_state.analysis_complete = True
+    return True
+
+def display_analysis_results(analysis_ref, transcript_ref, video_info, components):
+    """Display the comprehensive analysis results"""
+    analysis_results = analysis_ref.get()
+    transcript_data = transcript_ref.get()
     
     st.markdown("---")
     st.header("📊 Analysis Results")
@@ -458,24 +711,27 @@ def display_analysis_results(analysis_results, transcript_data, video_info, comp
     with tab5:
         # Interactive Chat Interface
         chat_interface = components['chat_interface']
-        chat_interface.render_chat_interface(transcript_data, analysis_results, video_info)
+        chat_interface.render_chat_interface(transcript_ref, analysis_ref, video_info)
     
     with tab6:
-        st.subheader("📄 Full Transcript")
-        st.text_area(
-            "Complete Transcript:",
-            transcript_data['text'],
-            height=400,
-            help="Full video transcript with timestamps"
-        )
+        render_transcript_viewer(transcript_ref)
     
     # Export section
     st.markdown("---")
     st.subheader("📥 Export Analysis")
     
-    # Get export format from sidebar
-    export_format = st.session_state.get('export_format', 'PDF')
-    export_handler = components['export_handler']
+    # A fragment of its own; the export format comes from the sidebar
+    render_export_panel(
+        components['export_handler'], components['export_jobs'],
+        analysis_ref, transcript_ref, video_info,
+        st.session_state.get('export_format', 'PDF')
+    )
+
+@timed_fragment('export_panel')
+def render_export_panel(export_handler, export_jobs, analysis_ref, transcript_ref, video_info, export_format):
+    """Summary, full report and transcript downloads; polling a report export reruns only this panel"""
+    analysis_results = analysis_ref.get()
+    transcript_data = transcript_ref.get()
     
     # Create unique keys for download buttons to prevent conflicts
     video_id = video_info.get('video_id', 'unknown')
@@ -500,29 +756,89 @@ def display_analysis_results(analysis_results, transcript_data, video_info, comp
     
     with col2:
         st.markdown("**📊 Full Report Export**")
+        render_report_export(export_jobs, analysis_results, transcript_data, video_info, export_format)
+    
+    with col3:
+        st.markdown("**📋 Transcript Export**")
+        transcript_format = st.selectbox(
+            "Transcript format:",
+            EXPORT_CONFIG['transcript_formats'],
+            key="transcript_export_format",
+            label_visibility="collapsed"
+        )
+        
         try:
-            file_data = export_handler.export_full_report(analysis_results, transcript_data, video_info, export_format)
+            if transcript_format == 'Text File':
+                transcript_file = transcript_data['text']
+                rendered_format = 'TEXT FILE'
+            else:
+                # Subtitles and columnar files are built from the timed segments
+                transcript_file = export_handler.export_transcript(transcript_data, transcript_format, analysis_results)
+                rendered_format = export_handler.transcript_format(transcript_format)
+            
             st.download_button(
-                label=f"📥 Download Full Report",
-                data=file_data,
-                file_name=f"full_report_{video_id}_{timestamp}.{export_format.lower().replace(' ', '_')}",
-                mime=export_handler.get_mime_type(export_format),
-                key=f"download_report_{timestamp}",
+                label=f"📥 Download {transcript_format} Transcript",
+                data=transcript_file,
+                file_name=f"transcript_{video_id}_{timestamp}.{export_handler.get_file_extension(rendered_format)}",
+                mime=export_handler.get_mime_type(rendered_format),
+                key=f"download_transcript_{timestamp}",
                 use_container_width=True
             )
         except Exception as e:
-            st.error(f"Export error: {e}")
+            st.error(f"Transcript export error: {e}")
+
+def render_report_export(export_jobs, analysis_results, transcript_data, video_info, export_format):
+    """Full report rendered by a background worker; a download button once it is ready"""
+    retry = st.session_state.pop('retry_report_export', False)
     
-    with col3:
-        st.markdown("**📋 Transcript Export**")
-        st.download_button(
-            label="📥 Download Transcript",
-            data=transcript_data['text'],
-            file_name=f"transcript_{video_id}_{timestamp}.txt",
-            mime="text/plain",
-            key=f"download_transcript_{timestamp}",
-            use_container_width=True
-        )
+    try:
+        job_id = export_jobs.submit(analysis_results, transcript_data, video_info, export_format, retry=retry)
+    except ExportQueueFull as e:
+        st.warning(f"⏳ {e}")
+        poll_report_export(export_jobs, None)
+        return
+    
+    status = export_jobs.get_status(job_id)
+    
+    if status['status'] in ExportJobQueue.ACTIVE_STATES:
+        poll_report_export(export_jobs, job_id)
+        return
+    
+    if status['status'] == 'failed':
+        st.error(f"Export error: {status['error']}")
+        if st.button("🔄 Retry Export", key=f"retry_report_{job_id}", use_container_width=True):
+            st.session_state.retry_report_export = True
+            rerun_fragment()
+        return
+    
+    st.download_button(
+        label="📥 Download Full Report",
+        data=export_jobs.read_artifact(job_id) or b"",
+        file_name=status['file_name'],
+        mime=status['mime'],
+        key=f"download_report_{job_id}",
+        use_container_width=True
+    )
+
+@timed_fragment('report_export_progress', run_every=EXPORT_POLL_INTERVAL)
+def poll_report_export(export_jobs, job_id):
+    """Progress of a background report export, polled by rerunning only this fragment.
+    
+    Without a job_id the queue was full; the page reruns once a slot frees up.
+    """
+    if job_id is None:
+        pending = sum(count for state, count in export_jobs.get_stats().items() if state in ExportJobQueue.ACTIVE_STATES)
+        if pending < export_jobs.max_pending:
+            st.rerun()
+        return
+    
+    status = export_jobs.get_status(job_id)
+    if not status or status['status'] not in ExportJobQueue.ACTIVE_STATES:
+        # Finished or failed: the export panel shows the download or the error
+        st.rerun()
+    
+    st.progress(status['progress'], text=f"⚙️ {status['stage']}...")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with script_timer('full_run'):
+        main()
\ No newline at end of file
@@ -0,0 +1,634 @@
+# cli.py
+"""Command-line utilities for YouTube Video Analyzer Pro"""
+import argparse
+import ast
+import asyncio
+import gc
+import json
+import multiprocessing
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Optional
+
+def _format_bytes(size: float) -> str:
+    """Format a byte count for display"""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+def storage_report(args: argparse.Namespace) -> int:
+    """Print compression and dedup ratios for session storage"""
+    from core.session_manager import SessionManager
+    
+    session_manager = SessionManager()
+    
+    if args.migrate:
+        migrated = session_manager.migrate_legacy_sessions()
+        print(f"Migrated {migrated} legacy session(s) into the blob store")
+    
+    report = session_manager.get_storage_report()
+    
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    
+    blobs = report['blobs']
+    print("SESSION STORAGE REPORT")
+    print("-" * 40)
+    print(f"Sessions:              {report['total_sessions']} ({report['legacy_sessions']} legacy)")
+    print(f"Legacy session files:  {_format_bytes(report['legacy_bytes'])}")
+    print(f"Session manifests:     {_format_bytes(report['manifest_bytes'])}")
+    print(f"Blobs ({blobs['codec']}):           {blobs['blob_count']} blobs, {blobs['reference_count']} references")
+    print(f"  Logical payload:     {_format_bytes(blobs['logical_bytes'])}")
+    print(f"  Unique payload:      {_format_bytes(blobs['unique_bytes'])}")
+    print(f"  Stored on disk:      {_format_bytes(blobs['stored_bytes'])}")
+    print(f"  Dedup ratio:         {blobs['dedup_ratio']:.2f}x")
+    print(f"  Compression ratio:   {blobs['compression_ratio']:.2f}x")
+    print(f"  Overall ratio:       {blobs['overall_ratio']:.2f}x")
+    print(f"Total stored:          {_format_bytes(report['total_stored_bytes'])}")
+    return 0
+
+def retention(args: argparse.Namespace) -> int:
+    """Enforce session quotas once and print the reclaimed space"""
+    from core.session_manager import SessionManager
+    from core.retention import RetentionService
+    
+    service = RetentionService(
+        SessionManager(),
+        max_age_days=args.max_age_days,
+        max_sessions=args.max_sessions,
+        archive=False if args.no_archive else None
+    )
+    report = service.run_once(dry_run=args.dry_run)
+    
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    
+    planned = ", ".join(f"{reason}={count}" for reason, count in report['planned'].items())
+    print(f"Planned evictions: {planned}{' (dry run)' if args.dry_run else ''}")
+    print(f"Removed {report['sessions_removed']} session(s), archived {report['sessions_archived']}")
+    print(f"Reclaimed {_format_bytes(report['reclaimed_bytes'])}, archive packs {_format_bytes(report['archive_bytes'])}"
+          + (f" ({', '.join(report['archive_packs'])})" if report['archive_packs'] else ""))
+    return 0
+
+def export_history(args: argparse.Namespace) -> int:
+    """Stream the whole session history as NDJSON to a file or stdout"""
+    from core.session_manager import SessionManager
+    
+    session_manager = SessionManager()
+    compress = args.gzip or (args.output or '').endswith('.gz')
+    
+    if args.output:
+        size = session_manager.write_session_history(
+            Path(args.output), include_payloads=args.include_payloads, compress=compress
+        )
+        print(f"Wrote {_format_bytes(size)} to {args.output}", file=sys.stderr)
+        return 0
+    
+    for chunk in session_manager.iter_session_history(include_payloads=args.include_payloads, compress=compress):
+        sys.stdout.buffer.write(chunk)
+    sys.stdout.buffer.flush()
+    return 0
+
+def bulk_export(args: argparse.Namespace) -> int:
+    """Render many sessions into one ZIP archive"""
+    from core.session_manager import SessionManager
+    from core.bulk_export import BulkExporter
+    from utils.validators import validate_export_format
+    
+    exporter = BulkExporter(SessionManager(), max_workers=args.workers)
+    formats = [validate_export_format(format_type) for format_type in args.format] or ['PDF']
+    
+    def report_progress(done: int, total: int, result: Dict) -> None:
+        status = f"FAILED: {result['error']}" if 'error' in result else _format_bytes(result['size'])
+        print(f"[{done}/{total}] {result['session_id']} {result['kind']} {result['format']} - {status}", file=sys.stderr)
+    
+    report = exporter.export(
+        args.output, formats, kinds=args.kind, progress=report_progress,
+        session_ids=args.session, channel=args.channel, summary_type=args.summary_type,
+        since=args.since, until=args.until
+    )
+    
+    print(f"Exported {len(report['documents'])} document(s) from {report['sessions']} session(s) "
+          f"({_format_bytes(report['bytes'])}) to {args.output} in {report['duration_seconds']:.1f}s")
+    if report['failures']:
+        print(f"{len(report['failures'])} document(s) failed - see manifest.json in the archive")
+        return 1
+    return 0
+
+def batch(args: argparse.Namespace) -> int:
+    """Analyse videos, playlists and channels listed in a file or on stdin"""
+    from core.runtime import get_secret
+    from config.settings import DEV_CONFIG, FEATURE_FLAGS
+    from utils.validators import validate_analysis_settings
+    
+    if not FEATURE_FLAGS['batch_processing']:
+        print("Batch processing is disabled - set ENABLE_BATCH=true to enable it", file=sys.stderr)
+        return 2
+    
+    api_key = get_secret('GOOGLE_API_KEY') or get_secret('GEMINI_API_KEY')
+    # MOCK_API runs against the stub model, as api_server does
+    if not api_key and not DEV_CONFIG['mock_api']:
+        print("GOOGLE_API_KEY or GEMINI_API_KEY must be set (or MOCK_API=true)", file=sys.stderr)
+        return 2
+    
+    from core.youtube_handler import YouTubeHandler
+    from core.ai_processor import AIProcessor
+    from core.session_manager import SessionManager
+    from core.batch import BatchRunner
+    
+    runner = BatchRunner(
+        YouTubeHandler(),
+        AIProcessor(api_key=api_key),
+        SessionManager(),
+        transcript_workers=args.transcript_workers,
+        llm_workers=args.llm_workers
+    )
+    settings = validate_analysis_settings({
+        'summary_type': args.summary_type,
+        'language': args.language,
+        'include_sentiment': not args.no_sentiment,
+        'include_topics': not args.no_topics
+    })
+    settings.pop('export_format')
+    
+    def report_progress(done: int, total: int, record: Dict) -> None:
+        status = f"FAILED: {record['error']}" if record['status'] != 'ok' else f"session {record['session_id']}"
+        print(f"[{done}/{total}] {record['title'] or record['url']} ({record['seconds']:.0f}s) - {status}", file=sys.stderr)
+    
+    if args.input == '-':
+        sources = sys.stdin.read().splitlines()
+    else:
+        sources = Path(args.input).read_text(encoding='utf-8').splitlines()
+    
+    report = runner.run(sources, Path(args.output), settings, progress=report_progress)
+    
+    print(f"Analysed {report['succeeded']} of {report['videos']} video(s) in {report['duration_seconds']:.1f}s "
+          f"({report['videos_per_minute']:.2f} videos/min); {report['skipped']} already done, "
+          f"{report['failed']} failed - results in {args.output}")
+    return 1 if report['failed'] else 0
+
+def _stress_worker(sessions_dir: str, worker_id: int, iterations: int) -> Dict[str, int]:
+    """One process hammering the shared session store with mixed operations"""
+    from core.session_manager import SessionManager
+    
+    session_manager = SessionManager(Path(sessions_dir))
+    rng = random.Random(worker_id)
+    
+    # A small pool of videos so workers contend on the same blobs and index keys
+    video_ids = [f"stressvid{i:02d}" for i in range(5)]
+    counts = {'save': 0, 'load': 0, 'delete': 0, 'preferences': 0, 'errors': 0}
+    
+    for i in range(iterations):
+        operation = rng.random()
+        
+        try:
+            if operation < 0.5:
+                video_id = rng.choice(video_ids)
+                session_id = session_manager.save_session({
+                    'url': f"https://www.youtube.com/watch?v={video_id}",
+                    'video_info': {'video_id': video_id, 'title': f"Stress {video_id}", 'channel': f"Worker {worker_id}"},
+                    'transcript': {'text': f"transcript for {video_id} " * 200, 'segments': [], 'language_codes': ['en']},
+                    'analysis': {'main_summary': f"summary {rng.randint(0, 3)}"},
+                    'settings': {'summary_type': rng.choice(['Brief', 'Comprehensive'])}
+                })
+                counts['save' if session_id else 'errors'] += 1
+            
+            elif operation < 0.9:
+                session_manager.session_index.refresh()
+                session_ids = list(session_manager.session_index.entries())
+                if session_ids:
+                    session_id = rng.choice(session_ids)
+                    if operation < 0.7:
+                        session_manager.load_session(session_id)
+                        counts['load'] += 1
+                    else:
+                        session_manager.delete_session(session_id)
+                        counts['delete'] += 1
+            
+            else:
+                ok = session_manager.save_user_preferences({'worker': worker_id, 'iteration': i})
+                counts['preferences' if ok else 'errors'] += 1
+        
+        except Exception:
+            counts['errors'] += 1
+    
+    return counts
+
+def stress_store(args: argparse.Namespace) -> int:
+    """Run several processes against one session store and verify its integrity afterwards"""
+    from core.session_manager import SessionManager
+    
+    with tempfile.TemporaryDirectory(prefix="session-stress-") as sessions_dir:
+        start = time.perf_counter()
+        context = multiprocessing.get_context('spawn')
+        
+        with context.Pool(args.processes) as pool:
+            results = pool.starmap(
+                _stress_worker,
+                [(sessions_dir, worker_id, args.iterations) for worker_id in range(args.processes)]
+            )
+        
+        elapsed = time.perf_counter() - start
+        
+        totals = {}
+        for counts in results:
+            for name, count in counts.items():
+                totals[name] = totals.get(name, 0) + count
+        
+        problems = SessionManager(Path(sessions_dir)).verify_integrity()
+        operations = sum(count for name, count in totals.items() if name != 'errors')
+        
+        print(f"{args.processes} processes x {args.iterations} iterations in {elapsed:.1f}s ({operations / elapsed:.0f} ops/s)")
+        print("Operations: " + ", ".join(f"{name}={count}" for name, count in totals.items()))
+        
+        if problems:
+            print(f"FAILED - {len(problems)} integrity problem(s):")
+            for problem in problems[:20]:
+                print(f"  {problem}")
+            return 1
+        
+        if totals.get('errors'):
+            print(f"FAILED - {totals['errors']} operation(s) reported errors")
+            return 1
+        
+        print("OK - store is consistent")
+        return 0
+
+def _stub_analysis_request(client_id: int, number: int, rng: random.Random) -> Dict:
+    """Submission body with an inline transcript, so no YouTube access is needed"""
+    video_id = f"lt{client_id:03d}x{number:05d}"[:11]
+    words = ["pipeline", "latency", "throughput", "queue", "model", "video", "insight", "summary"]
+    segments = []
+    for i in range(120):
+        text = " ".join(rng.choice(words) for _ in range(12))
+        segments.append({'timestamp': f"{i * 5 // 60:02d}:{i * 5 % 60:02d}", 'start_time': i * 5.0, 'duration': 5.0, 'text': text})
+    
+    return {
+        'url': f"https://www.youtube.com/watch?v={video_id}",
+        'settings': {'summary_type': rng.choice(['Brief', 'Comprehensive'])},
+        'video_info': {'video_id': video_id, 'title': f"Load test {video_id}", 'channel': f"Client {client_id}",
+                       'duration': '10:00', 'views': 0, 'url': f"https://www.youtube.com/watch?v={video_id}"},
+        'transcript': {'text': " ".join(segment['text'] for segment in segments), 'segments': segments,
+                       'total_segments': len(segments), 'total_duration': 600.0, 'language_codes': ['en']}
+    }
+
+async def _load_test_client(http, base_url: str, client_id: int, deadline: float, results: Dict) -> None:
+    """Submit an analysis, poll it to completion, then read, search and export the session; repeat"""
+    rng = random.Random(client_id)
+    number = 0
+    
+    async def call(name: str, method: str, path: str, **kwargs):
+        start = time.perf_counter()
+        async with http.request(method, base_url + path, **kwargs) as response:
+            body = await response.read()
+            stats = results['endpoints'].setdefault(name, {'latencies': [], 'status': {}})
+            stats['latencies'].append(time.perf_counter() - start)
+            stats['status'][response.status] = stats['status'].get(response.status, 0) + 1
+            return response.status, response.headers, body
+    
+    while time.perf_counter() < deadline:
+        number += 1
+        submitted = time.perf_counter()
+        status, headers, body = await call('submit', 'POST', '/api/analyses', json=_stub_analysis_request(client_id, number, rng))
+        if status == 429:
+            await asyncio.sleep(float(headers.get('Retry-After', 1)) * rng.uniform(0.5, 1.0))
+            continue
+        if status != 202:
+            results['errors'] += 1
+            continue
+        
+        job_id = json.loads(body)['job_id']
+        while True:
+            await asyncio.sleep(0.2)
+            status, _, body = await call('status', 'GET', f"/api/analyses/{job_id}")
+            job = json.loads(body) if status == 200 else {}
+            if job.get('status') in ('done', 'failed') or status != 200:
+                break
+        
+        if job.get('status') != 'done':
+            results['errors'] += 1
+            continue
+        results['analyses'].append(time.perf_counter() - submitted)
+        
+        session_id = job['session_id']
+        await call('session', 'GET', f"/api/sessions/{session_id}", params={'fields': 'analysis.main_summary,video_info'})
+        await call('search', 'GET', '/api/sessions', params={'q': f"Client {client_id}", 'limit': 5})
+        await call('export', 'GET', f"/api/sessions/{session_id}/export/summary", params={'format': 'Markdown'})
+
+async def _run_load_test(args: argparse.Namespace) -> Dict:
+    import aiohttp
+    from aiohttp import web
+    
+    runner = None
+    base_url = (args.url or '').rstrip('/')
+    
+    with tempfile.TemporaryDirectory(prefix="api-load-") as store_dir:
+        if not base_url:
+            # In-process server on the stub LLM backend and a throwaway session store
+            from config.settings import DEV_CONFIG
+            from api_server import ApiService, build_components
+            
+            DEV_CONFIG['mock_api'] = True
+            DEV_CONFIG['mock_latency'] = args.llm_latency
+            components = build_components(Path(store_dir) / "sessions", Path(store_dir) / "jobs")
+            
+            runner = web.AppRunner(ApiService(components).create_app())
+            await runner.setup()
+            await web.TCPSite(runner, '127.0.0.1', 0).start()
+            base_url = f"http://127.0.0.1:{runner.addresses[0][1]}"
+        
+        connections = [0]
+        
+        async def count_connection(session, context, params):
+            connections[0] += 1
+        
+        trace = aiohttp.TraceConfig()
+        trace.on_connection_create_end.append(count_connection)
+        
+        results = {'endpoints': {}, 'analyses': [], 'errors': 0}
+        start = time.perf_counter()
+        deadline = start + args.duration
+        
+        try:
+            # One pooled, keep-alive connection per client at most
+            connector = aiohttp.TCPConnector(limit=args.clients)
+            async with aiohttp.ClientSession(connector=connector, trace_configs=[trace]) as http:
+                await asyncio.gather(*(
+                    _load_test_client(http, base_url, client_id, deadline, results)
+                    for client_id in range(args.clients)
+                ))
+                async with http.get(base_url + '/api/health') as response:
+                    results['health'] = await response.json()
+        finally:
+            if runner is not None:
+                await runner.cleanup()
+        
+        results['elapsed'] = time.perf_counter() - start
+        results['connections'] = connections[0]
+        results['target'] = args.url or "in-process server (stub LLM)"
+        return results
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+def load_test(args: argparse.Namespace) -> int:
+    """Drive the HTTP API with concurrent clients and report latency, 429s and throughput"""
+    results = asyncio.run(_run_load_test(args))
+    requests_made = sum(len(stats['latencies']) for stats in results['endpoints'].values())
+    
+    print(f"{args.clients} clients for {results['elapsed']:.1f}s against {results['target']}")
+    print(f"{requests_made} requests ({requests_made / results['elapsed']:.0f} req/s) over {results['connections']} connection(s)")
+    print(f"{'endpoint':<8} {'count':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  status codes")
+    for name, stats in results['endpoints'].items():
+        latencies = stats['latencies']
+        codes = ", ".join(f"{code}={count}" for code, count in sorted(stats['status'].items()))
+        print(f"{name:<8} {len(latencies):>7} {_percentile(latencies, 0.5) * 1000:>8.1f} "
+              f"{_percentile(latencies, 0.95) * 1000:>8.1f} {_percentile(latencies, 0.99) * 1000:>8.1f}  {codes}")
+    
+    analyses = results['analyses']
+    print(f"Analyses completed: {len(analyses)} ({len(analyses) * 60 / results['elapsed']:.1f}/min), "
+          f"end-to-end p50 {_percentile(analyses, 0.5):.2f}s p95 {_percentile(analyses, 0.95):.2f}s")
+    if results['errors']:
+        print(f"FAILED - {results['errors']} request(s) or analyses failed")
+        return 1
+    return 0
+
+# Dependencies that should only load on first use, never at startup
+HEAVY_MODULES = ('google.generativeai', 'reportlab', 'docx', 'pyarrow', 'youtube_transcript_api', 'requests', 'pytube')
+
+def _startup_imports(script: Path) -> List[str]:
+    """Modules a script imports at top level, in order"""
+    modules = []
+    for node in ast.parse(script.read_text(encoding='utf-8')).body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+def import_timing(args: argparse.Namespace) -> int:
+    """Time the app's startup imports in a fresh interpreter with -X importtime"""
+    root = Path(__file__).resolve().parent
+    modules = args.module or _startup_imports(root / 'app.py')
+    
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', "; ".join(f"import {module}" for module in modules)],
+        capture_output=True, text=True, cwd=root
+    )
+    wall = time.perf_counter() - start
+    
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, self_us, cumulative_us, name = (part for part in line.replace('import time:', '|', 1).split('|'))
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append({'module': name.strip(), 'depth': depth, 'self_ms': int(self_us) / 1000,
+                     'cumulative_ms': int(cumulative_us) / 1000})
+    
+    if result.returncode:
+        print(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "Import failed", file=sys.stderr)
+        return 1
+    
+    loaded = {row['module'] for row in rows}
+    report = {
+        'modules': modules,
+        'total_ms': round(sum(row['cumulative_ms'] for row in rows if row['depth'] == 0), 1),
+        'interpreter_ms': round(wall * 1000, 1),
+        'modules_loaded': len(rows),
+        'heavy_loaded': [module for module in HEAVY_MODULES if module in loaded],
+        'slowest': sorted(rows, key=lambda row: row['cumulative_ms'], reverse=True)[:args.top]
+    }
+    
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    
+    print(f"Startup imports: {report['total_ms']:.0f} ms for {report['modules_loaded']} modules "
+          f"({report['interpreter_ms']:.0f} ms including interpreter start)")
+    print(f"{'cumulative':>12} {'self':>9}  module")
+    for row in report['slowest']:
+        print(f"{row['cumulative_ms']:>9.1f} ms {row['self_ms']:>6.1f} ms  {'  ' * row['depth']}{row['module']}")
+    print("Heavy dependencies loaded at startup: " + (", ".join(report['heavy_loaded']) or "none"))
+    return 0
+
+def _sim_session(video_id: str, minutes: int, rng: random.Random) -> Dict:
+    """A saved session with a transcript of about one segment every four seconds"""
+    words = ["analysis", "video", "market", "growth", "strategy", "example", "people", "really", "question", "important"]
+    segments = []
+    for i in range(minutes * 15):
+        text = " ".join(rng.choice(words) for _ in range(10))
+        segments.append({'text': text, 'start_time': i * 4.0, 'duration': 4.0, 'timestamp': f"{i * 4 // 60:02d}:{i * 4 % 60:02d}"})
+    
+    return {
+        'url': f"https://www.youtube.com/watch?v={video_id}",
+        'video_info': {'video_id': video_id, 'title': f"Simulated {video_id}", 'channel': "Memory Sim"},
+        'transcript': {
+            'text': " ".join(segment['text'] for segment in segments),
+            'segments': segments,
+            'language_codes': ['en'],
+            'total_segments': len(segments),
+            'total_duration': minutes * 60
+        },
+        'analysis': {
+            'main_summary': " ".join(rng.choice(words) for _ in range(400)),
+            'key_takeaways': [" ".join(rng.choice(words) for _ in range(15)) for _ in range(10)],
+            'topics': words[:5]
+        },
+        'settings': {'summary_type': 'Comprehensive'}
+    }
+
+def _traced_bytes() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+def memory_sim(args: argparse.Namespace) -> int:
+    """Compare per-user memory of private session copies with shared object store handles"""
+    from core.session_manager import SessionManager
+    from core.object_store import ObjectStore
+    
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory(prefix="memory-sim-") as sessions_dir:
+        session_manager = SessionManager(Path(sessions_dir))
+        session_ids = [
+            session_manager.save_session(_sim_session(f"memsim{i:02d}", args.minutes, rng))
+            for i in range(args.videos)
+        ]
+        
+        # Popular videos are open in many sessions at once
+        weights = [1 / (rank + 1) for rank in range(len(session_ids))]
+        opened = rng.choices(session_ids, weights=weights, k=args.users)
+        
+        tracemalloc.start()
+        
+        before = _traced_bytes()
+        users = [session_manager.load_session(session_id, fields=SessionManager.DISPLAY_FIELDS) for session_id in opened]
+        copies_bytes = _traced_bytes() - before
+        del users
+        
+        object_store = ObjectStore()
+        before = _traced_bytes()
+        users = [session_manager.open_shared(session_id, object_store=object_store) for session_id in opened]
+        shared_bytes = _traced_bytes() - before
+        held = object_store.get_stats()
+        
+        # Streamlit drops the state of expired sessions; their handles go with it
+        del users
+        gc.collect()
+        object_store.collect()
+        after_expiry_bytes = _traced_bytes() - before
+        expired = object_store.get_stats()
+        
+        tracemalloc.stop()
+    
+    report = {
+        'users': args.users,
+        'videos_open': len(set(opened)),
+        'transcript_minutes': args.minutes,
+        'per_user_copies': {'total_bytes': copies_bytes, 'per_user_bytes': copies_bytes / args.users},
+        'shared_handles': {'total_bytes': shared_bytes, 'per_user_bytes': shared_bytes / args.users, 'store': held},
+        'after_expiry': {'retained_bytes': after_expiry_bytes, 'store': expired}
+    }
+    
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    
+    print(f"{args.users} users on {report['videos_open']} distinct {args.minutes}-minute videos")
+    print(f"Per-user copies:  {_format_bytes(copies_bytes):>10} total, {_format_bytes(copies_bytes / args.users):>10} per user")
+    print(f"Shared handles:   {_format_bytes(shared_bytes):>10} total, {_format_bytes(shared_bytes / args.users):>10} per user"
+          f" ({held['objects']} objects, {held['handles']} handles, {held['loads']} loads, {held['hits']} hits)")
+    print(f"After expiry:     {_format_bytes(after_expiry_bytes):>10} retained ({expired['freed']} objects freed, {expired['objects']} held)")
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser"""
+    parser = argparse.ArgumentParser(description="YouTube Video Analyzer Pro utilities")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    report_parser = subparsers.add_parser('storage-report', help="Show session storage usage")
+    report_parser.add_argument('--migrate', action='store_true', help="Move legacy inline payloads into the blob store and re-key older blobs first")
+    report_parser.add_argument('--json', action='store_true', help="Print the raw report as JSON")
+    report_parser.set_defaults(handler=storage_report)
+    
+    retention_parser = subparsers.add_parser('retention', help="Run one session retention pass")
+    retention_parser.add_argument('--dry-run', action='store_true', help="Only report what would be evicted")
+    retention_parser.add_argument('--max-age-days', type=int, help="Override SESSION_TIMEOUT_DAYS")
+    retention_parser.add_argument('--max-sessions', type=int, help="Override MAX_SESSIONS_PER_USER")
+    retention_parser.add_argument('--no-archive', action='store_true', help="Delete instead of archiving evicted sessions")
+    retention_parser.add_argument('--json', action='store_true', help="Print the raw report as JSON")
+    retention_parser.set_defaults(handler=retention)
+    
+    export_parser = subparsers.add_parser('export-history', help="Stream the session history as NDJSON")
+    export_parser.add_argument('-o', '--output', help="Output file (default: stdout); a .gz suffix implies --gzip")
+    export_parser.add_argument('--include-payloads', action='store_true', help="Include full transcripts and analyses")
+    export_parser.add_argument('--gzip', action='store_true', help="Gzip-compress the output")
+    export_parser.set_defaults(handler=export_history)
+    
+    bulk_parser = subparsers.add_parser('bulk-export', help="Export many sessions into one ZIP archive")
+    bulk_parser.add_argument('-o', '--output', required=True, help="ZIP file to write")
+    bulk_parser.add_argument('--format', action='append', default=[], help="Export format (repeatable, default PDF)")
+    bulk_parser.add_argument('--kind', action='append', choices=['summary', 'full_report', 'transcript'], help="Document kind (repeatable, default full_report)")
+    bulk_parser.add_argument('--session', action='append', help="Export only these session IDs (repeatable)")
+    bulk_parser.add_argument('--channel', help="Only sessions from this channel")
+    bulk_parser.add_argument('--summary-type', help="Only sessions with this summary style")
+    bulk_parser.add_argument('--since', help="Only sessions created on or after this ISO date")
+    bulk_parser.add_argument('--until', help="Only sessions created on or before this ISO date")
+    bulk_parser.add_argument('--workers', type=int, help="Renderer processes (default EXPORT_BULK_WORKERS)")
+    bulk_parser.set_defaults(handler=bulk_export)
+    
+    batch_parser = subparsers.add_parser('batch', help="Analyse a list of videos, playlists or channels headlessly")
+    batch_parser.add_argument('input', help="File with one URL per line, or - for stdin")
+    batch_parser.add_argument('-o', '--output', default='batch-results.ndjson', help="NDJSON results file; rerunning resumes it")
+    batch_parser.add_argument('--summary-type', default='Comprehensive', help="Summary style (default Comprehensive)")
+    batch_parser.add_argument('--language', default='English', help="Summary language (default English)")
+    batch_parser.add_argument('--no-sentiment', action='store_true', help="Skip sentiment analysis")
+    batch_parser.add_argument('--no-topics', action='store_true', help="Skip topic extraction")
+    batch_parser.add_argument('--transcript-workers', type=int, help="Concurrent transcript downloads (default BATCH_TRANSCRIPT_WORKERS)")
+    batch_parser.add_argument('--llm-workers', type=int, help="Videos analysed concurrently (default BATCH_LLM_WORKERS)")
+    batch_parser.set_defaults(handler=batch)
+    
+    timing_parser = subparsers.add_parser('import-timing', help="Profile startup imports (python -X importtime)")
+    timing_parser.add_argument('--module', action='append', help="Module to import (repeatable, default: app.py's imports)")
+    timing_parser.add_argument('--top', type=int, default=20, help="Number of slowest imports to list")
+    timing_parser.add_argument('--json', action='store_true', help="Print the raw report as JSON")
+    timing_parser.set_defaults(handler=import_timing)
+    
+    load_parser = subparsers.add_parser('load-test', help="Load-test the HTTP API (in-process on the stub LLM by default)")
+    load_parser.add_argument('--url', help="Base URL of a running api_server.py (start it with MOCK_API=true)")
+    load_parser.add_argument('--clients', type=int, default=20, help="Concurrent clients")
+    load_parser.add_argument('--duration', type=float, default=15.0, help="Seconds to keep submitting")
+    load_parser.add_argument('--llm-latency', type=float, default=0.05, help="Seconds per stub LLM call (in-process server only)")
+    load_parser.set_defaults(handler=load_test)
+    
+    memory_parser = subparsers.add_parser('memory-sim', help="Measure per-user memory of open sessions under simulated load")
+    memory_parser.add_argument('--users', type=int, default=50, help="Concurrent user sessions")
+    memory_parser.add_argument('--videos', type=int, default=8, help="Distinct videos the users open")
+    memory_parser.add_argument('--minutes', type=int, default=60, help="Transcript length of each video")
+    memory_parser.add_argument('--json', action='store_true', help="Print the raw report as JSON")
+    memory_parser.set_defaults(handler=memory_sim)
+    
+    stress_parser = subparsers.add_parser('stress-store', help="Concurrency stress test for the session store")
+    stress_parser.add_argument('--processes', type=int, default=4, help="Number of writer processes")
+    stress_parser.add_argument('--iterations', type=int, default=100, help="Operations per process")
+    stress_parser.set_defaults(handler=stress_store)
+    
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,32 +3,39 @@ import streamlit as st
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 import json
+import tempfile
+from itertools import chain
 from core.ai_processor import AIProcessor
+from core.object_store import ObjectHandle
+from utils.file_ops import iter_ndjson
+from config.settings import EXPORTS_DIR
+from components.fragments import timed_fragment, rerun_fragment
 
 class ChatInterface:
     """Interactive chat interface for discussing video content"""
     
     def __init__(self, ai_processor: AIProcessor):
         self.ai_processor = ai_processor
-        
-        # Initialize chat state
-        if 'chat_history' not in st.session_state:
-            st.session_state.chat_history = []
-        if 'chat_context' not in st.session_state:
-            st.session_state.chat_context = None
-        if 'chat_suggestions' not in st.session_state:
-            st.session_state.chat_suggestions = []
     
-    def render_chat_interface(self, transcript_data: Dict[str, Any], analysis_results: Dict[str, Any], video_info: Dict[str, Any]):
-        """Render the complete chat interface"""
-        
-        # Set context if not already set
-        if st.session_state.chat_context is None:
+    @timed_fragment('chat')
+    def render_chat_interface(self, transcript_ref: ObjectHandle, analysis_ref: ObjectHandle, video_info: Dict[str, Any]):
+        """Render the complete chat interface; a fragment, so a chat turn reruns only the chat.
+        
+        The chat context keeps the object store handles rather than the transcript
+        and analysis, which are shared with every other user viewing the video.
+        """
+        # Initialize chat state per user session; this instance is shared by all of them
+        st.session_state.setdefault('chat_history', [])
+        st.session_state.setdefault('chat_suggestions', [])
+        
+        context = st.session_state.get('chat_context')
+        if context is None or context['transcript'].key != transcript_ref.key:
             st.session_state.chat_context = {
-                'transcript': transcript_data,
-                'analysis': analysis_results,
+                'transcript': transcript_ref,
+                'analysis': analysis_ref,
                 'video_info': video_info
             }
+            st.session_state.chat_suggestions = []
         
         st.subheader("🤖 Chat with Video Content")
         st.markdown("Ask questions about the video content and get AI-powered answers!")
@@ -184,7 +191,7 @@ class ChatInterface:
         with st.spinner("🤔 Thinking..."):
             try:
                 context = st.session_state.chat_context
-                transcript_text = context['transcript']['text']
+                transcript_text = context['transcript'].get()['text']
                 
                 # Get AI response
                 response = self.ai_processor.chat_with_content(
@@ -203,12 +210,12 @@ class ChatInterface:
                 
                 # Generate new suggestions based on the conversation
                 self._update_suggestions()
-                
+            
             except Exception as e:
                 st.error(f"Sorry, I couldn't process your question: {e}")
         
-        # Rerun to update the interface
-        st.rerun()
+        # Rerun the chat fragment to show the answer
+        rerun_fragment()
     
     def _generate_suggestions(self) -> List[str]:
         """Generate contextual question suggestions"""
@@ -219,7 +226,7 @@ class ChatInterface:
                 return self._get_default_suggestions()
             
             # Generate suggestions based on video content
-            analysis = context.get('analysis', {})
+            analysis = context['analysis'].get() or {}
             video_info = context.get('video_info', {})
             
             suggestions = []
@@ -251,7 +258,7 @@ class ChatInterface:
             ])
             
             return suggestions[:6]
-            
+        
         except Exception as e:
             st.warning(f"Error generating suggestions: {e}")
             return self._get_default_suggestions()
@@ -314,7 +321,7 @@ class ChatInterface:
                     updated_suggestions.append(suggestion)
             
             st.session_state.chat_suggestions = updated_suggestions
-            
+        
         except Exception as e:
             st.warning(f"Error updating suggestions: {e}")
     
@@ -342,7 +349,7 @@ class ChatInterface:
                 with st.spinner("🔄 Regenerating answer..."):
                     try:
                         context = st.session_state.chat_context
-                        transcript_text = context['transcript']['text']
+                        transcript_text = context['transcript'].get()['text']
                         
                         # Generate new response
                         response = self.ai_processor.chat_with_content(
@@ -355,8 +362,8 @@ class ChatInterface:
                         st.session_state.chat_history[message_index]['timestamp'] = datetime.now().strftime('%H:%M:%S')
                         st.session_state.chat_history[message_index]['rating'] = None
                         
-                        st.rerun()
-                        
+                        rerun_fragment()
+                    
                     except Exception as e:
                         st.error(f"Error regenerating answer: {e}")
     
@@ -365,7 +372,7 @@ class ChatInterface:
         st.session_state.chat_history = []
         st.session_state.chat_suggestions = self._generate_suggestions()
         st.success("Chat history cleared!")
-        st.rerun()
+        rerun_fragment()
     
     def _generate_chat_summary(self):
         """Generate a summary of the chat conversation"""
@@ -400,7 +407,7 @@ class ChatInterface:
             """
             
             st.info(summary)
-            
+        
         except Exception as e:
             st.error(f"Error generating summary: {e}")
     
@@ -412,28 +419,31 @@ class ChatInterface:
             return
         
         try:
-            # Create export data
-            export_data = {
-                'export_info': {
-                    'type': 'chat_history',
-                    'generated_at': datetime.now().isoformat(),
-                    'total_messages': len(st.session_state.chat_history)
-                },
-                'video_info': st.session_state.chat_context.get('video_info', {}),
-                'chat_history': st.session_state.chat_history
+            # One NDJSON record per message instead of a single indented document
+            export_info = {
+                'type': 'export_info',
+                'export_type': 'chat_history',
+                'generated_at': datetime.now().isoformat(),
+                'total_messages': len(st.session_state.chat_history),
+                'video_info': st.session_state.chat_context.get('video_info', {})
             }
-            
-            # Convert to JSON
-            export_json = json.dumps(export_data, indent=2, ensure_ascii=False)
-            
-            # Offer download
-            st.download_button(
-                label="📥 Download Chat History",
-                data=export_json.encode('utf-8'),
-                file_name=f"chat_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                mime="application/json"
-            )
-            
+            messages = ({'type': 'message', **message} for message in st.session_state.chat_history)
+            
+            # Streamed into a temporary file chunk by chunk, which the download reads back;
+            # unbuffered, because st.download_button accepts raw files but not buffered read-write ones
+            EXPORTS_DIR.mkdir(parents=True, exist_ok=True)
+            with tempfile.TemporaryFile(dir=EXPORTS_DIR, buffering=0) as export_file:
+                for chunk in iter_ndjson(chain([export_info], messages)):
+                    export_file.write(chunk)
+                
+                # Offer download
+                st.download_button(
+                    label="📥 Download Chat History",
+                    data=export_file,
+                    file_name=f"chat_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.ndjson",
+                    mime="application/x-ndjson"
+                )
+        
         except Exception as e:
             st.error(f"Error exporting chat: {e}")
     
@@ -441,7 +451,7 @@ class ChatInterface:
         """Generate new question suggestions"""
         st.session_state.chat_suggestions = self._generate_suggestions()
         st.success("New suggestions generated!")
-        st.rerun()
+        rerun_fragment()
     
     def get_chat_insights(self) -> Dict[str, Any]:
         """Get insights about the chat conversation"""
@@ -466,7 +476,7 @@ class ChatInterface:
             }
             
             return insights
-            
+        
         except Exception as e:
             st.error(f"Error generating chat insights: {e}")
             return {}
\ No newline at end of file
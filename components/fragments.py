@@ -0,0 +1,64 @@
+# components/fragments.py
+"""Independently rerunnable page sections and their script timings.
+
+Widgets inside an st.fragment rerun only that fragment, so a chat turn or a
+history filter change no longer re-executes the whole results page. Each
+fragment is called with everything it renders as arguments; Streamlit replays
+those arguments on fragment-only reruns.
+"""
+import functools
+import statistics
+import time
+from contextlib import contextmanager
+from typing import Dict, Any
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# Samples kept per timed section
+TIMING_WINDOW = 50
+
+def record_script_time(name: str, seconds: float) -> None:
+    """Keep the last TIMING_WINDOW durations of a timed section in session state"""
+    samples = st.session_state.setdefault('script_timings', {}).setdefault(name, [])
+    samples.append(seconds)
+    del samples[:-TIMING_WINDOW]
+
+@contextmanager
+def script_timer(name: str):
+    """Time a block of the script; reruns raised inside it still record the time spent"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_script_time(name, time.perf_counter() - start)
+
+def timed_fragment(name: str, **fragment_options):
+    """st.fragment whose every run, full-app or fragment-only, is timed as `name`"""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def run(*args, **kwargs):
+            with script_timer(name):
+                return fn(*args, **kwargs)
+        return st.fragment(run, **fragment_options)
+    return decorate
+
+def rerun_fragment() -> None:
+    """Rerun only the calling fragment.
+    
+    Streamlit refuses fragment-scoped reruns while a fragment is executing as
+    part of a full-app run, so in that case the app is rerun instead.
+    """
+    ctx = get_script_run_ctx()
+    st.rerun(scope="fragment" if ctx and ctx.fragment_ids_this_run else "app")
+
+def timing_summary() -> Dict[str, Dict[str, Any]]:
+    """Run count, last and median milliseconds for every timed section"""
+    return {
+        name: {
+            'runs': len(samples),
+            'last_ms': samples[-1] * 1000,
+            'median_ms': statistics.median(samples) * 1000
+        }
+        for name, samples in st.session_state.get('script_timings', {}).items()
+        if samples
+    }
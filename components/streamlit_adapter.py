@@ -0,0 +1,56 @@
+# components/streamlit_adapter.py
+import time
+from typing import Any, Optional
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from core.runtime import Reporter, set_reporter, set_secrets
+
+class StreamlitReporter(Reporter):
+    """Shows core messages in the page of the script run that triggered them.
+    
+    Background threads (analysis jobs, retention) have no script context; their
+    messages go to the log instead of being dropped by Streamlit.
+    """
+    
+    def error(self, message: str) -> None:
+        if get_script_run_ctx() is None:
+            return super().error(message)
+        st.error(message)
+    
+    def warning(self, message: str) -> None:
+        if get_script_run_ctx() is None:
+            return super().warning(message)
+        st.warning(message)
+    
+    def info(self, message: str) -> None:
+        if get_script_run_ctx() is None:
+            return super().info(message)
+        st.info(message)
+    
+    def wait(self, seconds: int, message: str, cancel_token=None) -> None:
+        if get_script_run_ctx() is None:
+            return super().wait(seconds, message, cancel_token)
+        
+        st.warning(message)
+        countdown_placeholder = st.empty()
+        for i in range(seconds, 0, -1):
+            countdown_placeholder.info(f"⏱️ Retrying in {i} seconds...")
+            if cancel_token is None:
+                time.sleep(1)
+            elif cancel_token.wait(1):
+                break
+        countdown_placeholder.empty()
+
+class StreamlitSecrets:
+    """Read-only view of st.secrets that tolerates a missing secrets.toml"""
+    
+    def get(self, name: str, default: Optional[Any] = None) -> Any:
+        try:
+            return st.secrets.get(name, default)
+        except Exception:
+            return default
+
+def install() -> None:
+    """Route core messages and secret lookups through Streamlit"""
+    set_reporter(StreamlitReporter())
+    set_secrets(StreamlitSecrets())
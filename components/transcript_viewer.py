@@ -0,0 +1,174 @@
+# components/transcript_viewer.py
+import html
+import re
+from bisect import bisect_left, bisect_right
+from typing import List, Dict, Any, Optional, Tuple
+import streamlit as st
+from core.youtube_handler import format_timestamp
+from core.object_store import ObjectHandle, get_object_store
+from components.fragments import timed_fragment
+from config.settings import UI_CONFIG
+
+WINDOW_CHOICES = [1, 2, 5, 10, 15]  # Minutes of video per page
+TEXT_PAGE_CHARS = 5000  # Page size for transcripts without timed segments
+
+class TranscriptIndex:
+    """Timed transcript segments with a bisect index over their start times"""
+    
+    def __init__(self, segments: List[Dict[str, Any]]):
+        self.segments = segments
+        self.starts = [segment['start_time'] for segment in segments]
+        last = segments[-1] if segments else None
+        self.duration = last['start_time'] + last.get('duration', 0) if last else 0
+    
+    def locate(self, seconds: float) -> int:
+        """Index of the segment playing at `seconds`"""
+        return max(0, bisect_right(self.starts, seconds) - 1)
+    
+    def window(self, start: float, length: float, max_segments: int) -> Tuple[int, int]:
+        """Segment index range [lo, hi) covering start..start+length, capped at max_segments"""
+        lo = self.locate(start)
+        hi = bisect_left(self.starts, start + length, lo)
+        return lo, min(max(hi, lo + 1), lo + max_segments, len(self.segments))
+    
+    def find(self, query: str, after: int) -> Optional[int]:
+        """First segment from index `after` on whose text contains query (case-insensitive)"""
+        needle = query.lower()
+        for i in range(after, len(self.segments)):
+            if needle in self.segments[i]['text'].lower():
+                return i
+        return None
+
+def parse_timestamp(value: str) -> Optional[float]:
+    """Seconds from '90', '01:30' or '1:02:03'; None if it is not a timestamp"""
+    parts = value.strip().split(':')
+    if not 1 <= len(parts) <= 3 or not all(part.isdigit() for part in parts):
+        return None
+    
+    seconds = 0
+    for part in parts:
+        seconds = seconds * 60 + int(part)
+    return float(seconds)
+
+def highlight(text: str, pattern: Optional[re.Pattern]) -> Tuple[str, int]:
+    """HTML-escaped text with matches wrapped in <mark>, and the number of matches"""
+    if pattern is None:
+        return html.escape(text), 0
+    
+    parts = pattern.split(text)
+    marked = ''.join(
+        f"<mark>{html.escape(part)}</mark>" if i % 2 else html.escape(part)
+        for i, part in enumerate(parts)
+    )
+    return marked, len(parts) // 2
+
+def _get_index(transcript_ref: ObjectHandle) -> TranscriptIndex:
+    """Index of the displayed transcript, built once per process and shared by every viewer of it"""
+    cached = st.session_state.get('transcript_index')
+    if not cached or cached.key != f"{transcript_ref.key}#index":
+        segments = (transcript_ref.get() or {}).get('segments') or []
+        cached = get_object_store().acquire(f"{transcript_ref.key}#index", lambda: TranscriptIndex(segments))
+        st.session_state.transcript_index = cached
+        st.session_state.transcript_window_start = 0.0
+    return cached.get()
+
+def _move_window(seconds: float) -> None:
+    st.session_state.transcript_window_start = seconds
+    st.session_state.pop('transcript_notice', None)
+
+def _jump_to(index: TranscriptIndex) -> None:
+    """on_change of the jump box: move the window to the segment playing at that time"""
+    seconds = parse_timestamp(st.session_state.transcript_jump_to)
+    if seconds is None:
+        st.session_state.transcript_notice = "⚠️ Use a timestamp like 12:30 or 1:02:03"
+        return
+    _move_window(index.starts[index.locate(seconds)])
+
+def _next_match(index: TranscriptIndex, query: str, after: int) -> None:
+    found = index.find(query, after)
+    if found is None:
+        st.session_state.transcript_notice = f"No more matches for \"{query}\" after this window."
+        return
+    _move_window(index.starts[found])
+
+@timed_fragment('transcript')
+def render_transcript_viewer(transcript_ref: ObjectHandle):
+    """Full transcript tab, sent one time window of segments per render.
+    
+    Only the segments inside the window reach the browser, so the payload of a
+    rerun is bounded however long the video is. Paging, jump-to-time and search
+    rerun only this fragment.
+    """
+    st.subheader("📄 Full Transcript")
+    
+    index = _get_index(transcript_ref)
+    if not index.segments:
+        _render_text_pages(transcript_ref.get().get('text', ''))
+        return
+    
+    default_window = UI_CONFIG['transcript_window_minutes']
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        window_minutes = st.selectbox(
+            "Window (minutes):",
+            WINDOW_CHOICES,
+            index=WINDOW_CHOICES.index(default_window) if default_window in WINDOW_CHOICES else 2,
+            key="transcript_window_minutes"
+        )
+    with col2:
+        st.text_input("Jump to:", placeholder="mm:ss", key="transcript_jump_to", on_change=_jump_to, args=(index,))
+    with col3:
+        query = st.text_input("Search:", placeholder="Highlight words in this window", key="transcript_query").strip()
+    
+    window_length = window_minutes * 60
+    start = st.session_state.get('transcript_window_start', 0.0)
+    lo, hi = index.window(start, window_length, UI_CONFIG['transcript_window_max_segments'])
+    
+    pattern = re.compile(f"({re.escape(query)})", re.IGNORECASE) if query else None
+    lines = []
+    matches = 0
+    for segment in index.segments[lo:hi]:
+        text, found = highlight(segment['text'], pattern)
+        matches += found
+        lines.append(f"<b>[{html.escape(segment['timestamp'])}]</b> {text}")
+    
+    end_time = index.starts[hi] if hi < len(index.segments) else index.duration
+    st.caption(
+        f"{format_timestamp(index.starts[lo])}–{format_timestamp(end_time)} of {format_timestamp(index.duration)} · "
+        f"segments {lo + 1:,}–{hi:,} of {len(index.segments):,}"
+        + (f" · {matches} match{'es' if matches != 1 else ''} in this window" if query else "")
+    )
+    
+    notice = st.session_state.pop('transcript_notice', None)
+    if notice:
+        st.info(notice)
+    
+    st.markdown(
+        f'<div style="max-height: 400px; overflow-y: auto; line-height: 1.6;">{"<br>".join(lines)}</div>',
+        unsafe_allow_html=True
+    )
+    
+    # Callbacks move the window before the fragment reruns, so each click is a single run
+    previous_start = index.starts[index.locate(max(0.0, index.starts[lo] - window_length))]
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.button("⬅️ Previous", disabled=lo == 0, use_container_width=True, key="transcript_prev",
+                  on_click=_move_window, args=(previous_start,))
+    with col2:
+        st.button("🔎 Next Match", disabled=not query, use_container_width=True, key="transcript_next_match",
+                  on_click=_next_match, args=(index, query, hi))
+    with col3:
+        st.button("Next ➡️", disabled=hi >= len(index.segments), use_container_width=True, key="transcript_next",
+                  on_click=_move_window, args=(index.starts[min(hi, len(index.segments) - 1)],))
+
+def _render_text_pages(text: str):
+    """Fixed-size pages for transcripts stored without timed segments"""
+    pages = max(1, -(-len(text) // TEXT_PAGE_CHARS))
+    page = st.number_input("Page:", min_value=1, max_value=pages, value=1, key="transcript_text_page")
+    st.caption(f"Page {page} of {pages}")
+    
+    page_text = html.escape(text[(page - 1) * TEXT_PAGE_CHARS:page * TEXT_PAGE_CHARS]).replace('\n', '<br>')
+    st.markdown(
+        f'<div style="max-height: 400px; overflow-y: auto; line-height: 1.6;">{page_text}</div>',
+        unsafe_allow_html=True
+    )
@@ -18,9 +18,10 @@ DATA_DIR = BASE_DIR / 'data'
 SESSIONS_DIR = DATA_DIR / 'sessions'
 EXPORTS_DIR = DATA_DIR / 'exports'
 LOGS_DIR = DATA_DIR / 'logs'
+JOBS_DIR = DATA_DIR / 'jobs'
 
 # Create directories if they don't exist
-for directory in [DATA_DIR, SESSIONS_DIR, EXPORTS_DIR, LOGS_DIR]:
+for directory in [DATA_DIR, SESSIONS_DIR, EXPORTS_DIR, LOGS_DIR, JOBS_DIR]:
     directory.mkdir(parents=True, exist_ok=True)
 
 # API Configuration
@@ -32,6 +33,18 @@ API_CONFIG = {
     'timeout': int(os.getenv('API_TIMEOUT', '30'))
 }
 
+# HTTP API service (api_server.py)
+API_SERVER_CONFIG = {
+    'host': os.getenv('API_HOST', '127.0.0.1'),
+    'port': int(os.getenv('API_PORT', '8080')),
+    # Analyses queued or running before new submissions get 429
+    'max_pending_jobs': int(os.getenv('API_MAX_PENDING_JOBS', '32')),
+    # Blocking requests (exports, session reads) running at once, and how many may wait
+    'max_concurrent_requests': int(os.getenv('API_MAX_CONCURRENT_REQUESTS', '8')),
+    'request_backlog': int(os.getenv('API_REQUEST_BACKLOG', '64')),
+    'keepalive_timeout': int(os.getenv('API_KEEPALIVE_TIMEOUT', '75'))
+}
+
 # Analysis Configuration
 ANALYSIS_CONFIG = {
     'max_transcript_length': int(os.getenv('MAX_TRANSCRIPT_LENGTH', '500000')),
@@ -41,6 +54,18 @@ ANALYSIS_CONFIG = {
     'max_action_items': int(os.getenv('MAX_ACTION_ITEMS', '8')),
     'max_topics': int(os.getenv('MAX_TOPICS', '12')),
     'default_language': os.getenv('DEFAULT_LANGUAGE', 'English'),
+    # Background analysis jobs: worker threads and how long finished job files are kept
+    'job_workers': int(os.getenv('ANALYSIS_JOB_WORKERS', '2')),
+    'job_ttl': int(os.getenv('ANALYSIS_JOB_TTL', '86400')),
+    # A job's owning process renews its lease while the job is active; expired leases mark it interrupted
+    'job_lease_seconds': int(os.getenv('ANALYSIS_JOB_LEASE_SECONDS', '60')),
+    # Headless batch runs: concurrent transcript downloads and videos in LLM analysis
+    'batch_transcript_workers': int(os.getenv('BATCH_TRANSCRIPT_WORKERS', '4')),
+    'batch_llm_workers': int(os.getenv('BATCH_LLM_WORKERS', '2')),
+    # Speculative transcript and metadata fetches started on URL entry, and how long their results are kept
+    'prefetch_workers': int(os.getenv('PREFETCH_WORKERS', '2')),
+    'prefetch_ttl': int(os.getenv('PREFETCH_TTL', '600')),
+    'prefetch_info_timeout': float(os.getenv('PREFETCH_INFO_TIMEOUT', '15')),
     'supported_languages': [
         'English', 'Spanish', 'French', 'German', 'Chinese', 
         'Japanese', 'Portuguese', 'Italian', 'Russian', 'Arabic'
@@ -50,9 +75,16 @@ ANALYSIS_CONFIG = {
 # Export Configuration
 EXPORT_CONFIG = {
     'max_file_size': int(os.getenv('MAX_EXPORT_SIZE', '50000000')),  # 50MB
-    'supported_formats': ['PDF', 'Word Document', 'Text File', 'JSON'],
+    'supported_formats': ['PDF', 'Word Document', 'Text File', 'Markdown', 'JSON'],
+    'transcript_formats': ['Text File', 'SRT', 'WebVTT', 'Parquet', 'Arrow'],
     'default_format': os.getenv('DEFAULT_EXPORT_FORMAT', 'PDF'),
-    'include_branding': os.getenv('INCLUDE_BRANDING', 'true').lower() == 'true'
+    'include_branding': os.getenv('INCLUDE_BRANDING', 'true').lower() == 'true',
+    'cache_memory_bytes': int(os.getenv('EXPORT_CACHE_MEMORY_MB', '64')) * 1024 * 1024,
+    'cache_disk_bytes': int(os.getenv('EXPORT_CACHE_DISK_MB', '256')) * 1024 * 1024,
+    'job_workers': int(os.getenv('EXPORT_JOB_WORKERS', '2')),
+    'job_max_pending': int(os.getenv('EXPORT_JOB_MAX_PENDING', '20')),
+    'artifact_ttl': int(os.getenv('EXPORT_ARTIFACT_TTL_SECONDS', '3600')),
+    'bulk_workers': int(os.getenv('EXPORT_BULK_WORKERS', str(min(4, os.cpu_count() or 1))))
 }
 
 # Session Configuration
@@ -60,7 +92,13 @@ SESSION_CONFIG = {
     'max_sessions_per_user': int(os.getenv('MAX_SESSIONS_PER_USER', '100')),
     'session_timeout_days': int(os.getenv('SESSION_TIMEOUT_DAYS', '30')),
     'auto_cleanup': os.getenv('AUTO_CLEANUP', 'true').lower() == 'true',
-    'backup_sessions': os.getenv('BACKUP_SESSIONS', 'true').lower() == 'true'
+    'backup_sessions': os.getenv('BACKUP_SESSIONS', 'true').lower() == 'true',
+    'blob_codec': os.getenv('SESSION_BLOB_CODEC', 'auto'),  # auto, zst or gz
+    'fsync_policy': os.getenv('SESSION_FSYNC_POLICY', 'file'),  # always, file or never
+    'lock_timeout': float(os.getenv('SESSION_LOCK_TIMEOUT', '30')),
+    'max_total_bytes': int(os.getenv('MAX_SESSION_STORAGE_MB', '500')) * 1024 * 1024,
+    'retention_interval': int(os.getenv('RETENTION_INTERVAL_SECONDS', '3600')),
+    'retention_batch_size': int(os.getenv('RETENTION_BATCH_SIZE', '20'))
 }
 
 # UI Configuration
@@ -76,7 +114,10 @@ UI_CONFIG = {
         'text_color': '#333333'
     },
     'animations': os.getenv('ENABLE_ANIMATIONS', 'true').lower() == 'true',
-    'auto_refresh': int(os.getenv('AUTO_REFRESH_SECONDS', '0'))  # 0 = disabled
+    'auto_refresh': int(os.getenv('AUTO_REFRESH_SECONDS', '0')),  # 0 = disabled
+    # Transcript viewer: minutes of video per page, and a cap for densely captioned videos
+    'transcript_window_minutes': int(os.getenv('TRANSCRIPT_WINDOW_MINUTES', '5')),
+    'transcript_window_max_segments': int(os.getenv('TRANSCRIPT_WINDOW_MAX_SEGMENTS', '300'))
 }
 
 # Security Configuration
@@ -97,7 +138,12 @@ PERFORMANCE_CONFIG = {
     'cache_ttl': int(os.getenv('CACHE_TTL', '3600')),  # 1 hour
     'max_concurrent_requests': int(os.getenv('MAX_CONCURRENT_REQUESTS', '5')),
     'chunk_size': int(os.getenv('CHUNK_SIZE', '8192')),
-    'memory_limit': int(os.getenv('MEMORY_LIMIT', '512'))  # MB
+    'memory_limit': int(os.getenv('MEMORY_LIMIT', '512')),  # MB
+    # Worker processes for CPU-bound rendering and transcript processing (0 runs tasks inline)
+    'process_pool_workers': int(os.getenv('PROCESS_POOL_WORKERS', str(min(4, os.cpu_count() or 1)))),
+    'task_latency_window': int(os.getenv('TASK_LATENCY_WINDOW', '500')),
+    # Transcripts with fewer caption entries are processed in-process; pickling would dominate
+    'offload_min_segments': int(os.getenv('OFFLOAD_MIN_SEGMENTS', '2000'))
 }
 
 # Logging Configuration
@@ -133,6 +179,7 @@ DEV_CONFIG = {
     'debug_mode': os.getenv('DEBUG', 'false').lower() == 'true',
     'hot_reload': os.getenv('HOT_RELOAD', 'false').lower() == 'true',
     'mock_api': os.getenv('MOCK_API', 'false').lower() == 'true',
+    'mock_latency': float(os.getenv('MOCK_API_LATENCY', '0.05')),  # seconds per stub LLM call
     'test_mode': os.getenv('TEST_MODE', 'false').lower() == 'true'
 }
 
@@ -141,6 +188,7 @@ def get_config() -> Dict[str, Any]:
     return {
         'app': APP_CONFIG,
         'api': API_CONFIG,
+        'api_server': API_SERVER_CONFIG,
         'analysis': ANALYSIS_CONFIG,
         'export': EXPORT_CONFIG,
         'session': SESSION_CONFIG,
@@ -156,7 +204,8 @@ def get_config() -> Dict[str, Any]:
             'data': str(DATA_DIR),
             'sessions': str(SESSIONS_DIR),
             'exports': str(EXPORTS_DIR),
-            'logs': str(LOGS_DIR)
+            'logs': str(LOGS_DIR),
+            'jobs': str(JOBS_DIR)
         }
     }
 
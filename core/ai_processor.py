@@ -1,36 +1,76 @@
 # core/ai_processor.py
-import google.generativeai as genai
 import json
 import re
+import threading
 import time
 from datetime import datetime
-from typing import Dict, List, Any
-import streamlit as st
+from typing import Dict, List, Any, Optional, Callable
 from prompts.templates import PromptTemplates
+from core.runtime import Reporter, get_reporter, get_secret
+from core.cancellation import CancellationToken, OperationCancelled
+from config.settings import API_CONFIG, DEV_CONFIG
+
+# Key of the explicit marker a failed analysis section returns instead of its results
+SECTION_ERROR_KEY = 'section_error'
+
+class APICallFailed(Exception):
+    """An LLM call that still failed after all its retries"""
 
 class AIProcessor:
-    def __init__(self):
-        # Configure Gemini
-        api_key = st.secrets.get("GOOGLE_API_KEY") or st.secrets.get("GEMINI_API_KEY")
-        if not api_key:
-            st.error("Google API key not found. Please add GOOGLE_API_KEY or GEMINI_API_KEY to your secrets.")
+    def __init__(self, api_key: Optional[str] = None, model_name: Optional[str] = None,
+                 reporter: Optional[Reporter] = None):
+        self.reporter = reporter or get_reporter()
+        
+        # Configure Gemini; the key comes from the caller, the host's secrets or the environment
+        api_key = api_key or get_secret("GOOGLE_API_KEY") or get_secret("GEMINI_API_KEY")
+        if not api_key and not DEV_CONFIG['mock_api']:
+            self.reporter.error("Google API key not found. Please add GOOGLE_API_KEY or GEMINI_API_KEY to your secrets.")
             return
-            
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel("gemini-2.0-flash-exp")
+        
+        # The Gemini client takes about a second to import, so it is built on the first API call
+        self.api_key = api_key
+        self.model_name = model_name or API_CONFIG['gemini_model']
+        self._model = None
+        self._model_lock = threading.Lock()
         self.prompt_templates = PromptTemplates()
-        self.max_retries = 3
+        self.max_retries = API_CONFIG['max_retries']
         self.base_delay = 1
     
-    def _make_api_call_with_retry(self, prompt: str, context: str = "") -> str:
-        """Make API call with retry logic and rate limiting handling"""
+    @property
+    def model(self):
+        """The configured Gemini model (the stub backend under MOCK_API), created on first use"""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None and DEV_CONFIG['mock_api']:
+                    from core.mock_llm import StubModel
+                    
+                    self._model = StubModel()
+                elif self._model is None:
+                    import google.generativeai as genai
+                    
+                    genai.configure(api_key=self.api_key)
+                    self._model = genai.GenerativeModel(self.model_name)
+        return self._model
+    
+    def _make_api_call_with_retry(self, prompt: str, context: str = "",
+                                  cancel_token: Optional[CancellationToken] = None) -> str:
+        """Make API call with retry logic and rate limiting handling.
+        
+        Raises APICallFailed once the retries are used up. A cancelled token
+        abandons the pending retries (raising OperationCancelled); a call already
+        sent is never interrupted.
+        """
         full_prompt = prompt + context
         
         for attempt in range(self.max_retries):
+            if cancel_token is not None and cancel_token.cancelled:
+                cancel_token.avoided()
+                cancel_token.raise_if_cancelled()
+            
             try:
                 response = self.model.generate_content(full_prompt)
                 return response.text
-                
+            
             except Exception as e:
                 error_msg = str(e)
                 
@@ -48,133 +88,162 @@ class AIProcessor:
                         delay = (2 ** attempt) * self.base_delay  # Exponential backoff
                     
                     if attempt < self.max_retries - 1:
-                        st.warning(f"⏳ Rate limit reached. Waiting {delay} seconds before retry... (Attempt {attempt + 1}/{self.max_retries})")
-                        
-                        # Show countdown
-                        countdown_placeholder = st.empty()
-                        for i in range(delay, 0, -1):
-                            countdown_placeholder.info(f"⏱️ Retrying in {i} seconds...")
-                            time.sleep(1)
-                        countdown_placeholder.empty()
-                        
+                        self.reporter.wait(delay, f"⏳ Rate limit reached. Waiting {delay} seconds before retry... (Attempt {attempt + 1}/{self.max_retries})", cancel_token)
                         continue
                     else:
-                        st.error(f"❌ API rate limit exceeded. Please try again in a few minutes.")
-                        return f"Error: Rate limit exceeded. Please wait and try again."
+                        self.reporter.error(f"❌ API rate limit exceeded. Please try again in a few minutes.")
+                        raise APICallFailed("Rate limit exceeded. Please wait and try again.")
                 
                 # Handle other API errors
                 elif "503" in error_msg or "500" in error_msg:
                     if attempt < self.max_retries - 1:
                         delay = (2 ** attempt) * self.base_delay
-                        st.warning(f"🔄 API temporarily unavailable. Retrying in {delay} seconds... (Attempt {attempt + 1}/{self.max_retries})")
-                        time.sleep(delay)
+                        self.reporter.wait(delay, f"🔄 API temporarily unavailable. Retrying in {delay} seconds... (Attempt {attempt + 1}/{self.max_retries})", cancel_token)
                         continue
                     else:
-                        st.error(f"❌ API service unavailable. Please try again later.")
-                        return f"Error: API service unavailable."
+                        self.reporter.error(f"❌ API service unavailable. Please try again later.")
+                        raise APICallFailed("API service unavailable.")
                 
                 # Handle other errors
                 else:
                     if attempt < self.max_retries - 1:
                         delay = (2 ** attempt) * self.base_delay
-                        st.warning(f"⚠️ API error occurred. Retrying in {delay} seconds... (Attempt {attempt + 1}/{self.max_retries})")
-                        time.sleep(delay)
+                        self.reporter.wait(delay, f"⚠️ API error occurred. Retrying in {delay} seconds... (Attempt {attempt + 1}/{self.max_retries})", cancel_token)
                         continue
                     else:
-                        st.error(f"❌ API error: {error_msg}")
-                        return f"Error: {error_msg}"
+                        self.reporter.error(f"❌ API error: {error_msg}")
+                        raise APICallFailed(error_msg)
         
-        return "Error: Failed to generate content after multiple attempts."
+        raise APICallFailed("Failed to generate content after multiple attempts.")
     
-    def comprehensive_analysis(self, transcript_text: str, **kwargs) -> Dict[str, Any]:
-        """Perform comprehensive analysis of the video transcript"""
-        
-        # Extract parameters
-        summary_type = kwargs.get('summary_type', 'Comprehensive')
-        language = kwargs.get('language', 'English')
-        include_timestamps = kwargs.get('include_timestamps', True)
-        include_sentiment = kwargs.get('include_sentiment', True)
-        include_topics = kwargs.get('include_topics', True)
-        video_info = kwargs.get('video_info', {})
+    # Analysis sections in the order they run; each is one LLM call
+    SECTIONS = [
+        'main_summary', 'key_takeaways', 'important_quotes', 'action_items', 'topics',
+        'sentiment_analysis', 'timeline', 'questions_and_answers', 'study_notes', 'business_insights'
+    ]
+    
+    def comprehensive_analysis(self, transcript_text: str, completed: Optional[Dict[str, Dict[str, Any]]] = None,
+                               on_section: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+                               cancel_token: Optional[CancellationToken] = None,
+                               **kwargs) -> Dict[str, Any]:
+        """Perform comprehensive analysis of the video transcript.
         
+        completed maps section names to results from an earlier, interrupted run;
+        those sections are reused instead of calling the API again. on_section is
+        called with (section, result) as each remaining section finishes; failed
+        sections are left out of the results and listed under 'section_errors'. Once
+        cancel_token is cancelled no further sections are dispatched; the results
+        of the sections finished so far are returned.
+        """
+        completed = completed or {}
         results = {}
         
         try:
-            # 1. Generate main summary
-            results['main_summary'] = self._generate_summary(
-                transcript_text, summary_type, language, video_info
-            )
-            
-            # 2. Extract key takeaways
-            results['key_takeaways'] = self._extract_key_takeaways(
-                transcript_text, summary_type
-            )
-            
-            # 3. Identify important quotes
-            results['important_quotes'] = self._extract_important_quotes(
-                transcript_text
-            )
-            
-            # 4. Generate action items
-            results['action_items'] = self._generate_action_items(
-                transcript_text
-            )
-            
-            # 5. Topic analysis
-            if include_topics:
-                results['topics'] = self._extract_topics(transcript_text)
-            
-            # 6. Sentiment analysis
-            if include_sentiment:
-                results['sentiment_analysis'] = self._analyze_sentiment(transcript_text)
-                results['sentiment_score'] = results['sentiment_analysis'].get('overall_score', 0)
-            
-            # 7. Generate timeline/structure
-            results['timeline'] = self._generate_timeline(transcript_text)
-            
-            # 8. Extract questions and answers
-            results['questions_and_answers'] = self._extract_qa_pairs(transcript_text)
-            
-            # 9. Generate study notes (if academic)
-            if summary_type == 'Academic':
-                results['study_notes'] = self._generate_study_notes(transcript_text)
-            
-            # 10. Business insights (if business)
-            if summary_type == 'Business':
-                results['business_insights'] = self._generate_business_insights(transcript_text)
+            sections = self.analysis_sections(**kwargs)
+            for i, section in enumerate(sections):
+                if section in completed:
+                    fragment = completed[section]
+                elif cancel_token is not None and cancel_token.cancelled:
+                    cancel_token.avoided(sum(1 for rest in sections[i:] if rest not in completed))
+                    break
+                else:
+                    try:
+                        fragment = self.run_analysis_section(section, transcript_text, cancel_token=cancel_token, **kwargs)
+                    except OperationCancelled:
+                        # Its retries were abandoned; the sections after it are never dispatched
+                        cancel_token.avoided(sum(1 for rest in sections[i + 1:] if rest not in completed))
+                        break
+                    if on_section:
+                        on_section(section, fragment)
+                
+                if SECTION_ERROR_KEY in fragment:
+                    results.setdefault('section_errors', {})[section] = fragment[SECTION_ERROR_KEY]
+                else:
+                    results.update(fragment)
             
             return results
-            
+        
         except Exception as e:
-            st.error(f"Error in AI analysis: {e}")
+            self.reporter.error(f"Error in AI analysis: {e}")
             return {'error': str(e)}
     
-    def _generate_summary(self, transcript_text: str, summary_type: str, language: str, video_info: Dict) -> str:
-        """Generate the main summary based on type"""
+    def analysis_sections(self, **kwargs) -> List[str]:
+        """Sections a comprehensive analysis with these settings runs"""
+        summary_type = kwargs.get('summary_type', 'Comprehensive')
+        skipped = set()
+        
+        if not kwargs.get('include_topics', True):
+            skipped.add('topics')
+        if not kwargs.get('include_sentiment', True):
+            skipped.add('sentiment_analysis')
+        if summary_type != 'Academic':
+            skipped.add('study_notes')
+        if summary_type != 'Business':
+            skipped.add('business_insights')
+        
+        return [section for section in self.SECTIONS if section not in skipped]
+    
+    def run_analysis_section(self, section: str, transcript_text: str,
+                             cancel_token: Optional[CancellationToken] = None, **kwargs) -> Dict[str, Any]:
+        """Run one analysis section; returns the result keys it contributes.
+        
+        A section whose LLM call fails after its retries returns
+        {SECTION_ERROR_KEY: message} instead, so callers never mistake it for content.
+        """
         try:
-            prompt = self.prompt_templates.get_summary_prompt(
-                summary_type, language, video_info
-            )
-            
-            response = self._make_api_call_with_retry(
-                prompt, "\n\nTranscript:\n" + transcript_text
-            )
-            
-            return response
-            
-        except Exception as e:
-            st.error(f"Error generating summary: {e}")
-            return "Summary generation failed."
+            return self._run_section(section, transcript_text, cancel_token, **kwargs)
+        except APICallFailed as e:
+            return {SECTION_ERROR_KEY: str(e)}
+    
+    def _run_section(self, section: str, transcript_text: str,
+                     cancel_token: Optional[CancellationToken] = None, **kwargs) -> Dict[str, Any]:
+        summary_type = kwargs.get('summary_type', 'Comprehensive')
+        
+        if section == 'main_summary':
+            return {'main_summary': self._generate_summary(
+                transcript_text, summary_type, kwargs.get('language', 'English'), kwargs.get('video_info', {}), cancel_token
+            )}
+        if section == 'key_takeaways':
+            return {'key_takeaways': self._extract_key_takeaways(transcript_text, summary_type, cancel_token)}
+        if section == 'important_quotes':
+            return {'important_quotes': self._extract_important_quotes(transcript_text, cancel_token)}
+        if section == 'action_items':
+            return {'action_items': self._generate_action_items(transcript_text, cancel_token)}
+        if section == 'topics':
+            return {'topics': self._extract_topics(transcript_text, cancel_token)}
+        if section == 'sentiment_analysis':
+            sentiment = self._analyze_sentiment(transcript_text, cancel_token)
+            return {'sentiment_analysis': sentiment, 'sentiment_score': sentiment.get('overall_score', 0)}
+        if section == 'timeline':
+            return {'timeline': self._generate_timeline(transcript_text, cancel_token)}
+        if section == 'questions_and_answers':
+            return {'questions_and_answers': self._extract_qa_pairs(transcript_text, cancel_token)}
+        if section == 'study_notes':
+            return {'study_notes': self._generate_study_notes(transcript_text, cancel_token)}
+        if section == 'business_insights':
+            return {'business_insights': self._generate_business_insights(transcript_text, cancel_token)}
+        
+        raise ValueError(f"Unknown analysis section: {section}")
+    
+    def _generate_summary(self, transcript_text: str, summary_type: str, language: str, video_info: Dict,
+                          cancel_token: Optional[CancellationToken] = None) -> str:
+        """Generate the main summary based on type"""
+        prompt = self.prompt_templates.get_summary_prompt(
+            summary_type, language, video_info
+        )
+        
+        return self._make_api_call_with_retry(
+            prompt, "\n\nTranscript:\n" + transcript_text, cancel_token
+        )
     
-    def _extract_key_takeaways(self, transcript_text: str, summary_type: str) -> List[str]:
+    def _extract_key_takeaways(self, transcript_text: str, summary_type: str,
+                               cancel_token: Optional[CancellationToken] = None) -> List[str]:
         """Extract key takeaways from the transcript"""
+        response = self._make_api_call_with_retry(
+            self.prompt_templates.get_takeaways_prompt(summary_type), "\n\nTranscript:\n" + transcript_text, cancel_token
+        )
+        
         try:
-            prompt = self.prompt_templates.get_takeaways_prompt(summary_type)
-            
-            response = self._make_api_call_with_retry(
-                prompt, "\n\nTranscript:\n" + transcript_text
-            )
-            
             # Parse the response into a list
             takeaways = []
             for line in response.split('\n'):
@@ -185,23 +254,22 @@ class AIProcessor:
                     takeaways.append(re.sub(r'^\d+\.?\s*', '', line))
             
             return takeaways[:10]  # Limit to top 10 takeaways
-            
+        
         except Exception as e:
-            st.error(f"Error extracting takeaways: {e}")
+            self.reporter.error(f"Error extracting takeaways: {e}")
             return []
     
-    def _extract_important_quotes(self, transcript_text: str) -> List[str]:
+    def _extract_important_quotes(self, transcript_text: str,
+                                  cancel_token: Optional[CancellationToken] = None) -> List[str]:
         """Extract the most important and impactful quotes"""
+        response = self._make_api_call_with_retry(
+            self.prompt_templates.get_quotes_prompt(), "\n\nTranscript:\n" + transcript_text, cancel_token
+        )
+        
         try:
-            prompt = self.prompt_templates.get_quotes_prompt()
-            
-            response = self.model.generate_content(
-                prompt + "\n\nTranscript:\n" + transcript_text
-            )
-            
             # Extract quotes from response
             quotes = []
-            lines = response.text.split('\n')
+            lines = response.split('\n')
             
             for line in lines:
                 line = line.strip()
@@ -213,23 +281,22 @@ class AIProcessor:
                         quotes.append(quote)
             
             return quotes[:5]  # Limit to top 5 quotes
-            
+        
         except Exception as e:
-            st.error(f"Error extracting quotes: {e}")
+            self.reporter.error(f"Error extracting quotes: {e}")
             return []
     
-    def _generate_action_items(self, transcript_text: str) -> List[str]:
+    def _generate_action_items(self, transcript_text: str,
+                               cancel_token: Optional[CancellationToken] = None) -> List[str]:
         """Generate actionable items from the content"""
+        response = self._make_api_call_with_retry(
+            self.prompt_templates.get_action_items_prompt(), "\n\nTranscript:\n" + transcript_text, cancel_token
+        )
+        
         try:
-            prompt = self.prompt_templates.get_action_items_prompt()
-            
-            response = self.model.generate_content(
-                prompt + "\n\nTranscript:\n" + transcript_text
-            )
-            
             # Parse action items
             action_items = []
-            for line in response.text.split('\n'):
+            for line in response.split('\n'):
                 line = line.strip()
                 if line and (line.startswith('•') or line.startswith('-') or line.startswith('*')):
                     action_items.append(line[1:].strip())
@@ -237,23 +304,22 @@ class AIProcessor:
                     action_items.append(re.sub(r'^\d+\.?\s*', '', line))
             
             return action_items[:8]  # Limit to top 8 action items
-            
+        
         except Exception as e:
-            st.error(f"Error generating action items: {e}")
+            self.reporter.error(f"Error generating action items: {e}")
             return []
     
-    def _extract_topics(self, transcript_text: str) -> List[str]:
+    def _extract_topics(self, transcript_text: str,
+                        cancel_token: Optional[CancellationToken] = None) -> List[str]:
         """Extract main topics and themes"""
+        response = self._make_api_call_with_retry(
+            self.prompt_templates.get_topics_prompt(), "\n\nTranscript:\n" + transcript_text, cancel_token
+        )
+        
         try:
-            prompt = self.prompt_templates.get_topics_prompt()
-            
-            response = self.model.generate_content(
-                prompt + "\n\nTranscript:\n" + transcript_text
-            )
-            
             # Parse topics
             topics = []
-            for line in response.text.split('\n'):
+            for line in response.split('\n'):
                 line = line.strip()
                 if line and not line.startswith('#'):
                     # Clean up topic
@@ -263,20 +329,19 @@ class AIProcessor:
                         topics.append(topic)
             
             return topics[:12]  # Limit to top 12 topics
-            
+        
         except Exception as e:
-            st.error(f"Error extracting topics: {e}")
+            self.reporter.error(f"Error extracting topics: {e}")
             return []
     
-    def _analyze_sentiment(self, transcript_text: str) -> Dict[str, float]:
+    def _analyze_sentiment(self, transcript_text: str,
+                           cancel_token: Optional[CancellationToken] = None) -> Dict[str, float]:
         """Analyze sentiment of the transcript"""
+        response = self._make_api_call_with_retry(
+            self.prompt_templates.get_sentiment_prompt(), "\n\nTranscript:\n" + transcript_text, cancel_token
+        )
+        
         try:
-            prompt = self.prompt_templates.get_sentiment_prompt()
-            
-            response = self.model.generate_content(
-                prompt + "\n\nTranscript:\n" + transcript_text
-            )
-            
             # Parse sentiment response
             sentiment_data = {
                 'positive': 0.0,
@@ -286,7 +351,7 @@ class AIProcessor:
             }
             
             # Extract percentages from response
-            lines = response.text.lower()
+            lines = response.lower()
             
             # Look for percentage patterns
             positive_match = re.search(r'positive[:\s]*(\d+(?:\.\d+)?)', lines)
@@ -304,23 +369,22 @@ class AIProcessor:
                 sentiment_data['overall_score'] = float(overall_match.group(1))
             
             return sentiment_data
-            
+        
         except Exception as e:
-            st.error(f"Error analyzing sentiment: {e}")
+            self.reporter.error(f"Error analyzing sentiment: {e}")
             return {'positive': 0.33, 'neutral': 0.33, 'negative': 0.33, 'overall_score': 0.0}
     
-    def _generate_timeline(self, transcript_text: str) -> List[Dict[str, str]]:
+    def _generate_timeline(self, transcript_text: str,
+                           cancel_token: Optional[CancellationToken] = None) -> List[Dict[str, str]]:
         """Generate a timeline of key events/topics"""
+        response = self._make_api_call_with_retry(
+            self.prompt_templates.get_timeline_prompt(), "\n\nTranscript:\n" + transcript_text, cancel_token
+        )
+        
         try:
-            prompt = self.prompt_templates.get_timeline_prompt()
-            
-            response = self.model.generate_content(
-                prompt + "\n\nTranscript:\n" + transcript_text
-            )
-            
             # Parse timeline
             timeline = []
-            lines = response.text.split('\n')
+            lines = response.split('\n')
             
             for line in lines:
                 line = line.strip()
@@ -341,23 +405,22 @@ class AIProcessor:
                             })
             
             return timeline[:10]  # Limit to top 10 events
-            
+        
         except Exception as e:
-            st.error(f"Error generating timeline: {e}")
+            self.reporter.error(f"Error generating timeline: {e}")
             return []
     
-    def _extract_qa_pairs(self, transcript_text: str) -> List[Dict[str, str]]:
+    def _extract_qa_pairs(self, transcript_text: str,
+                          cancel_token: Optional[CancellationToken] = None) -> List[Dict[str, str]]:
         """Extract question-answer pairs from the transcript"""
+        response = self._make_api_call_with_retry(
+            self.prompt_templates.get_qa_prompt(), "\n\nTranscript:\n" + transcript_text, cancel_token
+        )
+        
         try:
-            prompt = self.prompt_templates.get_qa_prompt()
-            
-            response = self.model.generate_content(
-                prompt + "\n\nTranscript:\n" + transcript_text
-            )
-            
             # Parse Q&A pairs
             qa_pairs = []
-            lines = response.text.split('\n')
+            lines = response.split('\n')
             
             current_question = None
             current_answer = None
@@ -383,20 +446,19 @@ class AIProcessor:
                 })
             
             return qa_pairs[:5]  # Limit to top 5 Q&A pairs
-            
+        
         except Exception as e:
-            st.error(f"Error extracting Q&A pairs: {e}")
+            self.reporter.error(f"Error extracting Q&A pairs: {e}")
             return []
     
-    def _generate_study_notes(self, transcript_text: str) -> Dict[str, Any]:
+    def _generate_study_notes(self, transcript_text: str,
+                              cancel_token: Optional[CancellationToken] = None) -> Dict[str, Any]:
         """Generate academic study notes"""
+        response = self._make_api_call_with_retry(
+            self.prompt_templates.get_study_notes_prompt(), "\n\nTranscript:\n" + transcript_text, cancel_token
+        )
+        
         try:
-            prompt = self.prompt_templates.get_study_notes_prompt()
-            
-            response = self.model.generate_content(
-                prompt + "\n\nTranscript:\n" + transcript_text
-            )
-            
             # Parse study notes into structured format
             study_notes = {
                 'main_concepts': [],
@@ -405,7 +467,7 @@ class AIProcessor:
                 'formulas': []
             }
             
-            lines = response.text.split('\n')
+            lines = response.split('\n')
             current_section = None
             
             for line in lines:
@@ -422,20 +484,19 @@ class AIProcessor:
                     study_notes[current_section].append(line)
             
             return study_notes
-            
+        
         except Exception as e:
-            st.error(f"Error generating study notes: {e}")
+            self.reporter.error(f"Error generating study notes: {e}")
             return {}
     
-    def _generate_business_insights(self, transcript_text: str) -> Dict[str, Any]:
+    def _generate_business_insights(self, transcript_text: str,
+                                    cancel_token: Optional[CancellationToken] = None) -> Dict[str, Any]:
         """Generate business-focused insights"""
+        response = self._make_api_call_with_retry(
+            self.prompt_templates.get_business_insights_prompt(), "\n\nTranscript:\n" + transcript_text, cancel_token
+        )
+        
         try:
-            prompt = self.prompt_templates.get_business_insights_prompt()
-            
-            response = self.model.generate_content(
-                prompt + "\n\nTranscript:\n" + transcript_text
-            )
-            
             # Parse business insights
             business_insights = {
                 'key_strategies': [],
@@ -444,7 +505,7 @@ class AIProcessor:
                 'challenges': []
             }
             
-            lines = response.text.split('\n')
+            lines = response.split('\n')
             current_section = None
             
             for line in lines:
@@ -461,9 +522,9 @@ class AIProcessor:
                     business_insights[current_section].append(line)
             
             return business_insights
-            
+        
         except Exception as e:
-            st.error(f"Error generating business insights: {e}")
+            self.reporter.error(f"Error generating business insights: {e}")
             return {}
     
     def chat_with_content(self, transcript_text: str, user_question: str) -> str:
@@ -482,7 +543,10 @@ class AIProcessor:
             
             response = self._make_api_call_with_retry(prompt)
             return response
-            
+        
+        except APICallFailed as e:
+            return f"Error: {e}"
+        
         except Exception as e:
-            st.error(f"Error in chat: {e}")
+            self.reporter.error(f"Error in chat: {e}")
             return "I'm sorry, I couldn't process your question. Please try again."
\ No newline at end of file
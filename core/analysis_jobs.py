@@ -0,0 +1,405 @@
+# core/analysis_jobs.py
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+from utils.file_ops import FileLock, atomic_write_bytes
+from core.cancellation import CancellationToken
+from core.ai_processor import SECTION_ERROR_KEY
+from config.settings import ANALYSIS_CONFIG, JOBS_DIR
+
+logger = logging.getLogger(__name__)
+
+def section_failed(result: Dict[str, Any]) -> bool:
+    """Whether a section result is the failure marker rather than content"""
+    return SECTION_ERROR_KEY in result
+
+class AnalysisJobRunner:
+    """Run video analyses on worker threads, outside the Streamlit script lifecycle.
+    
+    Each job is persisted under JOBS_DIR as it progresses: a small state file with
+    its status and the results of every finished analysis section, plus the
+    transcript alongside it. Reruns and closed tabs do not touch the worker, any
+    page can reattach by job ID, and a job interrupted by a failure or a server
+    restart resumes from its finished sections instead of repeating their API calls.
+    Cancelling a job stops it between LLM calls; its finished sections are kept
+    and it can be resumed like a failed one.
+    
+    Several processes can share JOBS_DIR. Each job file names its owner (host and
+    pid) and a lease the owner renews while the job is active; only jobs whose
+    lease has expired are treated as interrupted, and resuming one claims it under
+    a lock file so exactly one process takes it over.
+    """
+    
+    ACTIVE_STATES = ('queued', 'running')
+    # Finished states whose job files expire after job_ttl
+    EXPIRING_STATES = ('done', 'cancelled', 'failed', 'interrupted')
+    LOCK_FILENAME = ".jobs.lock"
+    
+    # Share of the progress bar spent before the first analysis section starts
+    TRANSCRIPT_PROGRESS = 0.1
+    
+    def __init__(self, youtube_handler, ai_processor, session_manager, max_workers: Optional[int] = None,
+                 jobs_dir: Optional[Path] = None, job_ttl: Optional[int] = None, prefetcher=None,
+                 lease_seconds: Optional[int] = None):
+        self.youtube_handler = youtube_handler
+        self.prefetcher = prefetcher
+        self.ai_processor = ai_processor
+        self.session_manager = session_manager
+        self.max_workers = max_workers or ANALYSIS_CONFIG['job_workers']
+        self.job_ttl = job_ttl or ANALYSIS_CONFIG['job_ttl']
+        self.lease_seconds = lease_seconds or ANALYSIS_CONFIG['job_lease_seconds']
+        self.jobs_dir = Path(jobs_dir or JOBS_DIR)
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="analysis-job")
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._tokens: Dict[str, CancellationToken] = {}
+        self._lock = threading.Lock()
+        self._claim_lock = FileLock(self.jobs_dir / self.LOCK_FILENAME)
+        self.stats = {'cancelled': 0, 'calls_avoided': 0}
+        
+        self._load_jobs()
+        
+        self._stop_event = threading.Event()
+        self._heartbeat = threading.Thread(target=self._renew_leases, name="analysis-job-lease", daemon=True)
+        self._heartbeat.start()
+    
+    def submit(self, url: str, video_info: Dict[str, Any], settings: Dict[str, Any],
+               transcript_data: Optional[Dict[str, Any]] = None) -> str:
+        """Queue an analysis; returns the job ID (an active job's ID for duplicate requests).
+        
+        A transcript the caller already has is stored with the job, so the worker
+        skips the download.
+        """
+        self.cleanup_expired()
+        
+        with self._lock:
+            for job in self._jobs.values():
+                if job['status'] in self.ACTIVE_STATES and job['url'] == url and job['settings'] == settings:
+                    return job['job_id']
+            
+            job_id = uuid.uuid4().hex[:16]
+            sections = self.ai_processor.analysis_sections(**settings)
+            self._jobs[job_id] = {
+                'job_id': job_id,
+                'url': url,
+                'video_info': video_info,
+                'settings': settings,
+                'status': 'queued',
+                'stage': 'Waiting for a worker',
+                'progress': 0.0,
+                'sections': {section: 'pending' for section in sections},
+                'results': {},
+                'section_errors': {},
+                'session_id': None,
+                'error': None,
+                'attempts': 0,
+                'calls_avoided': 0,
+                'owner': self.owner,
+                'lease_until': None,
+                'submitted_at': time.time(),
+                'updated_at': time.time(),
+                'finished_at': None
+            }
+            self._tokens[job_id] = CancellationToken()
+            self._persist(job_id)
+            if transcript_data:
+                self._save_transcript(job_id, transcript_data)
+        
+        self._executor.submit(self._run_job, job_id)
+        return job_id
+    
+    def resume(self, job_id: str) -> bool:
+        """Re-queue a failed or interrupted job; finished sections are kept.
+        
+        The job file is re-read under the claim lock, so a job another process owns
+        and is still running (or has since finished) is left alone.
+        """
+        with self._lock, self._claim_lock:
+            job = self._jobs.get(job_id)
+            if not job:
+                return False
+            
+            stored = self._read_job_file(job_id)
+            if stored is not None:
+                job = self._jobs[job_id] = stored
+                if job['status'] in self.ACTIVE_STATES and not self._lease_expired(job):
+                    return False
+            if job['status'] == 'done' or (job['status'] in self.ACTIVE_STATES and job.get('owner') == self.owner):
+                return False
+            
+            job.update(status='queued', stage='Waiting for a worker', error=None, finished_at=None, owner=self.owner)
+            for section, state in job['sections'].items():
+                if state in ('failed', 'cancelled'):
+                    job['sections'][section] = 'pending'
+            self._tokens[job_id] = CancellationToken()
+            self._persist(job_id)
+        
+        self._executor.submit(self._run_job, job_id)
+        return True
+    
+    def cancel(self, job_id: str, reason: str = "Cancelled by the user") -> bool:
+        """Stop a queued or running job; the LLM call in flight finishes, nothing after it is sent"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            token = self._tokens.get(job_id)
+            if not job or job['status'] not in self.ACTIVE_STATES or token is None or token.cancelled:
+                return False
+            
+            token.cancel(reason)
+            job.update(stage='Cancelling', updated_at=time.time())
+            self._persist(job_id)
+        
+        logger.info(f"Cancelling analysis job {job_id}: {reason}")
+        return True
+    
+    def resume_interrupted(self) -> int:
+        """Re-queue jobs that were queued or running when the previous server process stopped"""
+        with self._lock:
+            interrupted = [job_id for job_id, job in self._jobs.items() if job['status'] == 'interrupted']
+        
+        return sum(1 for job_id in interrupted if self.resume(job_id))
+    
+    def get_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Snapshot of a job's state (without section results), or None if unknown"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job:
+                return None
+            
+            # Another process is running it: its job file is the live state
+            if job['status'] in self.ACTIVE_STATES and job.get('owner') != self.owner:
+                job = self._jobs[job_id] = self._read_job_file(job_id) or job
+            status = {key: value for key, value in job.items() if key != 'results'}
+            status['sections'] = dict(job['sections'])
+            return status
+    
+    def list_jobs(self, active_only: bool = False) -> List[Dict[str, Any]]:
+        """Job snapshots, newest first"""
+        with self._lock:
+            job_ids = [job_id for job_id, job in self._jobs.items()
+                       if not active_only or job['status'] in self.ACTIVE_STATES]
+        
+        jobs = [self.get_status(job_id) for job_id in job_ids]
+        return sorted((job for job in jobs if job), key=lambda job: job['submitted_at'], reverse=True)
+    
+    def cleanup_expired(self) -> int:
+        """Forget finished jobs past their TTL and delete their files; returns jobs removed"""
+        cutoff = time.time() - self.job_ttl
+        
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job['status'] in self.EXPIRING_STATES
+                and (job.get('finished_at') or job.get('updated_at') or 0) < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+                self._tokens.pop(job_id, None)
+        
+        for job_id in expired:
+            for path in (self._state_path(job_id), self._transcript_path(job_id)):
+                path.unlink(missing_ok=True)
+        
+        return len(expired)
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Job counts by status"""
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job['status']] = counts.get(job['status'], 0) + 1
+            return counts
+    
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop accepting work; queued jobs stay on disk and resume with the next runner
+        once their lease expires"""
+        self._stop_event.set()
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+    
+    def _run_job(self, job_id: str) -> None:
+        """Worker body: transcript, then every unfinished section, then the saved session"""
+        with self._lock:
+            job = self._jobs[job_id]
+            job['attempts'] += 1
+            token = self._tokens[job_id]
+        
+        if token.cancelled:
+            # Cancelled while queued: none of its sections were dispatched
+            token.avoided(sum(1 for state in job['sections'].values() if state == 'pending'))
+            self._finish_cancelled(job_id, token)
+            return
+        
+        self._update(job_id, status='running', stage='Extracting transcript')
+        
+        try:
+            transcript_data = self._load_transcript(job_id)
+            if transcript_data is None and self.prefetcher is not None:
+                # A prefetch started on URL entry is adopted, waiting for it if it is still downloading
+                transcript_data = self.prefetcher.get_transcript(job['url'])
+                if transcript_data is not None:
+                    self._save_transcript(job_id, transcript_data)
+            if transcript_data is None:
+                transcript_data = self.youtube_handler.extract_transcript(job['url'])
+                if not transcript_data:
+                    raise RuntimeError("Failed to extract transcript. Video may not have captions.")
+                self._save_transcript(job_id, transcript_data)
+            
+            self._update(job_id, progress=self.TRANSCRIPT_PROGRESS, stage='Analyzing content with AI')
+            
+            with self._lock:
+                completed = {section: dict(result) for section, result in job['results'].items()}
+            
+            analysis_results = self.ai_processor.comprehensive_analysis(
+                transcript_data['text'],
+                completed=completed,
+                on_section=lambda section, result: self._finish_section(job_id, section, result),
+                video_info=job['video_info'],
+                cancel_token=token,
+                **job['settings']
+            )
+            
+            if token.cancelled:
+                self._finish_cancelled(job_id, token)
+                return
+            
+            with self._lock:
+                failed = [section for section, state in job['sections'].items() if state == 'failed']
+            if 'error' in analysis_results:
+                raise RuntimeError(analysis_results['error'])
+            if failed:
+                # The API error text (rate limit, quota, ...) tells the UI what advice to show
+                raise RuntimeError(f"Sections failed: {', '.join(failed)}. {job['section_errors'][failed[0]]}")
+            
+            self._update(job_id, progress=0.95, stage='Saving analysis')
+            session_id = self.session_manager.save_session({
+                'url': job['url'],
+                'video_info': job['video_info'],
+                'transcript': transcript_data,
+                'analysis': analysis_results,
+                'settings': job['settings'],
+                'timestamp': datetime.now().isoformat()
+            })
+            if not session_id:
+                raise RuntimeError("Could not save the analysis session")
+            
+            self._update(job_id, status='done', progress=1.0, stage='Analysis complete', session_id=session_id,
+                         finished_at=time.time())
+            self._transcript_path(job_id).unlink(missing_ok=True)
+        
+        except Exception as e:
+            logger.warning(f"Analysis job {job_id} failed: {e}")
+            self._update(job_id, status='failed', stage='Failed', error=str(e), finished_at=time.time())
+    
+    def _finish_cancelled(self, job_id: str, token: CancellationToken) -> None:
+        """Record a cancelled job; its finished sections stay in the job file for a later resume"""
+        with self._lock:
+            job = self._jobs[job_id]
+            for section, state in job['sections'].items():
+                if state == 'pending':
+                    job['sections'][section] = 'cancelled'
+            
+            job['calls_avoided'] = job.get('calls_avoided', 0) + token.calls_avoided
+            self.stats['cancelled'] += 1
+            self.stats['calls_avoided'] += token.calls_avoided
+            
+            finished = sum(1 for state in job['sections'].values() if state == 'done')
+            job.update(status='cancelled', stage=f"Cancelled after {finished}/{len(job['sections'])} sections",
+                       error=token.reason, finished_at=time.time(), updated_at=time.time())
+            self._persist(job_id)
+        
+        logger.info(f"Analysis job {job_id} cancelled; {token.calls_avoided} LLM call(s) avoided")
+    
+    def _finish_section(self, job_id: str, section: str, result: Dict[str, Any]) -> None:
+        """Record one finished section; failed API calls are kept out of the reusable results"""
+        failed = section_failed(result)
+        
+        with self._lock:
+            job = self._jobs[job_id]
+            job['sections'][section] = 'failed' if failed else 'done'
+            if failed:
+                job['section_errors'][section] = result[SECTION_ERROR_KEY]
+            else:
+                job['results'][section] = result
+                job['section_errors'].pop(section, None)
+            
+            finished = sum(1 for state in job['sections'].values() if state != 'pending')
+            job['progress'] = self.TRANSCRIPT_PROGRESS + 0.85 * finished / max(1, len(job['sections']))
+            job['stage'] = f"Analyzed {section.replace('_', ' ')} ({finished}/{len(job['sections'])})"
+            job['updated_at'] = time.time()
+            self._persist(job_id)
+    
+    def _update(self, job_id: str, **changes) -> None:
+        with self._lock:
+            self._jobs[job_id].update(changes, updated_at=time.time())
+            self._persist(job_id)
+    
+    def _persist(self, job_id: str) -> None:
+        """Write a job's state file, renewing the lease on jobs this process owns (lock held)"""
+        job = self._jobs[job_id]
+        if job.get('owner') == self.owner:
+            job['lease_until'] = time.time() + self.lease_seconds
+        
+        data = json.dumps(self._jobs[job_id], ensure_ascii=False, default=str).encode('utf-8')
+        atomic_write_bytes(self._state_path(job_id), data, fsync_policy='never')
+    
+    def _load_jobs(self) -> None:
+        """Read persisted jobs; mid-flight ones whose owner stopped renewing are marked interrupted"""
+        for state_file in self.jobs_dir.glob("*.job.json"):
+            try:
+                job = json.loads(state_file.read_text(encoding='utf-8'))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable job file {state_file.name}: {e}")
+                continue
+            
+            if job.get('status') in self.ACTIVE_STATES and self._lease_expired(job):
+                job['status'] = 'interrupted'
+                job['stage'] = 'Interrupted by a server restart'
+            self._jobs[job['job_id']] = job
+    
+    def _read_job_file(self, job_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(self._state_path(job_id).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+    
+    @staticmethod
+    def _lease_expired(job: Dict[str, Any]) -> bool:
+        """Jobs written before leases existed count as expired"""
+        return (job.get('lease_until') or 0) < time.time()
+    
+    def _renew_leases(self) -> None:
+        """Heartbeat: rewrite owned active jobs well before their leases run out"""
+        while not self._stop_event.wait(self.lease_seconds / 3):
+            with self._lock:
+                for job_id, job in self._jobs.items():
+                    if job['status'] in self.ACTIVE_STATES and job.get('owner') == self.owner:
+                        self._persist(job_id)
+    
+    def _load_transcript(self, job_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(self._transcript_path(job_id).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+    
+    def _save_transcript(self, job_id: str, transcript_data: Dict[str, Any]) -> None:
+        atomic_write_bytes(
+            self._transcript_path(job_id),
+            json.dumps(transcript_data, ensure_ascii=False).encode('utf-8'),
+            fsync_policy='never'
+        )
+    
+    def _state_path(self, job_id: str) -> Path:
+        return self.jobs_dir / f"{job_id}.job.json"
+    
+    def _transcript_path(self, job_id: str) -> Path:
+        return self.jobs_dir / f"{job_id}.transcript.json"
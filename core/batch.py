@@ -0,0 +1,235 @@
+# core/batch.py
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Callable
+from core.analysis_jobs import section_failed
+from core.ai_processor import SECTION_ERROR_KEY
+from utils.validators import extract_canonical_video_id
+from config.settings import ANALYSIS_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# For playlist and channel expansion
+try:
+    from pytube import Playlist, Channel
+    PYTUBE_AVAILABLE = True
+except ImportError:
+    PYTUBE_AVAILABLE = False
+
+CHANNEL_MARKERS = ('/channel/', '/c/', '/user/', '/@')
+
+def expand_source(source: str) -> List[str]:
+    """Video URLs behind one input line: a video, a playlist or a channel"""
+    is_playlist = '/playlist' in source or ('list=' in source and 'watch?v=' not in source)
+    is_channel = any(marker in source for marker in CHANNEL_MARKERS)
+    
+    if not (is_playlist or is_channel):
+        return [source]
+    if not PYTUBE_AVAILABLE:
+        raise ValueError("Playlist and channel URLs require pytube")
+    
+    return list((Playlist if is_playlist else Channel)(source).video_urls)
+
+class BatchRunner:
+    """Analyse a list of videos without Streamlit, checkpointing results as NDJSON.
+    
+    Each video goes through two bounded stages: transcript download (network bound,
+    transcript_workers at a time) and LLM analysis (rate limited, llm_workers videos
+    at a time). Transcripts for upcoming videos are fetched while earlier ones are
+    being analysed. Every finished video appends one line to the output file and
+    is saved as a regular session; rerunning with the same output skips videos
+    already recorded as ok and reuses the finished sections of failed ones.
+    """
+    
+    def __init__(self, youtube_handler, ai_processor, session_manager,
+                 transcript_workers: Optional[int] = None, llm_workers: Optional[int] = None):
+        self.youtube_handler = youtube_handler
+        self.ai_processor = ai_processor
+        self.session_manager = session_manager
+        self.transcript_workers = transcript_workers or ANALYSIS_CONFIG['batch_transcript_workers']
+        self.llm_workers = llm_workers or ANALYSIS_CONFIG['batch_llm_workers']
+        
+        self._transcript_slots = threading.BoundedSemaphore(self.transcript_workers)
+        self._llm_slots = threading.BoundedSemaphore(self.llm_workers)
+        self._write_lock = threading.Lock()
+    
+    def collect_urls(self, sources: Iterable[str]) -> List[Dict[str, str]]:
+        """Expand input lines into unique videos; blank lines and # comments are skipped"""
+        videos = []
+        seen = set()
+        
+        for line in sources:
+            source = line.strip()
+            if not source or source.startswith('#'):
+                continue
+            
+            try:
+                urls = expand_source(source)
+            except Exception as e:
+                logger.warning(f"Could not expand {source}: {e}")
+                urls = [source]
+            
+            for url in urls:
+                video_id = extract_canonical_video_id(url)
+                key = video_id or url
+                if key not in seen:
+                    seen.add(key)
+                    videos.append({'url': url, 'video_id': video_id})
+        
+        return videos
+    
+    def run(self, sources: Iterable[str], output: Path, settings: Dict[str, Any],
+            progress: Optional[Callable[[int, int, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """Analyse every video not yet recorded as ok in output; returns a run report"""
+        output = Path(output)
+        videos = self.collect_urls(sources)
+        finished, partial = self._load_checkpoint(output)
+        pending = [video for video in videos if video['video_id'] not in finished]
+        
+        report = {
+            'videos': len(videos),
+            'skipped': len(videos) - len(pending),
+            'succeeded': 0,
+            'failed': 0,
+            'duration_seconds': 0.0,
+            'videos_per_minute': 0.0
+        }
+        start = time.perf_counter()
+        
+        # Enough threads that transcript downloads keep going while every LLM slot is busy
+        with open(output, 'a', encoding='utf-8') as out, \
+                ThreadPoolExecutor(max_workers=self.transcript_workers + self.llm_workers,
+                                   thread_name_prefix="batch") as executor:
+            if out.tell() and not self._ends_with_newline(output):
+                out.write('\n')
+            
+            futures = [
+                executor.submit(self._process, video, settings, partial.get(video['video_id'], {}))
+                for video in pending
+            ]
+            
+            for done, future in enumerate(as_completed(futures), 1):
+                record = future.result()
+                with self._write_lock:
+                    out.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+                    out.flush()
+                
+                report['succeeded' if record['status'] == 'ok' else 'failed'] += 1
+                if progress:
+                    progress(done, len(pending), record)
+        
+        elapsed = time.perf_counter() - start
+        report['duration_seconds'] = round(elapsed, 2)
+        report['videos_per_minute'] = round(report['succeeded'] * 60 / elapsed, 2) if elapsed > 0 else 0.0
+        return report
+    
+    def _process(self, video: Dict[str, str], settings: Dict[str, Any],
+                 completed: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Transcript, analysis and saved session for one video; never raises"""
+        start = time.perf_counter()
+        record = {
+            'url': video['url'],
+            'video_id': video['video_id'],
+            'status': 'failed',
+            'session_id': None,
+            'title': None,
+            'analysis': None,
+            'sections': {},
+            'error': None,
+            'seconds': 0.0,
+            'finished_at': None
+        }
+        
+        try:
+            if not video['video_id']:
+                raise ValueError("Not a YouTube video URL")
+            
+            with self._transcript_slots:
+                video_info = self.youtube_handler.get_video_info(video['url']) or {'video_id': video['video_id']}
+                transcript_data = self.youtube_handler.extract_transcript(video['url'])
+            if not transcript_data:
+                raise RuntimeError("Failed to extract transcript. Video may not have captions.")
+            record['title'] = video_info.get('title')
+            
+            sections = dict(completed)
+            failed = {}
+            
+            def finish_section(section: str, result: Dict[str, Any]) -> None:
+                if section_failed(result):
+                    failed[section] = result[SECTION_ERROR_KEY]
+                else:
+                    sections[section] = result
+            
+            with self._llm_slots:
+                analysis_results = self.ai_processor.comprehensive_analysis(
+                    transcript_data['text'],
+                    completed=completed,
+                    on_section=finish_section,
+                    video_info=video_info,
+                    **settings
+                )
+            
+            if 'error' in analysis_results:
+                raise RuntimeError(analysis_results['error'])
+            if failed:
+                # Finished sections go into the record so a rerun only repeats the failed ones
+                record['sections'] = sections
+                raise RuntimeError(f"Sections failed: {', '.join(failed)}. {next(iter(failed.values()))}")
+            
+            session_id = self.session_manager.save_session({
+                'url': video['url'],
+                'video_info': video_info,
+                'transcript': transcript_data,
+                'analysis': analysis_results,
+                'settings': settings,
+                'timestamp': datetime.now().isoformat()
+            })
+            if not session_id:
+                raise RuntimeError("Could not save the analysis session")
+            
+            record.update(status='ok', session_id=session_id, analysis=analysis_results)
+        
+        except Exception as e:
+            logger.warning(f"Batch analysis of {video['url']} failed: {e}")
+            record['error'] = str(e)
+        
+        record['seconds'] = round(time.perf_counter() - start, 2)
+        record['finished_at'] = datetime.now().isoformat()
+        return record
+    
+    @staticmethod
+    def _ends_with_newline(path: Path) -> bool:
+        with open(path, 'rb') as existing:
+            existing.seek(-1, 2)
+            return existing.read(1) == b'\n'
+    
+    @staticmethod
+    def _load_checkpoint(output: Path) -> tuple:
+        """Video IDs already analysed in output, and finished sections of failed videos"""
+        finished = set()
+        partial: Dict[str, Dict[str, Any]] = {}
+        
+        if not output.exists():
+            return finished, partial
+        
+        with open(output, 'r', encoding='utf-8') as existing:
+            for line in existing:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A run killed mid-write leaves a truncated last line
+                    continue
+                
+                video_id = record.get('video_id')
+                if record.get('status') == 'ok':
+                    finished.add(video_id)
+                    partial.pop(video_id, None)
+                elif record.get('sections'):
+                    partial.setdefault(video_id, {}).update(record['sections'])
+        
+        return finished, partial
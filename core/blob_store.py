@@ -0,0 +1,366 @@
+# core/blob_store.py
+import gzip
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+from utils.file_ops import atomic_write_bytes, atomic_write_json
+from core.runtime import Reporter, get_reporter
+
+# Optional zstd compression (falls back to gzip)
+try:
+    import zstandard as zstd
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+class BlobStore:
+    """Content-addressed, compressed storage for large session payloads.
+    
+    Dict payloads use a sectioned layout: a JSON header line mapping each top-level
+    key to the offset and length of its own compressed section, followed by the
+    sections. A single section can be read by seeking past the others.
+    """
+    
+    REFS_FILENAME = "refcounts.json"
+    SECTIONED_LAYOUT = 'sectioned'
+    
+    def __init__(self, root_dir: Path, codec: str = 'auto', fsync_policy: str = 'file',
+                 reporter: Optional[Reporter] = None):
+        self.root_dir = Path(root_dir)
+        self.reporter = reporter or get_reporter()
+        self.fsync_policy = fsync_policy
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        self.refs_file = self.root_dir / self.REFS_FILENAME
+        
+        if codec == 'auto':
+            codec = 'zst' if ZSTD_AVAILABLE else 'gz'
+        elif codec == 'zst' and not ZSTD_AVAILABLE:
+            self.reporter.warning("zstd compression not available. Install zstandard: pip install zstandard")
+            codec = 'gz'
+        self.codec = codec
+        
+        # An unreadable refcount table is never overwritten; it has to be rebuilt
+        # from the references held by the sessions (see rebuild_refs)
+        self.needs_rebuild = False
+        self._refs_stamp = None
+        self._refs = self._load_refs() or {}
+    
+    def refresh(self) -> None:
+        """Reload the refcount table if another process has changed it"""
+        if self._file_stamp() != self._refs_stamp:
+            refs = self._load_refs()
+            if refs is not None:
+                self._refs = refs
+    
+    def put(self, kind: str, payload: Any) -> str:
+        """Store a payload and take a reference to it; returns its key.
+        
+        The key is derived from the serialized content, so a blob is never rewritten
+        with different content while sessions still reference it: changed content
+        always lands under a new key.
+        """
+        raw = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        raw_digest = hashlib.sha256(raw).hexdigest()
+        key = f"{kind}-{raw_digest[:32]}"
+        entry = self._refs.get(key)
+        
+        if entry and entry.get('raw_digest') != raw_digest:
+            raise ValueError(f"Blob key collision for {key}")
+        
+        # Identical content is already on disk - only the refcount changes
+        if not entry:
+            stored, layout = self._encode(payload, raw, self.codec)
+            blob_path = self._blob_path(key, self.codec)
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(blob_path, stored, self.fsync_policy)
+            
+            entry = {
+                'refs': 0,
+                'codec': self.codec,
+                'layout': layout,
+                'raw_digest': raw_digest,
+                'raw_size': len(raw),
+                'stored_size': len(stored)
+            }
+        
+        entry['refs'] += 1
+        self._refs[key] = entry
+        self._save_refs()
+        return key
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Load and decompress a payload"""
+        entry = self._refs.get(key)
+        if not entry:
+            return None
+        
+        blob_path = self._blob_path(key, entry['codec'])
+        if not blob_path.exists():
+            return None
+        
+        if entry.get('layout') == self.SECTIONED_LAYOUT:
+            return self._read_sections(blob_path, entry['codec'])
+        
+        with open(blob_path, 'rb') as f:
+            raw = self._decompress(f.read(), entry['codec'])
+        return json.loads(raw.decode('utf-8'))
+    
+    def get_sections(self, key: str, sections: List[str]) -> Optional[Dict[str, Any]]:
+        """Load only the named top-level keys of a dict payload.
+        
+        Sectioned blobs decompress just the requested sections; blobs written before
+        the sectioned layout fall back to a full decode. Missing keys are omitted.
+        """
+        entry = self._refs.get(key)
+        if not entry:
+            return None
+        
+        blob_path = self._blob_path(key, entry['codec'])
+        if not blob_path.exists():
+            return None
+        
+        if entry.get('layout') == self.SECTIONED_LAYOUT:
+            return self._read_sections(blob_path, entry['codec'], sections)
+        
+        payload = self.get(key)
+        if not isinstance(payload, dict):
+            return None
+        return {name: payload[name] for name in sections if name in payload}
+    
+    def upgrade_layout(self) -> int:
+        """Rewrite whole-document dict blobs in the sectioned layout; returns blobs rewritten"""
+        upgraded = 0
+        
+        for key, entry in self._refs.items():
+            if entry.get('layout') == self.SECTIONED_LAYOUT:
+                continue
+            
+            payload = self.get(key)
+            if not isinstance(payload, dict) or not payload:
+                continue
+            
+            stored = self._encode_sections(payload, entry['codec'])
+            atomic_write_bytes(self._blob_path(key, entry['codec']), stored, self.fsync_policy)
+            entry['layout'] = self.SECTIONED_LAYOUT
+            entry['stored_size'] = len(stored)
+            upgraded += 1
+        
+        if upgraded:
+            self._save_refs()
+        return upgraded
+    
+    def release(self, key: str) -> int:
+        """Drop a reference; returns the number of bytes freed on disk"""
+        entry = self._refs.get(key)
+        if not entry:
+            return 0
+        
+        entry['refs'] -= 1
+        freed = 0
+        
+        if entry['refs'] <= 0:
+            blob_path = self._blob_path(key, entry['codec'])
+            if blob_path.exists():
+                freed = blob_path.stat().st_size
+                blob_path.unlink()
+            del self._refs[key]
+        
+        self._save_refs()
+        return freed
+    
+    def rebuild_refs(self, expected_refs: Dict[str, int]) -> int:
+        """Recreate the refcount table from the references sessions hold; returns blobs recovered.
+        
+        Entries are rebuilt from the blob files themselves. Referenced blobs missing
+        on disk and unreferenced files are left for verify to report.
+        """
+        refs = {}
+        
+        for blob_path in self.root_dir.glob("*/*.json.*"):
+            key, _, codec = blob_path.name.rpartition('.json.')
+            if codec == 'tmp' or key not in expected_refs:
+                continue
+            
+            with open(blob_path, 'rb') as f:
+                layout = self.SECTIONED_LAYOUT if f.read(1) == b'{' else 'whole'
+            
+            entry = {'refs': expected_refs[key], 'codec': codec, 'layout': layout}
+            raw = self._read_raw(key, entry)
+            entry.update(
+                raw_digest=hashlib.sha256(raw).hexdigest(),
+                raw_size=len(raw),
+                stored_size=blob_path.stat().st_size
+            )
+            refs[key] = entry
+        
+        self._refs = refs
+        self.needs_rebuild = False
+        self._save_refs()
+        return len(refs)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Summarize compression and deduplication across all blobs"""
+        unique_raw = sum(e['raw_size'] for e in self._refs.values())
+        logical_raw = sum(e['raw_size'] * e['refs'] for e in self._refs.values())
+        stored = sum(e['stored_size'] for e in self._refs.values())
+        
+        return {
+            'codec': self.codec,
+            'blob_count': len(self._refs),
+            'reference_count': sum(e['refs'] for e in self._refs.values()),
+            'logical_bytes': logical_raw,
+            'unique_bytes': unique_raw,
+            'stored_bytes': stored,
+            'compression_ratio': unique_raw / stored if stored else 1.0,
+            'dedup_ratio': logical_raw / unique_raw if unique_raw else 1.0,
+            'overall_ratio': logical_raw / stored if stored else 1.0
+        }
+    
+    def verify(self, expected_refs: Dict[str, int]) -> List[str]:
+        """Compare refcounts with the references actually held and check blob contents.
+        
+        Every blob is decoded and its digest compared with the refcount entry and
+        with the key the session manifests reference it by.
+        """
+        problems = []
+        
+        for key in sorted(set(expected_refs) | set(self._refs)):
+            expected = expected_refs.get(key, 0)
+            entry = self._refs.get(key)
+            actual = entry['refs'] if entry else 0
+            
+            if expected != actual:
+                problems.append(f"Blob {key} has refcount {actual}, expected {expected}")
+            if not entry:
+                continue
+            if not self._blob_path(key, entry['codec']).exists():
+                problems.append(f"Blob {key} is missing on disk")
+                continue
+            
+            try:
+                raw_digest = hashlib.sha256(self._read_raw(key, entry)).hexdigest()
+            except Exception as e:
+                problems.append(f"Blob {key} is unreadable: {e}")
+                continue
+            
+            if raw_digest != entry.get('raw_digest'):
+                problems.append(f"Blob {key} content does not match its recorded digest")
+            elif not self.is_content_key(key):
+                problems.append(f"Blob {key} is not keyed by its content; run `python cli.py storage-report --migrate` to re-key it")
+        
+        known_paths = {self._blob_path(key, entry['codec']) for key, entry in self._refs.items()}
+        for blob_path in self.root_dir.glob("*/*.json.*"):
+            if blob_path.suffix != '.tmp' and blob_path not in known_paths:
+                problems.append(f"Orphaned blob file {blob_path.name}")
+        
+        return problems
+    
+    def is_content_key(self, key: str) -> bool:
+        """Whether key is derived from its blob's content (blobs written by older
+        versions were keyed by video and settings); unknown keys count as current"""
+        entry = self._refs.get(key)
+        return entry is None or key.rsplit('-', 1)[-1] == entry.get('raw_digest', '')[:32]
+    
+    def _blob_path(self, key: str, codec: str) -> Path:
+        """Blobs are fanned out by key prefix to keep directories small"""
+        digest = key.rsplit('-', 1)[-1]
+        return self.root_dir / digest[:2] / f"{key}.json.{codec}"
+    
+    def _read_raw(self, key: str, entry: Dict[str, Any]) -> bytes:
+        """Serialized payload bytes of a blob, as they were when it was stored"""
+        blob_path = self._blob_path(key, entry['codec'])
+        
+        if entry.get('layout') == self.SECTIONED_LAYOUT:
+            payload = self._read_sections(blob_path, entry['codec'])
+            return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        
+        with open(blob_path, 'rb') as f:
+            return self._decompress(f.read(), entry['codec'])
+    
+    def _encode(self, payload: Any, raw: bytes, codec: str) -> tuple:
+        """Serialize a payload for disk; returns (bytes, layout)"""
+        if isinstance(payload, dict) and payload:
+            return self._encode_sections(payload, codec), self.SECTIONED_LAYOUT
+        return self._compress(raw, codec), 'whole'
+    
+    def _encode_sections(self, payload: Dict[str, Any], codec: str) -> bytes:
+        """Header line with {key: [offset, length]} followed by independently compressed sections"""
+        sections = {}
+        body = bytearray()
+        
+        for name, value in payload.items():
+            compressed = self._compress(
+                json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), codec
+            )
+            sections[name] = [len(body), len(compressed)]
+            body += compressed
+        
+        header = json.dumps({'layout': self.SECTIONED_LAYOUT, 'sections': sections}, separators=(',', ':'))
+        return header.encode('utf-8') + b'\n' + bytes(body)
+    
+    def _read_sections(self, blob_path: Path, codec: str, names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Decode the requested sections (all when names is None) of a sectioned blob"""
+        result = {}
+        
+        with open(blob_path, 'rb') as f:
+            sections = json.loads(f.readline().decode('utf-8'))['sections']
+            body_start = f.tell()
+            
+            for name in (names if names is not None else sections):
+                if name not in sections:
+                    continue
+                
+                offset, length = sections[name]
+                f.seek(body_start + offset)
+                result[name] = json.loads(self._decompress(f.read(length), codec).decode('utf-8'))
+        
+        return result
+    
+    def _compress(self, raw: bytes, codec: str) -> bytes:
+        """Compress serialized payload bytes"""
+        if codec == 'zst':
+            return zstd.ZstdCompressor(level=10).compress(raw)
+        return gzip.compress(raw, compresslevel=6)
+    
+    def _decompress(self, data: bytes, codec: str) -> bytes:
+        """Decompress stored blob bytes"""
+        if codec == 'zst':
+            return zstd.ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
+    
+    def _load_refs(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Load the reference-count table; None (and needs_rebuild) if it cannot be read"""
+        try:
+            self._refs_stamp = self._file_stamp()
+            if self._refs_stamp is None:
+                self.needs_rebuild = False
+                return {}
+            
+            with open(self.refs_file, 'r', encoding='utf-8') as f:
+                refs = json.load(f)
+            if not isinstance(refs, dict):
+                raise ValueError("refcount table is not an object")
+            
+            self.needs_rebuild = False
+            return refs
+        
+        except Exception as e:
+            self.reporter.warning(f"Error loading blob reference counts: {e}")
+            self.needs_rebuild = True
+            return None
+    
+    def _save_refs(self) -> None:
+        """Persist the reference-count table"""
+        if self.needs_rebuild:
+            raise RuntimeError("Blob reference counts are unreadable; rebuild them before writing")
+        atomic_write_json(self.refs_file, self._refs, self.fsync_policy, indent=2)
+        self._refs_stamp = self._file_stamp()
+    
+    def _file_stamp(self) -> Optional[tuple]:
+        """Change marker for the refcount file"""
+        try:
+            stat = self.refs_file.stat()
+            return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            return None
@@ -0,0 +1,169 @@
+# core/bulk_export.py
+import json
+import logging
+import tempfile
+import time
+import zipfile
+from concurrent.futures import as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable, Union, BinaryIO
+from core.task_pool import TaskPool
+from utils.validators import sanitize_filename
+from config.settings import EXPORT_CONFIG, EXPORTS_DIR
+
+logger = logging.getLogger(__name__)
+
+# Per-process reader and handler, created on the first document a worker renders
+_worker_state: Dict[str, Any] = {}
+
+def _render_document(sessions_dir: str, session_id: str, kind: str, format_type: str, staging_dir: str) -> Dict[str, Any]:
+    """Worker body: load one session and render one document into the staging directory"""
+    if _worker_state.get('sessions_dir') != sessions_dir:
+        from core.session_manager import SessionReader
+        from core.export_handler import ExportHandler
+        
+        # Workers only read the store, so they skip SessionManager's locks and rebuilds
+        _worker_state['sessions_dir'] = sessions_dir
+        _worker_state['session_reader'] = SessionReader(Path(sessions_dir))
+        _worker_state.setdefault('export_handler', ExportHandler())
+    
+    session_reader = _worker_state['session_reader']
+    export_handler = _worker_state['export_handler']
+    
+    session_data = session_reader.read_session(session_id)
+    if not session_data or not session_data.get('analysis'):
+        raise ValueError(f"Session {session_id} has no stored analysis")
+    
+    video_info = session_data.get('video_info', {})
+    extension = export_handler.get_file_extension(format_type)
+    output = Path(staging_dir) / f"{session_id}-{kind}.{extension}"
+    
+    if kind == 'summary':
+        data = export_handler.export_summary(session_data['analysis'], format_type)
+        output.write_bytes(data)
+        size = len(data)
+    elif kind == 'transcript':
+        size = export_handler.save_transcript(
+            output, session_data.get('transcript', {}), format_type, session_data['analysis']
+        )
+    else:
+        size = export_handler.save_full_report(
+            output, session_data['analysis'], session_data.get('transcript', {}), video_info, format_type
+        )
+    
+    folder = sanitize_filename(f"{video_info.get('title', 'Unknown Video')[:60]}_{session_id[:8]}")
+    return {
+        'session_id': session_id,
+        'kind': kind,
+        'format': format_type,
+        'path': str(output),
+        'arcname': f"{folder}/{kind}.{extension}",
+        'size': size
+    }
+
+class BulkExporter:
+    """Export many sessions into one ZIP archive.
+    
+    Documents are rendered on a TaskPool (the app's shared pool when one is
+    given) and each one is streamed into the archive as soon as it finishes, so only finished-but-unzipped documents are
+    ever staged on disk and the archive itself is never held in memory. A failing
+    document is recorded in the archive manifest without stopping the export.
+    """
+    
+    KINDS = ('summary', 'full_report', 'transcript')
+    PAGE_SIZE = 200
+    
+    def __init__(self, session_manager, task_pool: Optional[TaskPool] = None, max_workers: Optional[int] = None):
+        self.session_manager = session_manager
+        # Without a shared pool the exporter runs its own for the length of each export
+        self.task_pool = task_pool
+        self.max_workers = max_workers or EXPORT_CONFIG['bulk_workers']
+    
+    def select_sessions(self, session_ids: Optional[List[str]] = None, channel: Optional[str] = None,
+                        summary_type: Optional[str] = None, since: Optional[str] = None,
+                        until: Optional[str] = None) -> List[str]:
+        """Session IDs to export: an explicit list, or every session matching the filters"""
+        if session_ids:
+            return list(session_ids)
+        
+        selected = []
+        cursor = None
+        
+        while True:
+            page = self.session_manager.list_sessions(
+                cursor=cursor, page_size=self.PAGE_SIZE,
+                channel=channel, summary_type=summary_type, since=since, until=until
+            )
+            selected.extend(entry['session_id'] for entry in page['sessions'])
+            cursor = page['next_cursor']
+            if not cursor:
+                return selected
+    
+    def export(self, output: Union[str, Path, BinaryIO], formats: List[str], kinds: Optional[List[str]] = None,
+               progress: Optional[Callable[[int, int, Dict[str, Any]], None]] = None,
+               **session_filter) -> Dict[str, Any]:
+        """Render every (session, kind, format) document into a ZIP written to output.
+        
+        output may be a path or any writable binary stream (including unseekable
+        ones such as sockets). progress is called as progress(done, total, result)
+        after each document. session_filter takes the select_sessions() arguments.
+        """
+        kinds = list(kinds or ['full_report'])
+        unknown = [kind for kind in kinds if kind not in self.KINDS]
+        if unknown:
+            raise ValueError(f"Unknown export kind(s): {', '.join(unknown)}")
+        
+        session_ids = self.select_sessions(**session_filter)
+        tasks = [(session_id, kind, format_type) for session_id in session_ids for kind in kinds for format_type in formats]
+        
+        report = {
+            'generated_at': datetime.now().isoformat(),
+            'sessions': len(session_ids),
+            'formats': formats,
+            'kinds': kinds,
+            'documents': [],
+            'failures': [],
+            'bytes': 0
+        }
+        started = time.perf_counter()
+        
+        EXPORTS_DIR.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(prefix="bulk-", dir=EXPORTS_DIR) as staging_dir, \
+                zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            
+            pool = self.task_pool or TaskPool(max_workers=self.max_workers)
+            try:
+                futures = {
+                    pool.submit(_render_document, str(self.session_manager.sessions_dir),
+                                session_id, kind, format_type, staging_dir): (session_id, kind, format_type)
+                    for session_id, kind, format_type in tasks
+                }
+                
+                for done, future in enumerate(as_completed(futures), 1):
+                    session_id, kind, format_type = futures[future]
+                    
+                    try:
+                        result = future.result()
+                        archive.write(result['path'], result['arcname'])
+                        Path(result['path']).unlink(missing_ok=True)
+                        
+                        del result['path']
+                        report['documents'].append(result)
+                        report['bytes'] += result['size']
+                    
+                    except Exception as e:
+                        result = {'session_id': session_id, 'kind': kind, 'format': format_type, 'error': str(e)}
+                        report['failures'].append(result)
+                        logger.warning(f"Bulk export of {session_id} ({kind}, {format_type}) failed: {e}")
+                    
+                    if progress:
+                        progress(done, len(tasks), result)
+            finally:
+                if pool is not self.task_pool:
+                    pool.shutdown()
+            
+            report['duration_seconds'] = round(time.perf_counter() - started, 3)
+            archive.writestr("manifest.json", json.dumps(report, indent=2, ensure_ascii=False))
+        
+        return report
@@ -0,0 +1,46 @@
+# core/cancellation.py
+import threading
+from typing import Optional
+
+class OperationCancelled(BaseException):
+    """Raised when work is abandoned through its CancellationToken.
+    
+    Like asyncio.CancelledError it derives from BaseException, so the broad
+    `except Exception` handlers around individual LLM calls let it through to the
+    code that owns the token.
+    """
+
+class CancellationToken:
+    """Cooperative cancellation flag shared by a job and the calls it makes.
+    
+    Cancelling never interrupts a request already in flight; work checks the token
+    between calls and before retries, and counts the calls it no longer makes.
+    """
+    
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self.reason: Optional[str] = None
+        self.calls_avoided = 0
+    
+    def cancel(self, reason: str = "Cancelled") -> None:
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+    
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+    
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise OperationCancelled(self.reason)
+    
+    def wait(self, seconds: float) -> bool:
+        """Sleep up to seconds, returning early (True) if the token is cancelled meanwhile"""
+        return self._event.wait(seconds)
+    
+    def avoided(self, calls: int = 1) -> None:
+        """Record LLM calls skipped because of the cancellation"""
+        with self._lock:
+            self.calls_avoided += calls
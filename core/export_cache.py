@@ -0,0 +1,165 @@
+# core/export_cache.py
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+from utils.file_ops import atomic_write_bytes
+from core.object_store import get_object_store
+from config.settings import EXPORT_CONFIG, EXPORTS_DIR
+
+class ExportCache:
+    """Two-tier cache of rendered export documents.
+    
+    Keys are content digests, so a document is rendered once per distinct
+    (inputs, format, template version) and every later rerun is a dictionary
+    lookup. A bounded in-memory LRU sits in front of a disk tier that survives
+    restarts and is shared by all server processes.
+    """
+    
+    # Digests of recently exported shared payloads, by object-store key; the results
+    # page hands back the same stored objects on every rerun, so they are hashed
+    # once rather than on each render
+    DIGEST_MEMO_SIZE = 64
+    
+    def __init__(self, cache_dir: Optional[Path] = None, max_memory_bytes: Optional[int] = None,
+                 max_disk_bytes: Optional[int] = None):
+        self.cache_dir = Path(cache_dir or EXPORTS_DIR / "cache")
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_memory_bytes = max_memory_bytes if max_memory_bytes is not None else EXPORT_CONFIG['cache_memory_bytes']
+        self.max_disk_bytes = max_disk_bytes if max_disk_bytes is not None else EXPORT_CONFIG['cache_disk_bytes']
+        
+        self._memory: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._memory_bytes = 0
+        self._digests: 'OrderedDict[str, str]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+    
+    def make_key(self, kind: str, format_type: str, template_version: int, *payloads: Any) -> str:
+        """Cache key for one document: what it is, its format, and the digests of its inputs"""
+        parts = [kind, format_type.upper(), str(template_version)] + [self.digest(p) for p in payloads]
+        return hashlib.sha256("|".join(parts).encode('utf-8')).hexdigest()
+    
+    def digest(self, payload: Any) -> str:
+        """Content digest of a JSON-serializable payload.
+        
+        Payloads held in the shared object store are memoized by their store key,
+        which is content-derived, so the memo never keeps a payload alive; any
+        other payload is hashed on every call.
+        """
+        store_key = get_object_store().key_of(payload)
+        if store_key is not None:
+            with self._lock:
+                digest = self._digests.get(store_key)
+                if digest is not None:
+                    self._digests.move_to_end(store_key)
+                    return digest
+        
+        canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        digest = hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+        
+        if store_key is not None:
+            with self._lock:
+                self._digests[store_key] = digest
+                while len(self._digests) > self.DIGEST_MEMO_SIZE:
+                    self._digests.popitem(last=False)
+        
+        return digest
+    
+    def get_or_render(self, key: str, render: Callable[[], bytes]) -> bytes:
+        """Return the cached document for key, rendering and storing it on a miss"""
+        data = self.get(key)
+        if data is None:
+            data = render()
+            self.put(key, data)
+        return data
+    
+    def get(self, key: str) -> Optional[bytes]:
+        """Look a document up in memory, then on disk"""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return data
+        
+        cache_file = self._cache_path(key)
+        try:
+            with open(cache_file, 'rb') as f:
+                data = f.read()
+            os.utime(cache_file)  # Disk eviction is least-recently-used by mtime
+        except OSError:
+            with self._lock:
+                self.stats['misses'] += 1
+            return None
+        
+        with self._lock:
+            self.stats['disk_hits'] += 1
+            self._remember(key, data)
+        return data
+    
+    def put(self, key: str, data: bytes) -> None:
+        """Store a rendered document in both tiers"""
+        with self._lock:
+            self._remember(key, data)
+        
+        if self.max_disk_bytes > 0 and len(data) <= self.max_disk_bytes:
+            atomic_write_bytes(self._cache_path(key), data, fsync_policy='never')
+            self._prune_disk()
+    
+    def clear(self) -> None:
+        """Drop every cached document"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        
+        for cache_file in self.cache_dir.glob("*.bin"):
+            cache_file.unlink(missing_ok=True)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit counters and current tier sizes"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['memory_items'] = len(self._memory)
+            stats['memory_bytes'] = self._memory_bytes
+        return stats
+    
+    def _remember(self, key: str, data: bytes) -> None:
+        """Insert into the memory LRU, evicting the oldest entries over budget (lock held)"""
+        if len(data) > self.max_memory_bytes:
+            return
+        
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+    
+    def _prune_disk(self) -> None:
+        """Delete least recently used files until the disk tier fits its budget"""
+        files = []
+        total = 0
+        
+        for cache_file in self.cache_dir.glob("*.bin"):
+            try:
+                stat = cache_file.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, cache_file))
+            total += stat.st_size
+        
+        for _, size, cache_file in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            cache_file.unlink(missing_ok=True)
+            total -= size
+    
+    def _cache_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.bin"
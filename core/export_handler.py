@@ -2,43 +2,136 @@
 import json
 import io
 from datetime import datetime
-from typing import Dict, Any
-import streamlit as st
+from pathlib import Path
+from typing import Dict, Any, Optional, Callable
+from core.export_cache import ExportCache
+from core.report_writer import StreamingReportWriter, PDF_AVAILABLE, DOCX_AVAILABLE
+from core.transcript_writer import TranscriptWriter, COLUMNAR_AVAILABLE
+from core.task_pool import TaskPool
+from core.runtime import Reporter, get_reporter
+from utils.file_ops import atomic_open
 
-# For PDF generation
-try:
-    from reportlab.lib.pagesizes import letter, A4
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    from reportlab.lib import colors
-    PDF_AVAILABLE = True
-except ImportError:
-    PDF_AVAILABLE = False
+# Per-process handler used by task pool workers, created on the first task
+_worker_handler: Optional['ExportHandler'] = None
 
-# For Word document generation
-try:
-    from docx import Document
-    from docx.shared import Inches
-    from docx.enum.text import WD_ALIGN_PARAGRAPH
-    DOCX_AVAILABLE = True
-except ImportError:
-    DOCX_AVAILABLE = False
+def _get_worker_handler() -> 'ExportHandler':
+    global _worker_handler
+    if _worker_handler is None:
+        _worker_handler = ExportHandler()
+    return _worker_handler
+
+def _render_in_worker(kind: str, format_type: str, analysis_results: Dict[str, Any],
+                      transcript_data: Optional[Dict] = None, video_info: Optional[Dict] = None) -> bytes:
+    """Task pool body: render one document, bypassing the cache (the caller owns it)"""
+    return _get_worker_handler()._render(kind, format_type, analysis_results, transcript_data, video_info)
+
+def _write_full_report_in_worker(path: str, analysis_results: Dict[str, Any], transcript_data: Dict,
+                                 video_info: Dict, format_type: str) -> int:
+    """Task pool body: stream a full report to path"""
+    return _get_worker_handler()._write_full_report(Path(path), analysis_results, transcript_data, video_info, format_type)
 
 class ExportHandler:
     """Handle various export formats for analysis results"""
     
-    def __init__(self):
+    # Bump whenever the rendered output of any format changes, so cached documents are not reused
+    TEMPLATE_VERSION = 4
+    
+    # Formats only offered for transcript exports
+    TRANSCRIPT_FORMATS = ('SRT', 'WEBVTT', 'PARQUET', 'ARROW')
+    
+    def __init__(self, cache: Optional[ExportCache] = None, task_pool: Optional[TaskPool] = None,
+                 reporter: Optional[Reporter] = None):
+        self.reporter = reporter or get_reporter()
         self.pdf_available = PDF_AVAILABLE
         self.docx_available = DOCX_AVAILABLE
+        self.cache = cache or ExportCache()
+        # Renders run on the shared process pool when one is given, otherwise inline
+        self.task_pool = task_pool
         
         if not self.pdf_available:
-            st.warning("PDF export not available. Install reportlab: pip install reportlab")
+            self.reporter.warning("PDF export not available. Install reportlab: pip install reportlab")
         if not self.docx_available:
-            st.warning("Word export not available. Install python-docx: pip install python-docx")
+            self.reporter.warning("Word export not available. Install python-docx: pip install python-docx")
     
     def export_summary(self, analysis_results: Dict[str, Any], format_type: str) -> bytes:
-        """Export just the summary in specified format"""
+        """Export just the summary in specified format (rendered once per distinct input)"""
+        key = self.document_key('summary', format_type, analysis_results)
+        return self.cache.get_or_render(key, lambda: self._render('summary', format_type, analysis_results))
+    
+    def export_full_report(self, analysis_results: Dict[str, Any], transcript_data: Dict, video_info: Dict, format_type: str) -> bytes:
+        """Export comprehensive report in specified format (rendered once per distinct input)"""
+        key = self.document_key('full_report', format_type, analysis_results, transcript_data, video_info)
+        return self.cache.get_or_render(
+            key, lambda: self._render('full_report', format_type, analysis_results, transcript_data, video_info)
+        )
+    
+    def export_transcript(self, transcript_data: Dict, format_type: str, analysis_results: Optional[Dict[str, Any]] = None) -> bytes:
+        """Export the transcript alone as text, SRT, WebVTT, Parquet or Arrow (rendered once per distinct input)"""
+        key = self.document_key('transcript', format_type, analysis_results, transcript_data)
+        return self.cache.get_or_render(
+            key, lambda: self._render('transcript', format_type, analysis_results, transcript_data)
+        )
+    
+    def save_transcript(self, path: Path, transcript_data: Dict, format_type: str,
+                        analysis_results: Optional[Dict[str, Any]] = None) -> int:
+        """Stream a transcript export to path unless it is already cached; returns its size"""
+        cached = self.cache.get(self.document_key('transcript', format_type, analysis_results, transcript_data))
+        
+        with atomic_open(path, fsync_policy='never') as f:
+            if cached is not None:
+                f.write(cached)
+                return len(cached)
+            
+            writer = TranscriptWriter(transcript_data, analysis_results)
+            return writer.write(f, self.transcript_format(format_type))
+    
+    def document_key(self, kind: str, format_type: str, analysis_results: Dict[str, Any],
+                     transcript_data: Optional[Dict] = None, video_info: Optional[Dict] = None) -> str:
+        """Cache key identifying one rendered document ('summary', 'full_report' or 'transcript')"""
+        rendered_format = self.rendered_format(format_type)
+        
+        if kind == 'summary':
+            payloads = [analysis_results]
+        elif kind == 'transcript':
+            # The analysis timeline supplies the per-segment topic column
+            rendered_format = self.transcript_format(format_type)
+            payloads = [transcript_data, (analysis_results or {}).get('timeline')]
+        else:
+            payloads = [analysis_results, transcript_data, video_info]
+        return self.cache.make_key(kind, rendered_format, self.TEMPLATE_VERSION, *payloads)
+    
+    def rendered_format(self, format_type: str) -> str:
+        """Format actually produced for a request, after fallbacks for missing libraries"""
+        format_type = format_type.upper()
+        
+        if (format_type == "PDF" and self.pdf_available) or (format_type == "WORD DOCUMENT" and self.docx_available) \
+                or format_type in ("JSON", "MARKDOWN"):
+            return format_type
+        return "TEXT FILE"
+    
+    def transcript_format(self, format_type: str) -> str:
+        """Format actually produced for a transcript export, after fallbacks for missing libraries"""
+        format_type = format_type.upper()
+        
+        if format_type in ('SRT', 'WEBVTT') or (format_type in TranscriptWriter.COLUMNAR_FORMATS and COLUMNAR_AVAILABLE):
+            return format_type
+        return "TEXT FILE"
+    
+    def _render(self, kind: str, format_type: str, analysis_results: Dict[str, Any],
+                transcript_data: Optional[Dict] = None, video_info: Optional[Dict] = None) -> bytes:
+        """Render a document on the task pool if there is one"""
+        if self.task_pool is not None:
+            return self.task_pool.run(_render_in_worker, kind, format_type, analysis_results, transcript_data, video_info)
+        if kind == 'transcript':
+            buffer = io.BytesIO()
+            TranscriptWriter(transcript_data, analysis_results).write(buffer, self.transcript_format(format_type))
+            return buffer.getvalue()
+        if kind == 'summary':
+            return self._render_summary(analysis_results, format_type)
+        return self._render_full_report(analysis_results, transcript_data, video_info, format_type)
+    
+    def _render_summary(self, analysis_results: Dict[str, Any], format_type: str) -> bytes:
+        """Build a summary document"""
         
         if format_type.upper() == "PDF" and self.pdf_available:
             return self._create_summary_pdf(analysis_results)
@@ -46,11 +139,13 @@ class ExportHandler:
             return self._create_summary_docx(analysis_results)
         elif format_type.upper() == "JSON":
             return self._create_summary_json(analysis_results)
+        elif format_type.upper() == "MARKDOWN":
+            return self._create_summary_markdown(analysis_results)
         else:
             return self._create_summary_txt(analysis_results)
     
-    def export_full_report(self, analysis_results: Dict[str, Any], transcript_data: Dict, video_info: Dict, format_type: str) -> bytes:
-        """Export comprehensive report in specified format"""
+    def _render_full_report(self, analysis_results: Dict[str, Any], transcript_data: Dict, video_info: Dict, format_type: str) -> bytes:
+        """Build a full report document"""
         
         if format_type.upper() == "PDF" and self.pdf_available:
             return self._create_full_report_pdf(analysis_results, transcript_data, video_info)
@@ -58,9 +153,57 @@ class ExportHandler:
             return self._create_full_report_docx(analysis_results, transcript_data, video_info)
         elif format_type.upper() == "JSON":
             return self._create_full_report_json(analysis_results, transcript_data, video_info)
+        elif format_type.upper() == "MARKDOWN":
+            return self._create_full_report_markdown(analysis_results, transcript_data, video_info)
         else:
             return self._create_full_report_txt(analysis_results, transcript_data, video_info)
     
+    def save_full_report(self, path: Path, analysis_results: Dict[str, Any], transcript_data: Dict, video_info: Dict,
+                         format_type: str, progress: Optional[Callable[[float], None]] = None) -> int:
+        """Write a full report to path, streaming it unless it is already cached; returns its size.
+        
+        Raises ExportTooLarge once the output passes EXPORT_CONFIG['max_file_size'].
+        On the task pool progress is not reported, since the callback cannot cross processes.
+        """
+        cached = self.cache.get(self.document_key('full_report', format_type, analysis_results, transcript_data, video_info))
+        
+        if cached is not None:
+            with atomic_open(path, fsync_policy='never') as f:
+                f.write(cached)
+            return len(cached)
+        
+        if self.task_pool is not None:
+            return self.task_pool.run(
+                _write_full_report_in_worker, str(path), analysis_results, transcript_data, video_info, format_type
+            )
+        return self._write_full_report(path, analysis_results, transcript_data, video_info, format_type, progress)
+    
+    def _write_full_report(self, path: Path, analysis_results: Dict[str, Any], transcript_data: Dict, video_info: Dict,
+                           format_type: str, progress: Optional[Callable[[float], None]] = None) -> int:
+        """Stream a freshly rendered full report to path"""
+        writer = StreamingReportWriter(analysis_results, transcript_data, video_info, progress=progress)
+        
+        with atomic_open(path, fsync_policy='never') as f:
+            return writer.write(f, self.rendered_format(format_type))
+    
+    def get_file_extension(self, format_type: str) -> str:
+        """File extension for a rendered format"""
+        extensions = {
+            "PDF": "pdf",
+            "WORD DOCUMENT": "docx",
+            "JSON": "json",
+            "MARKDOWN": "md",
+            "SRT": "srt",
+            "WEBVTT": "vtt",
+            "PARQUET": "parquet",
+            "ARROW": "arrow",
+            "TEXT FILE": "txt"
+        }
+        
+        if format_type.upper() in self.TRANSCRIPT_FORMATS:
+            return extensions.get(self.transcript_format(format_type), "txt")
+        return extensions.get(self.rendered_format(format_type), "txt")
+    
     def get_mime_type(self, format_type: str) -> str:
         """Get MIME type for download"""
         format_type = format_type.upper()
@@ -69,6 +212,11 @@ class ExportHandler:
             "PDF": "application/pdf",
             "WORD DOCUMENT": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
             "JSON": "application/json",
+            "MARKDOWN": "text/markdown",
+            "SRT": "application/x-subrip",
+            "WEBVTT": "text/vtt",
+            "PARQUET": "application/vnd.apache.parquet",
+            "ARROW": "application/vnd.apache.arrow.file",
             "TEXT FILE": "text/plain"
         }
         
@@ -76,44 +224,11 @@ class ExportHandler:
     
     def _create_summary_txt(self, analysis_results: Dict[str, Any]) -> bytes:
         """Create text summary"""
-        content = []
-        content.append("=" * 60)
-        content.append("VIDEO ANALYSIS SUMMARY")
-        content.append("=" * 60)
-        content.append(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        content.append("")
-        
-        # Main Summary
-        content.append("MAIN SUMMARY")
-        content.append("-" * 20)
-        content.append(analysis_results.get('main_summary', 'Not available'))
-        content.append("")
-        
-        # Key Takeaways
-        if 'key_takeaways' in analysis_results:
-            content.append("KEY TAKEAWAYS")
-            content.append("-" * 20)
-            for i, takeaway in enumerate(analysis_results['key_takeaways'], 1):
-                content.append(f"{i}. {takeaway}")
-            content.append("")
-        
-        # Important Quotes
-        if 'important_quotes' in analysis_results:
-            content.append("IMPORTANT QUOTES")
-            content.append("-" * 20)
-            for quote in analysis_results['important_quotes']:
-                content.append(f'• "{quote}"')
-            content.append("")
-        
-        # Action Items
-        if 'action_items' in analysis_results:
-            content.append("ACTION ITEMS")
-            content.append("-" * 20)
-            for item in analysis_results['action_items']:
-                content.append(f"• {item}")
-            content.append("")
-        
-        return "\n".join(content).encode('utf-8')
+        return self._stream_to_bytes(analysis_results, {}, {}, "TEXT FILE", template='summary')
+    
+    def _create_summary_markdown(self, analysis_results: Dict[str, Any]) -> bytes:
+        """Create Markdown summary"""
+        return self._stream_to_bytes(analysis_results, {}, {}, "MARKDOWN", template='summary')
     
     def _create_summary_json(self, analysis_results: Dict[str, Any]) -> bytes:
         """Create JSON summary"""
@@ -138,333 +253,48 @@ class ExportHandler:
         if not self.pdf_available:
             return self._create_summary_txt(analysis_results)
         
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter)
-        styles = getSampleStyleSheet()
-        story = []
-        
-        # Title
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            spaceAfter=30,
-            alignment=1  # Center alignment
-        )
-        story.append(Paragraph("Video Analysis Summary", title_style))
-        story.append(Spacer(1, 12))
-        
-        # Generated info
-        story.append(Paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']))
-        story.append(Spacer(1, 20))
-        
-        # Main Summary
-        story.append(Paragraph("Main Summary", styles['Heading2']))
-        story.append(Paragraph(analysis_results.get('main_summary', 'Not available'), styles['Normal']))
-        story.append(Spacer(1, 15))
-        
-        # Key Takeaways
-        if 'key_takeaways' in analysis_results:
-            story.append(Paragraph("Key Takeaways", styles['Heading2']))
-            for i, takeaway in enumerate(analysis_results['key_takeaways'], 1):
-                story.append(Paragraph(f"{i}. {takeaway}", styles['Normal']))
-            story.append(Spacer(1, 15))
-        
-        # Important Quotes
-        if 'important_quotes' in analysis_results:
-            story.append(Paragraph("Important Quotes", styles['Heading2']))
-            for quote in analysis_results['important_quotes']:
-                story.append(Paragraph(f'"{quote}"', styles['BodyText']))
-            story.append(Spacer(1, 15))
-        
-        doc.build(story)
-        buffer.seek(0)
-        return buffer.read()
+        return self._stream_to_bytes(analysis_results, {}, {}, "PDF", template='summary')
     
     def _create_summary_docx(self, analysis_results: Dict[str, Any]) -> bytes:
         """Create Word document summary"""
         if not self.docx_available:
             return self._create_summary_txt(analysis_results)
         
-        doc = Document()
-        
-        # Title
-        title = doc.add_heading('Video Analysis Summary', 0)
-        title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        
-        # Generated info
-        doc.add_paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        
-        # Main Summary
-        doc.add_heading('Main Summary', level=1)
-        doc.add_paragraph(analysis_results.get('main_summary', 'Not available'))
-        
-        # Key Takeaways
-        if 'key_takeaways' in analysis_results:
-            doc.add_heading('Key Takeaways', level=1)
-            for i, takeaway in enumerate(analysis_results['key_takeaways'], 1):
-                doc.add_paragraph(f"{i}. {takeaway}", style='List Number')
-        
-        # Important Quotes
-        if 'important_quotes' in analysis_results:
-            doc.add_heading('Important Quotes', level=1)
-            for quote in analysis_results['important_quotes']:
-                p = doc.add_paragraph(f'"{quote}"')
-                p.style = 'Intense Quote'
-        
-        # Action Items
-        if 'action_items' in analysis_results:
-            doc.add_heading('Action Items', level=1)
-            for item in analysis_results['action_items']:
-                doc.add_paragraph(item, style='List Bullet')
-        
-        # Save to buffer
-        buffer = io.BytesIO()
-        doc.save(buffer)
-        buffer.seek(0)
-        return buffer.read()
+        return self._stream_to_bytes(analysis_results, {}, {}, "WORD DOCUMENT", template='summary')
     
     def _create_full_report_txt(self, analysis_results: Dict[str, Any], transcript_data: Dict, video_info: Dict) -> bytes:
         """Create comprehensive text report"""
-        content = []
-        content.append("=" * 80)
-        content.append("COMPREHENSIVE VIDEO ANALYSIS REPORT")
-        content.append("=" * 80)
-        content.append(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        content.append("")
-        
-        # Video Information
-        content.append("VIDEO INFORMATION")
-        content.append("-" * 30)
-        content.append(f"Title: {video_info.get('title', 'Unknown')}")
-        content.append(f"Channel: {video_info.get('channel', 'Unknown')}")
-        content.append(f"Duration: {video_info.get('duration', 'Unknown')}")
-        content.append(f"URL: {video_info.get('url', 'Unknown')}")
-        content.append("")
-        
-        # Main Summary
-        content.append("EXECUTIVE SUMMARY")
-        content.append("-" * 30)
-        content.append(analysis_results.get('main_summary', 'Not available'))
-        content.append("")
-        
-        # Key Takeaways
-        if 'key_takeaways' in analysis_results:
-            content.append("KEY TAKEAWAYS")
-            content.append("-" * 30)
-            for i, takeaway in enumerate(analysis_results['key_takeaways'], 1):
-                content.append(f"{i}. {takeaway}")
-            content.append("")
-        
-        # Topics
-        if 'topics' in analysis_results:
-            content.append("MAIN TOPICS DISCUSSED")
-            content.append("-" * 30)
-            content.append(", ".join(analysis_results['topics']))
-            content.append("")
-        
-        # Sentiment Analysis
-        if 'sentiment_analysis' in analysis_results:
-            sentiment = analysis_results['sentiment_analysis']
-            content.append("SENTIMENT ANALYSIS")
-            content.append("-" * 30)
-            content.append(f"Positive: {sentiment.get('positive', 0):.1%}")
-            content.append(f"Neutral: {sentiment.get('neutral', 0):.1%}")
-            content.append(f"Negative: {sentiment.get('negative', 0):.1%}")
-            content.append(f"Overall Score: {sentiment.get('overall_score', 0):.2f}")
-            content.append("")
-        
-        # Important Quotes
-        if 'important_quotes' in analysis_results:
-            content.append("IMPORTANT QUOTES")
-            content.append("-" * 30)
-            for quote in analysis_results['important_quotes']:
-                content.append(f'• "{quote}"')
-            content.append("")
-        
-        # Action Items
-        if 'action_items' in analysis_results:
-            content.append("ACTION ITEMS")
-            content.append("-" * 30)
-            for item in analysis_results['action_items']:
-                content.append(f"• {item}")
-            content.append("")
-        
-        # Timeline
-        if 'timeline' in analysis_results:
-            content.append("VIDEO TIMELINE")
-            content.append("-" * 30)
-            for event in analysis_results['timeline']:
-                content.append(f"{event['timestamp']}: {event['description']}")
-            content.append("")
-        
-        # Q&A
-        if 'questions_and_answers' in analysis_results:
-            content.append("QUESTIONS & ANSWERS")
-            content.append("-" * 30)
-            for qa in analysis_results['questions_and_answers']:
-                content.append(f"Q: {qa['question']}")
-                content.append(f"A: {qa['answer']}")
-                content.append("")
-        
-        # Statistics
-        content.append("STATISTICS")
-        content.append("-" * 30)
-        content.append(f"Total Words: {len(transcript_data.get('text', '').split()):,}")
-        content.append(f"Total Segments: {transcript_data.get('total_segments', 0):,}")
-        content.append(f"Estimated Reading Time: {len(transcript_data.get('text', '').split()) // 200 + 1} minutes")
-        content.append("")
-        
-        return "\n".join(content).encode('utf-8')
+        return self._stream_to_bytes(analysis_results, transcript_data, video_info, "TEXT FILE")
+    
+    def _create_full_report_markdown(self, analysis_results: Dict[str, Any], transcript_data: Dict, video_info: Dict) -> bytes:
+        """Create comprehensive Markdown report"""
+        return self._stream_to_bytes(analysis_results, transcript_data, video_info, "MARKDOWN")
     
     def _create_full_report_json(self, analysis_results: Dict[str, Any], transcript_data: Dict, video_info: Dict) -> bytes:
         """Create comprehensive JSON report"""
-        report_data = {
-            "export_info": {
-                "type": "full_report",
-                "generated_at": datetime.now().isoformat(),
-                "version": "1.0"
-            },
-            "video_info": video_info,
-            "analysis_results": analysis_results,
-            "transcript_stats": {
-                "total_words": len(transcript_data.get('text', '').split()),
-                "total_segments": transcript_data.get('total_segments', 0),
-                "estimated_reading_time_minutes": len(transcript_data.get('text', '').split()) // 200 + 1,
-                "language_codes": transcript_data.get('language_codes', [])
-            }
-        }
-        
-        return json.dumps(report_data, indent=2, ensure_ascii=False).encode('utf-8')
+        return self._stream_to_bytes(analysis_results, transcript_data, video_info, "JSON")
     
     def _create_full_report_pdf(self, analysis_results: Dict[str, Any], transcript_data: Dict, video_info: Dict) -> bytes:
         """Create comprehensive PDF report"""
         if not self.pdf_available:
             return self._create_full_report_txt(analysis_results, transcript_data, video_info)
         
+        return self._stream_to_bytes(analysis_results, transcript_data, video_info, "PDF")
+    
+    def _stream_to_bytes(self, analysis_results: Dict[str, Any], transcript_data: Dict, video_info: Dict,
+                         format_type: str, template: str = 'full_report') -> bytes:
+        """Run the streaming writer into memory for callers that need the document as bytes"""
         buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4)
-        styles = getSampleStyleSheet()
-        story = []
-        
-        # Title page
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            spaceAfter=30,
-            alignment=1
+        writer = StreamingReportWriter(
+            analysis_results, transcript_data, video_info,
+            include_transcript=(template == 'full_report'), template=template
         )
-        story.append(Paragraph("Comprehensive Video Analysis Report", title_style))
-        story.append(Spacer(1, 50))
-        
-        # Video info table
-        video_data = [
-            ['Video Information', ''],
-            ['Title', video_info.get('title', 'Unknown')],
-            ['Channel', video_info.get('channel', 'Unknown')],
-            ['Duration', video_info.get('duration', 'Unknown')],
-            ['Generated', datetime.now().strftime('%Y-%m-%d %H:%M:%S')]
-        ]
-        
-        video_table = Table(video_data, colWidths=[2*inch, 4*inch])
-        video_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        story.append(video_table)
-        story.append(Spacer(1, 30))
-        
-        # Sections
-        sections = [
-            ('Executive Summary', analysis_results.get('main_summary', '')),
-            ('Key Takeaways', '\n'.join([f"• {item}" for item in analysis_results.get('key_takeaways', [])])),
-            ('Important Quotes', '\n'.join([f'"{quote}"' for quote in analysis_results.get('important_quotes', [])])),
-            ('Action Items', '\n'.join([f"• {item}" for item in analysis_results.get('action_items', [])]))
-        ]
-        
-        for section_title, section_content in sections:
-            if section_content:
-                story.append(Paragraph(section_title, styles['Heading2']))
-                story.append(Paragraph(section_content, styles['Normal']))
-                story.append(Spacer(1, 15))
-        
-        doc.build(story)
-        buffer.seek(0)
-        return buffer.read()
+        writer.write(buffer, format_type)
+        return buffer.getvalue()
     
     def _create_full_report_docx(self, analysis_results: Dict[str, Any], transcript_data: Dict, video_info: Dict) -> bytes:
         """Create comprehensive Word document report"""
         if not self.docx_available:
             return self._create_full_report_txt(analysis_results, transcript_data, video_info)
         
-        doc = Document()
-        
-        # Title
-        title = doc.add_heading('Comprehensive Video Analysis Report', 0)
-        title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        
-        # Video Information
-        doc.add_heading('Video Information', level=1)
-        info_table = doc.add_table(rows=5, cols=2)
-        info_table.style = 'Table Grid'
-        
-        info_data = [
-            ('Title', video_info.get('title', 'Unknown')),
-            ('Channel', video_info.get('channel', 'Unknown')),
-            ('Duration', video_info.get('duration', 'Unknown')),
-            ('URL', video_info.get('url', 'Unknown')),
-            ('Generated', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-        ]
-        
-        for i, (label, value) in enumerate(info_data):
-            info_table.cell(i, 0).text = label
-            info_table.cell(i, 1).text = value
-        
-        # Analysis sections
-        doc.add_heading('Executive Summary', level=1)
-        doc.add_paragraph(analysis_results.get('main_summary', 'Not available'))
-        
-        if 'key_takeaways' in analysis_results:
-            doc.add_heading('Key Takeaways', level=1)
-            for takeaway in analysis_results['key_takeaways']:
-                doc.add_paragraph(takeaway, style='List Bullet')
-        
-        if 'important_quotes' in analysis_results:
-            doc.add_heading('Important Quotes', level=1)
-            for quote in analysis_results['important_quotes']:
-                p = doc.add_paragraph(f'"{quote}"')
-                p.style = 'Intense Quote'
-        
-        if 'action_items' in analysis_results:
-            doc.add_heading('Action Items', level=1)
-            for item in analysis_results['action_items']:
-                doc.add_paragraph(item, style='List Bullet')
-        
-        # Statistics
-        doc.add_heading('Statistics', level=1)
-        stats_table = doc.add_table(rows=3, cols=2)
-        stats_table.style = 'Table Grid'
-        
-        stats_data = [
-            ('Total Words', f"{len(transcript_data.get('text', '').split()):,}"),
-            ('Total Segments', f"{transcript_data.get('total_segments', 0):,}"),
-            ('Reading Time', f"{len(transcript_data.get('text', '').split()) // 200 + 1} minutes")
-        ]
-        
-        for i, (label, value) in enumerate(stats_data):
-            stats_table.cell(i, 0).text = label
-            stats_table.cell(i, 1).text = value
-        
-        # Save to buffer
-        buffer = io.BytesIO()
-        doc.save(buffer)
-        buffer.seek(0)
-        return buffer.read()
\ No newline at end of file
+        return self._stream_to_bytes(analysis_results, transcript_data, video_info, "WORD DOCUMENT")
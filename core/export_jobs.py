@@ -0,0 +1,182 @@
+# core/export_jobs.py
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Optional
+from utils.file_ops import atomic_write_bytes
+from config.settings import EXPORT_CONFIG, EXPORTS_DIR
+
+logger = logging.getLogger(__name__)
+
+class ExportQueueFull(Exception):
+    """Raised when too many export jobs are already waiting"""
+
+class ExportJobQueue:
+    """Render export documents on a worker pool so the page never blocks on them.
+    
+    Jobs are identified by the export cache key of the document they produce, so
+    submitting the same (content, format) while a job is pending, or while its
+    finished artifact is still available, returns that job.
+    Finished artifacts are written to EXPORTS_DIR/jobs and expire after a TTL.
+    """
+    
+    ACTIVE_STATES = ('queued', 'running')
+    
+    def __init__(self, export_handler, max_workers: Optional[int] = None, max_pending: Optional[int] = None,
+                 artifact_ttl: Optional[int] = None, jobs_dir: Optional[Path] = None):
+        self.export_handler = export_handler
+        self.max_workers = max_workers or EXPORT_CONFIG['job_workers']
+        self.max_pending = max_pending or EXPORT_CONFIG['job_max_pending']
+        self.artifact_ttl = artifact_ttl or EXPORT_CONFIG['artifact_ttl']
+        self.jobs_dir = Path(jobs_dir or EXPORTS_DIR / "jobs")
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="export-job")
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._job_by_key: Dict[str, str] = {}
+        self._lock = threading.Lock()
+    
+    def submit(self, analysis_results: Dict[str, Any], transcript_data: Dict, video_info: Dict,
+               format_type: str, kind: str = 'full_report', retry: bool = False) -> str:
+        """Queue a document for rendering; returns the job ID (an existing one for duplicates).
+        
+        A failed job is returned as-is unless retry is True, so polling callers can
+        submit on every rerun without looping on a broken document.
+        """
+        self.cleanup_expired()
+        
+        rendered_format = self.export_handler.rendered_format(format_type)
+        key = self.export_handler.document_key(kind, format_type, analysis_results, transcript_data, video_info)
+        
+        with self._lock:
+            existing = self._jobs.get(self._job_by_key.get(key))
+            if existing and self._is_reusable(existing, retry):
+                return existing['job_id']
+            
+            pending = sum(1 for job in self._jobs.values() if job['status'] in self.ACTIVE_STATES)
+            if pending >= self.max_pending:
+                raise ExportQueueFull(f"{pending} export jobs are already pending, try again shortly")
+            
+            job_id = uuid.uuid4().hex[:16]
+            video_id = (video_info or {}).get('video_id', 'unknown')
+            self._jobs[job_id] = {
+                'job_id': job_id,
+                'key': key,
+                'kind': kind,
+                'format': format_type,
+                'status': 'queued',
+                'progress': 0.0,
+                'stage': 'Waiting for a worker',
+                'file_name': f"{kind}_{video_id}.{self.export_handler.get_file_extension(rendered_format)}",
+                'mime': self.export_handler.get_mime_type(rendered_format),
+                'artifact': None,
+                'size': 0,
+                'error': None,
+                'submitted_at': time.time(),
+                'finished_at': None
+            }
+            self._job_by_key[key] = job_id
+        
+        self._executor.submit(self._run_job, job_id, analysis_results, transcript_data, video_info)
+        return job_id
+    
+    def get_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Snapshot of a job's state, or None if it is unknown or expired"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+    
+    def read_artifact(self, job_id: str) -> Optional[bytes]:
+        """Rendered document of a finished job"""
+        status = self.get_status(job_id)
+        if not status or status['status'] != 'done':
+            return None
+        
+        try:
+            return Path(status['artifact']).read_bytes()
+        except OSError:
+            return None
+    
+    def cleanup_expired(self) -> int:
+        """Forget finished jobs past their TTL and delete their artifacts; returns files removed"""
+        cutoff = time.time() - self.artifact_ttl
+        removed = 0
+        
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job['finished_at'] is not None and job['finished_at'] < cutoff
+            ]
+            for job_id in expired:
+                job = self._jobs.pop(job_id)
+                if self._job_by_key.get(job['key']) == job_id:
+                    del self._job_by_key[job['key']]
+            live_artifacts = {job['artifact'] for job in self._jobs.values() if job['artifact']}
+        
+        # Includes artifacts left behind by earlier server processes
+        for artifact in self.jobs_dir.iterdir():
+            try:
+                if str(artifact) not in live_artifacts and artifact.stat().st_mtime < cutoff:
+                    artifact.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        
+        return removed
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Job counts by status"""
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job['status']] = counts.get(job['status'], 0) + 1
+            return counts
+    
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop accepting work; queued jobs are cancelled unless wait is True"""
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+    
+    def _run_job(self, job_id: str, analysis_results: Dict[str, Any], transcript_data: Dict, video_info: Dict) -> None:
+        """Worker body: render through the export cache, then publish the artifact"""
+        job = self._jobs[job_id]
+        self._update(job_id, status='running', progress=0.1, stage='Rendering document')
+        
+        try:
+            artifact = self.jobs_dir / f"{job_id}-{job['file_name']}"
+            
+            if job['kind'] == 'summary':
+                data = self.export_handler.export_summary(analysis_results, job['format'])
+                atomic_write_bytes(artifact, data, fsync_policy='never')
+                size = len(data)
+            else:
+                # Full reports stream straight into the artifact file
+                size = self.export_handler.save_full_report(
+                    artifact, analysis_results, transcript_data, video_info, job['format'],
+                    progress=lambda fraction: self._update(job_id, progress=0.1 + 0.85 * fraction, stage='Writing transcript')
+                )
+            
+            self._update(job_id, status='done', progress=1.0, stage='Ready', artifact=str(artifact), size=size)
+        
+        except Exception as e:
+            logger.warning(f"Export job {job_id} failed: {e}")
+            self._update(job_id, status='failed', stage='Failed', error=str(e))
+        
+        finally:
+            with self._lock:
+                job['finished_at'] = time.time()
+    
+    @staticmethod
+    def _is_reusable(job: Dict[str, Any], retry: bool) -> bool:
+        """Whether a duplicate submission can be answered by an existing job"""
+        if job['status'] == 'failed':
+            return not retry
+        if job['status'] == 'done':
+            return Path(job['artifact']).exists()
+        return True
+    
+    def _update(self, job_id: str, **changes) -> None:
+        with self._lock:
+            self._jobs[job_id].update(changes)
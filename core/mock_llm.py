@@ -0,0 +1,43 @@
+# core/mock_llm.py
+import time
+from typing import Optional
+from config.settings import DEV_CONFIG
+
+# Canned answers by prompt kind, shaped so every AIProcessor parser finds content
+CANNED_RESPONSES = {
+    'sentiment': "Positive: 55%\nNeutral: 35%\nNegative: 10%\nOverall sentiment score: 0.4\nA steady, upbeat tone.",
+    'timeline': "00:00: Introduction\n02:30: Main discussion\n08:15: Summary and next steps",
+    'question-answer': "Q: What is the video about?\nA: A stub answer for testing.\nQ: Who is it for?\nA: Anyone running a load test.",
+    'default': (
+        "1. \"The stub backend returns this line for every prompt it does not recognise.\"\n"
+        "2. \"Responses are canned so load tests measure the pipeline, not the model.\"\n"
+        "3. Key point about the content"
+    )
+}
+
+class StubResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+class StubModel:
+    """Stand-in for genai.GenerativeModel used when DEV_CONFIG['mock_api'] is set.
+    
+    Each call sleeps for a fixed latency, standing in for the network round trip,
+    and returns a canned answer; no API key or network access is needed.
+    """
+    
+    def __init__(self, latency: Optional[float] = None):
+        self.latency = DEV_CONFIG['mock_latency'] if latency is None else latency
+        self.calls = 0
+    
+    def generate_content(self, prompt: str) -> StubResponse:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        
+        # Only the instructions pick the answer; the transcript may mention anything
+        instructions = prompt.split("\n\nTranscript:\n", 1)[0].lower()
+        for kind, text in CANNED_RESPONSES.items():
+            if kind != 'default' and kind in instructions:
+                return StubResponse(text)
+        return StubResponse(CANNED_RESPONSES['default'])
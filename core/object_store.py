@@ -0,0 +1,127 @@
+# core/object_store.py
+import logging
+import threading
+import weakref
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class ObjectHandle:
+    """Lightweight reference to an object in an ObjectStore.
+    
+    Per-user state holds handles instead of the objects themselves; when the last
+    handle to an object is garbage collected, for example because Streamlit
+    dropped an expired session's state, the store frees the object.
+    """
+    
+    __slots__ = ('key', '_store', '__weakref__')
+    
+    def __init__(self, key: str, store: 'ObjectStore'):
+        self.key = key
+        self._store = store
+    
+    def get(self) -> Any:
+        return self._store.get(self.key)
+    
+    def __repr__(self) -> str:
+        return f"ObjectHandle({self.key!r})"
+
+class ObjectStore:
+    """Process-wide, reference-counted store for large read-only objects.
+    
+    Objects are keyed by content (blob keys for stored payloads), so every user
+    viewing the same transcript or analysis shares one copy. Each handle counts
+    as one reference. Finalizers only queue releases, since they can run in any
+    thread in the middle of another store call; the queue is drained under the
+    lock by the next call.
+    """
+    
+    def __init__(self):
+        self._objects: Dict[str, Any] = {}
+        self._keys_by_id: Dict[int, str] = {}
+        self._refs: Dict[str, int] = {}
+        self._pending_releases = deque()
+        self._lock = threading.Lock()
+        self.stats = {'loads': 0, 'hits': 0, 'freed': 0}
+    
+    def acquire(self, key: str, loader: Callable[[], Any]) -> Optional[ObjectHandle]:
+        """A new handle to key, calling loader only if the object is not already held"""
+        with self._lock:
+            self._drain_releases()
+            if key in self._objects:
+                self.stats['hits'] += 1
+                return self._new_handle(key)
+        
+        # Loaders read from disk; two users racing on a cold key both load and one copy is kept
+        value = loader()
+        if value is None:
+            return None
+        
+        with self._lock:
+            self._drain_releases()
+            if key in self._objects:
+                self.stats['hits'] += 1
+            else:
+                self._objects[key] = value
+                self._keys_by_id[id(value)] = key
+                self.stats['loads'] += 1
+            return self._new_handle(key)
+    
+    def get(self, key: str) -> Any:
+        """The object behind key; None once every handle to it has been released"""
+        return self._objects.get(key)
+    
+    def key_of(self, value: Any) -> Optional[str]:
+        """Key of an object held by the store, or None for any other object.
+        
+        Held objects are referenced by the store, so their id() cannot be reused
+        while they are mapped.
+        """
+        with self._lock:
+            key = self._keys_by_id.get(id(value))
+            return key if key is not None and self._objects.get(key) is value else None
+    
+    def collect(self) -> int:
+        """Apply queued releases now; returns the number of objects freed"""
+        with self._lock:
+            return self._drain_releases()
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Objects held, live handles, and load/hit/free counters"""
+        with self._lock:
+            self._drain_releases()
+            return {
+                'objects': len(self._objects),
+                'handles': sum(self._refs.values()),
+                **self.stats
+            }
+    
+    def _new_handle(self, key: str) -> ObjectHandle:
+        """Caller holds the lock"""
+        handle = ObjectHandle(key, self)
+        self._refs[key] = self._refs.get(key, 0) + 1
+        weakref.finalize(handle, self._pending_releases.append, key)
+        return handle
+    
+    def _drain_releases(self) -> int:
+        """Caller holds the lock"""
+        freed = 0
+        while self._pending_releases:
+            key = self._pending_releases.popleft()
+            self._refs[key] -= 1
+            if self._refs[key] <= 0:
+                del self._refs[key]
+                del self._keys_by_id[id(self._objects.pop(key))]
+                freed += 1
+        
+        if freed:
+            self.stats['freed'] += freed
+            logger.debug(f"Freed {freed} shared object(s)")
+        return freed
+
+_object_store = ObjectStore()
+
+def get_object_store() -> ObjectStore:
+    """The store shared by every user of this process"""
+    return _object_store
@@ -0,0 +1,182 @@
+# core/prefetch.py
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout, CancelledError
+from typing import Dict, Any, Optional
+from utils.validators import extract_canonical_video_id
+from config.settings import ANALYSIS_CONFIG
+
+logger = logging.getLogger(__name__)
+
+class TranscriptPrefetcher:
+    """Fetch a video's metadata and processed transcript as soon as its URL is entered.
+    
+    Prefetches are keyed by canonical video ID, so every page entering the same
+    video shares one download. Each page that starts a prefetch holds an interest
+    in it; once the last interest is released (the URL was changed or cleared) the
+    prefetch is cancelled: dropped from the queue if it has not started, otherwise
+    stopped at its next stage and its result discarded. The analysis job runner
+    takes the prefetched transcript instead of downloading it again, so a job for
+    a prefetched URL starts at the LLM stage. Finished prefetches expire after a TTL.
+    """
+    
+    def __init__(self, youtube_handler, max_workers: Optional[int] = None, ttl: Optional[int] = None):
+        self.youtube_handler = youtube_handler
+        self.max_workers = max_workers or ANALYSIS_CONFIG['prefetch_workers']
+        self.ttl = ttl or ANALYSIS_CONFIG['prefetch_ttl']
+        
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="prefetch")
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.stats = {'started': 0, 'joined': 0, 'cancelled': 0, 'used': 0, 'failed': 0}
+    
+    def start(self, url: str) -> Optional[str]:
+        """Begin prefetching url's video, or join a prefetch already under way; returns its video ID"""
+        video_id = extract_canonical_video_id(url)
+        if not video_id:
+            return None
+        
+        self.cleanup_expired()
+        
+        with self._lock:
+            entry = self._entries.get(video_id)
+            if entry:
+                entry['interest'] += 1
+                self.stats['joined'] += 1
+                return video_id
+            
+            entry = {
+                'video_id': video_id,
+                'url': url,
+                'interest': 1,
+                'cancelled': threading.Event(),
+                'info': Future(),
+                'transcript': Future(),
+                'started_at': time.time(),
+                'finished_at': None
+            }
+            self._entries[video_id] = entry
+            self.stats['started'] += 1
+            entry['task'] = self._executor.submit(self._run, entry)
+        
+        return video_id
+    
+    def release(self, url: str) -> None:
+        """Drop one interest in url's prefetch; the last one cancels it if it is still running"""
+        video_id = extract_canonical_video_id(url)
+        
+        with self._lock:
+            entry = self._entries.get(video_id)
+            if not entry:
+                return
+            
+            entry['interest'] -= 1
+            if entry['interest'] > 0 or entry['finished_at']:
+                return
+            
+            del self._entries[video_id]
+            entry['cancelled'].set()
+            self.stats['cancelled'] += 1
+            
+            # Never started: nothing will resolve its futures, so settle them here
+            if entry['task'].cancel():
+                for name in ('info', 'transcript'):
+                    if entry[name].set_running_or_notify_cancel():
+                        entry[name].set_result(None)
+        
+        logger.debug(f"Cancelled prefetch of {video_id}")
+    
+    def video_info(self, url: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Prefetched metadata for url, waiting up to timeout; None if there is none (yet)"""
+        return self._wait(url, 'info', timeout)
+    
+    def get_transcript(self, url: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Prefetched transcript for url, waiting for one in flight; None if there is none.
+        
+        The caller holds an interest while it waits, so the page that started the
+        prefetch moving on to another URL does not cancel it from under the caller.
+        """
+        video_id = extract_canonical_video_id(url)
+        with self._lock:
+            entry = self._entries.get(video_id)
+            if not entry:
+                return None
+            entry['interest'] += 1
+        
+        try:
+            transcript_data = self._result(entry['transcript'], timeout)
+        finally:
+            self.release(url)
+        
+        if transcript_data is not None:
+            with self._lock:
+                self.stats['used'] += 1
+        return transcript_data
+    
+    def cleanup_expired(self) -> int:
+        """Forget finished prefetches past their TTL; returns entries removed"""
+        cutoff = time.time() - self.ttl
+        
+        with self._lock:
+            expired = [
+                video_id for video_id, entry in self._entries.items()
+                if entry['finished_at'] and entry['finished_at'] < cutoff
+            ]
+            for video_id in expired:
+                del self._entries[video_id]
+        
+        return len(expired)
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Prefetch counters plus entries in flight and ready"""
+        with self._lock:
+            in_flight = sum(1 for entry in self._entries.values() if not entry['finished_at'])
+            return {**self.stats, 'in_flight': in_flight, 'ready': len(self._entries) - in_flight}
+    
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+    
+    def _wait(self, url: str, name: str, timeout: Optional[float]) -> Any:
+        with self._lock:
+            entry = self._entries.get(extract_canonical_video_id(url))
+        return self._result(entry[name], timeout) if entry else None
+    
+    @staticmethod
+    def _result(future: Future, timeout: Optional[float]) -> Any:
+        try:
+            return future.result(timeout=timeout)
+        except (FutureTimeout, CancelledError):
+            return None
+    
+    def _run(self, entry: Dict[str, Any]) -> None:
+        """Worker body: metadata, then the transcript with its segments processed, checking for cancellation in between"""
+        info = entry['info']
+        transcript = entry['transcript']
+        info.set_running_or_notify_cancel()
+        transcript.set_running_or_notify_cancel()
+        
+        try:
+            info.set_result(self.youtube_handler.get_video_info(entry['url']))
+            
+            if entry['cancelled'].is_set():
+                transcript.set_result(None)
+                return
+            
+            transcript_data = self.youtube_handler.extract_transcript(entry['url'])
+            transcript.set_result(None if entry['cancelled'].is_set() else transcript_data)
+            if transcript_data is None:
+                with self._lock:
+                    self.stats['failed'] += 1
+        
+        except Exception as e:
+            logger.warning(f"Prefetch of {entry['video_id']} failed: {e}")
+            for future in (info, transcript):
+                if not future.done():
+                    future.set_result(None)
+            with self._lock:
+                self.stats['failed'] += 1
+        
+        finally:
+            with self._lock:
+                entry['finished_at'] = time.time()
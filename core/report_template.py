@@ -0,0 +1,161 @@
+# core/report_template.py
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Any, Tuple
+
+@dataclass(frozen=True)
+class Section:
+    """One report section: where its content comes from and how it is laid out.
+    
+    layout is one of paragraph, numbered, bullets, checklist, quotes, inline,
+    fields, timeline, qa or transcript. source names an analysis_results key,
+    or one of the computed sources 'video_info', 'sentiment' and 'statistics'.
+    """
+    title: str
+    layout: str
+    source: str
+    always: bool = False  # Rendered (with a placeholder) even when the source is missing
+
+@dataclass(frozen=True)
+class ReportTemplate:
+    """Ordered sections of one document kind, shared by every output format"""
+    name: str
+    title: str
+    sections: Tuple[Section, ...]
+    rule_width: int = 80
+
+SUMMARY_TEMPLATE = ReportTemplate(
+    name='summary',
+    title='Video Analysis Summary',
+    rule_width=60,
+    sections=(
+        Section('Main Summary', 'paragraph', 'main_summary', always=True),
+        Section('Key Takeaways', 'numbered', 'key_takeaways'),
+        Section('Important Quotes', 'quotes', 'important_quotes'),
+        Section('Action Items', 'bullets', 'action_items'),
+    )
+)
+
+FULL_REPORT_TEMPLATE = ReportTemplate(
+    name='full_report',
+    title='Comprehensive Video Analysis Report',
+    sections=(
+        Section('Video Information', 'fields', 'video_info', always=True),
+        Section('Executive Summary', 'paragraph', 'main_summary', always=True),
+        Section('Key Takeaways', 'numbered', 'key_takeaways'),
+        Section('Main Topics Discussed', 'inline', 'topics'),
+        Section('Sentiment Analysis', 'fields', 'sentiment'),
+        Section('Important Quotes', 'quotes', 'important_quotes'),
+        Section('Action Items', 'checklist', 'action_items'),
+        Section('Video Timeline', 'timeline', 'timeline'),
+        Section('Questions & Answers', 'qa', 'questions_and_answers'),
+        Section('Statistics', 'fields', 'statistics', always=True),
+        Section('Full Transcript', 'transcript', 'transcript', always=True),
+    )
+)
+
+TEMPLATES = {template.name: template for template in (SUMMARY_TEMPLATE, FULL_REPORT_TEMPLATE)}
+
+@dataclass(frozen=True)
+class CompiledSection:
+    """A section with its per-format headings prebuilt"""
+    section: Section
+    text_heading: str
+    markdown_heading: str
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """A template ready to render: headings, rules and format styles built once per process"""
+    template: ReportTemplate
+    sections: Tuple[CompiledSection, ...]
+    text_banner: str
+    markdown_title: str
+    
+    @property
+    def pdf(self) -> 'PdfStyles':
+        return pdf_styles()
+    
+    @property
+    def docx(self) -> Dict[str, str]:
+        return docx_style_ids()
+
+@lru_cache(maxsize=None)
+def compile_template(name: str) -> CompiledTemplate:
+    """Compile a template by name; cached, so each process compiles it once"""
+    template = TEMPLATES[name]
+    rule = "=" * template.rule_width
+    
+    return CompiledTemplate(
+        template=template,
+        sections=tuple(
+            CompiledSection(
+                section=section,
+                text_heading=f"{section.title.upper()}\n{'-' * 30}\n",
+                markdown_heading=f"## {section.title}\n\n"
+            )
+            for section in template.sections
+        ),
+        text_banner=f"{rule}\n{template.title.upper()}\n{rule}\n",
+        markdown_title=f"# {template.title}\n\n"
+    )
+
+@dataclass(frozen=True)
+class PdfStyles:
+    """reportlab paragraph and table styles shared by every PDF export"""
+    title: Any
+    heading: Any
+    body: Any
+    quote: Any
+    fields_table: Any
+
+@lru_cache(maxsize=1)
+def pdf_styles() -> PdfStyles:
+    """Paragraph and table styles, built on first use (reportlab must be installed)"""
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import TableStyle
+    from reportlab.lib import colors
+    
+    styles = getSampleStyleSheet()
+    
+    return PdfStyles(
+        title=ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=20,
+            spaceAfter=30,
+            alignment=1  # Center alignment
+        ),
+        heading=styles['Heading2'],
+        body=styles['Normal'],
+        quote=styles['BodyText'],
+        fields_table=TableStyle([
+            ('BACKGROUND', (0, 0), (1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ])
+    )
+
+@lru_cache(maxsize=1)
+def docx_style_ids() -> Dict[str, str]:
+    """Style IDs of the default Word template by layout role.
+    
+    python-docx resolves a style name by scanning the whole style table on every
+    paragraph; assigning the resolved ID directly skips that lookup.
+    """
+    from docx import Document
+    
+    styles = Document().styles
+    names = {
+        'title': 'Title',
+        'heading': 'Heading 1',
+        'numbered': 'List Number',
+        'bullets': 'List Bullet',
+        'quotes': 'Intense Quote',
+        'table': 'Table Grid'
+    }
+    return {role: styles[name].style_id for role, name in names.items()}
@@ -0,0 +1,476 @@
+# core/report_writer.py
+import json
+from datetime import datetime
+from importlib.util import find_spec
+from typing import Dict, Any, Iterator, List, Optional, Callable, BinaryIO, Tuple
+from xml.sax.saxutils import escape
+from core.report_template import compile_template, CompiledTemplate, Section
+from config.settings import EXPORT_CONFIG
+
+# PDF (reportlab) and Word (python-docx) support; both are imported on first render
+PDF_AVAILABLE = find_spec('reportlab') is not None
+DOCX_AVAILABLE = find_spec('docx') is not None
+
+class ExportTooLarge(Exception):
+    """Raised when a report grows past EXPORT_CONFIG['max_file_size'] while streaming"""
+
+class SizeLimitedWriter:
+    """File-like wrapper that counts bytes written and enforces a size limit"""
+    
+    def __init__(self, fileobj: BinaryIO, max_bytes: int):
+        self.fileobj = fileobj
+        self.max_bytes = max_bytes
+        self.written = 0
+    
+    def write(self, data) -> int:
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        
+        self.written += len(data)
+        if self.max_bytes and self.written > self.max_bytes:
+            raise ExportTooLarge(f"Report exceeds the {self.max_bytes:,} byte export limit")
+        
+        self.fileobj.write(data)
+        return len(data)
+    
+    def flush(self) -> None:
+        if hasattr(self.fileobj, 'flush'):
+            self.fileobj.flush()
+    
+    @property
+    def closed(self) -> bool:
+        # pyarrow checks this before writing to a Python file object
+        return getattr(self.fileobj, 'closed', False)
+
+class LazyFlowables(list):
+    """List facade over a flowable generator for reportlab's build loop.
+    
+    SimpleDocTemplate.build only ever inspects and deletes from the front of its
+    flowable list, so items are pulled from the generator a few at a time instead
+    of materializing the whole story up front.
+    """
+    
+    LOOKAHEAD = 8
+    
+    def __init__(self, flowables: Iterator[Any]):
+        super().__init__()
+        self._source = flowables
+        self._exhausted = False
+    
+    def _fill(self, count: int) -> None:
+        while not self._exhausted and list.__len__(self) < count:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._exhausted = True
+    
+    def __len__(self) -> int:
+        self._fill(self.LOOKAHEAD)
+        return list.__len__(self)
+    
+    def __bool__(self) -> bool:
+        return len(self) > 0
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            self._fill(index.stop if index.stop is not None and index.stop >= 0 else float('inf'))
+        else:
+            self._fill(index + 1 if index >= 0 else float('inf'))
+        return list.__getitem__(self, index)
+
+class StreamingReportWriter:
+    """Report writer that renders a compiled template and emits it incrementally.
+    
+    Sections, their order and their layouts come from core.report_template, so each
+    format only knows how to draw a layout. Text, Markdown and JSON are produced as
+    a stream of byte chunks; PDF is laid out from a lazy flowable stream. Nothing
+    proportional to the transcript is built besides the output itself, except for
+    Word documents, which python-docx can only save once complete.
+    """
+    
+    FORMATS = ('TEXT FILE', 'MARKDOWN', 'JSON', 'PDF', 'WORD DOCUMENT')
+    TRANSCRIPT_PAGE_CHARS = 4000
+    CHUNK_SIZE = 64 * 1024
+    
+    def __init__(self, analysis_results: Dict[str, Any], transcript_data: Dict, video_info: Dict,
+                 max_bytes: Optional[int] = None, include_transcript: bool = True,
+                 progress: Optional[Callable[[float], None]] = None, template: str = 'full_report'):
+        self.analysis_results = analysis_results or {}
+        self.transcript_data = transcript_data or {}
+        self.video_info = video_info or {}
+        self.max_bytes = max_bytes if max_bytes is not None else EXPORT_CONFIG['max_file_size']
+        self.include_transcript = include_transcript
+        self.progress = progress
+        self.template: CompiledTemplate = compile_template(template)
+        self.generated_at = datetime.now()
+        self._words = None
+    
+    def write(self, fileobj: BinaryIO, format_type: str) -> int:
+        """Stream the report into fileobj; returns the number of bytes written"""
+        format_type = format_type.upper()
+        out = SizeLimitedWriter(fileobj, self.max_bytes)
+        
+        if format_type == 'PDF':
+            if not PDF_AVAILABLE:
+                raise ValueError("PDF export requires reportlab")
+            self._write_pdf(out)
+        elif format_type == 'WORD DOCUMENT':
+            if not DOCX_AVAILABLE:
+                raise ValueError("Word export requires python-docx")
+            self._write_docx(out)
+        else:
+            for chunk in self.iter_chunks(format_type):
+                out.write(chunk)
+        
+        out.flush()
+        return out.written
+    
+    def iter_chunks(self, format_type: str) -> Iterator[bytes]:
+        """Byte chunks of a text, Markdown or JSON report"""
+        format_type = format_type.upper()
+        pieces = {
+            'TEXT FILE': self._iter_text,
+            'MARKDOWN': self._iter_markdown,
+            'JSON': self._iter_json
+        }.get(format_type)
+        
+        if pieces is None:
+            raise ValueError(f"Streaming is not supported for {format_type}")
+        
+        buffer = []
+        buffered = 0
+        written = 0
+        
+        for piece in pieces():
+            data = piece.encode('utf-8')
+            buffer.append(data)
+            buffered += len(data)
+            
+            if buffered >= self.CHUNK_SIZE:
+                written += buffered
+                self._check_size(written)
+                yield b''.join(buffer)
+                buffer, buffered = [], 0
+        
+        if buffer:
+            self._check_size(written + buffered)
+            yield b''.join(buffer)
+    
+    def transcript_pages(self) -> Iterator[Dict[str, Any]]:
+        """Transcript split into pages of about TRANSCRIPT_PAGE_CHARS, each tagged with its start time"""
+        segments = self.transcript_data.get('segments') or []
+        text = self.transcript_data.get('text', '')
+        total = max(1, len(text) // self.TRANSCRIPT_PAGE_CHARS + 1)
+        page_number = 0
+        
+        if segments:
+            parts, size, start = [], 0, None
+            for segment in segments:
+                if start is None:
+                    start = segment.get('timestamp', '')
+                parts.append(segment.get('text', ''))
+                size += len(parts[-1]) + 1
+                
+                if size >= self.TRANSCRIPT_PAGE_CHARS:
+                    page_number += 1
+                    yield self._page(page_number, total, start, ' '.join(parts))
+                    parts, size, start = [], 0, None
+            
+            if parts:
+                page_number += 1
+                yield self._page(page_number, total, start, ' '.join(parts))
+            return
+        
+        # Plain text transcripts are split on word boundaries
+        position = 0
+        while position < len(text):
+            end = text.rfind(' ', position, position + self.TRANSCRIPT_PAGE_CHARS)
+            if end <= position or position + self.TRANSCRIPT_PAGE_CHARS >= len(text):
+                end = min(len(text), position + self.TRANSCRIPT_PAGE_CHARS)
+            
+            page_number += 1
+            yield self._page(page_number, total, None, text[position:end].strip())
+            position = end
+    
+    def _page(self, number: int, total: int, start: Optional[str], text: str) -> Dict[str, Any]:
+        if self.progress:
+            self.progress(min(1.0, number / total))
+        return {'page': number, 'start': start, 'text': text}
+    
+    def _check_size(self, size: int) -> None:
+        if self.max_bytes and size > self.max_bytes:
+            raise ExportTooLarge(f"Report exceeds the {self.max_bytes:,} byte export limit")
+    
+    def _word_count(self) -> int:
+        """Word count of the transcript, without materializing a list of every word"""
+        if self._words is None:
+            text = self.transcript_data.get('text', '')
+            words = 0
+            previous_tail = ''
+            
+            for start in range(0, len(text), self.CHUNK_SIZE):
+                chunk = text[start:start + self.CHUNK_SIZE]
+                words += len(chunk.split())
+                # A word cut in two at the chunk boundary was counted twice
+                if previous_tail and not previous_tail.isspace() and not chunk[0].isspace():
+                    words -= 1
+                previous_tail = chunk[-1]
+            
+            self._words = words
+        return self._words
+    
+    def _sections(self) -> Iterator[Tuple[Any, Any]]:
+        """(compiled section, content) for every section that has something to show"""
+        for compiled in self.template.sections:
+            content = self._resolve(compiled.section)
+            if content is not None:
+                yield compiled, content
+    
+    def _resolve(self, section: Section) -> Any:
+        """Content of one section in the shape its layout expects, or None to skip it"""
+        analysis = self.analysis_results
+        
+        if section.source == 'video_info':
+            return [(label, str(self.video_info.get(key, 'Unknown')))
+                    for label, key in (('Title', 'title'), ('Channel', 'channel'), ('Duration', 'duration'), ('URL', 'url'))]
+        
+        if section.source == 'sentiment':
+            sentiment = analysis.get('sentiment_analysis')
+            if not sentiment:
+                return None
+            return [
+                ('Positive', f"{sentiment.get('positive', 0):.1%}"),
+                ('Neutral', f"{sentiment.get('neutral', 0):.1%}"),
+                ('Negative', f"{sentiment.get('negative', 0):.1%}"),
+                ('Overall Score', f"{sentiment.get('overall_score', 0):.2f}")
+            ]
+        
+        if section.source == 'statistics':
+            return [
+                ('Total Words', f"{self._word_count():,}"),
+                ('Total Segments', f"{self.transcript_data.get('total_segments', 0):,}"),
+                ('Estimated Reading Time', f"{self._word_count() // 200 + 1} minutes")
+            ]
+        
+        if section.source == 'transcript':
+            return self.transcript_pages() if self.include_transcript else None
+        
+        content = analysis.get(section.source)
+        if not content:
+            return 'Not available' if section.always and section.layout == 'paragraph' else None
+        return content
+    
+    def _iter_text(self) -> Iterator[str]:
+        """Plain text report, one line at a time"""
+        yield self.template.text_banner
+        yield f"Generated on: {self.generated_at.strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        
+        for compiled, content in self._sections():
+            yield compiled.text_heading
+            layout = compiled.section.layout
+            
+            if layout == 'paragraph':
+                yield f"{content}\n\n"
+            elif layout == 'inline':
+                yield ", ".join(content) + "\n\n"
+            elif layout == 'qa':
+                for qa in content:
+                    yield f"Q: {qa['question']}\nA: {qa['answer']}\n\n"
+            elif layout == 'transcript':
+                for page in content:
+                    prefix = f"[{page['start']}] " if page['start'] else ""
+                    yield f"{prefix}{page['text']}\n\n"
+            else:
+                for i, item in enumerate(content, 1):
+                    if layout == 'numbered':
+                        yield f"{i}. {item}\n"
+                    elif layout == 'quotes':
+                        yield f'• "{item}"\n'
+                    elif layout == 'fields':
+                        yield f"{item[0]}: {item[1]}\n"
+                    elif layout == 'timeline':
+                        yield f"{item['timestamp']}: {item['description']}\n"
+                    else:
+                        yield f"• {item}\n"
+                yield "\n"
+    
+    def _iter_markdown(self) -> Iterator[str]:
+        """Markdown report, one block at a time"""
+        yield self.template.markdown_title
+        yield f"*Generated on {self.generated_at.strftime('%Y-%m-%d %H:%M:%S')}*\n\n"
+        
+        for compiled, content in self._sections():
+            yield compiled.markdown_heading
+            layout = compiled.section.layout
+            
+            if layout == 'paragraph':
+                yield f"{content}\n\n"
+            elif layout == 'inline':
+                yield ", ".join(content) + "\n\n"
+            elif layout == 'fields':
+                yield "| Field | Value |\n|---|---|\n"
+                for label, value in content:
+                    value = value.replace('|', '\\|')
+                    yield f"| {label} | {value} |\n"
+                yield "\n"
+            elif layout == 'quotes':
+                for quote in content:
+                    yield f"> {quote}\n\n"
+            elif layout == 'qa':
+                for qa in content:
+                    yield f"**Q: {qa['question']}**\n\n{qa['answer']}\n\n"
+            elif layout == 'transcript':
+                for page in content:
+                    prefix = f"**[{page['start']}]** " if page['start'] else ""
+                    yield f"{prefix}{page['text']}\n\n"
+            else:
+                for i, item in enumerate(content, 1):
+                    if layout == 'numbered':
+                        yield f"{i}. {item}\n"
+                    elif layout == 'checklist':
+                        yield f"- [ ] {item}\n"
+                    elif layout == 'timeline':
+                        yield f"- **{item['timestamp']}** {item['description']}\n"
+                    else:
+                        yield f"- {item}\n"
+                yield "\n"
+    
+    def _iter_json(self) -> Iterator[str]:
+        """JSON report; the transcript pages array is written element by element"""
+        head = {
+            "export_info": {
+                "type": self.template.template.name,
+                "generated_at": self.generated_at.isoformat(),
+                "version": "1.0"
+            },
+            "video_info": self.video_info,
+            "analysis_results": self.analysis_results,
+            "transcript_stats": {
+                "total_words": self._word_count(),
+                "total_segments": self.transcript_data.get('total_segments', 0),
+                "estimated_reading_time_minutes": self._word_count() // 200 + 1,
+                "language_codes": self.transcript_data.get('language_codes', [])
+            }
+        }
+        
+        document = json.dumps(head, indent=2, ensure_ascii=False)
+        if not self.include_transcript:
+            yield document
+            return
+        
+        # Reopen the top-level object to append the transcript array
+        yield document[:-2] + ',\n  "transcript_pages": ['
+        for i, page in enumerate(self.transcript_pages()):
+            yield ("," if i else "") + "\n    " + json.dumps(page, ensure_ascii=False)
+        yield "\n  ]\n}"
+    
+    def _write_pdf(self, out: SizeLimitedWriter) -> None:
+        """Lay the PDF out from a lazy flowable stream"""
+        from reportlab.lib.pagesizes import A4
+        from reportlab.platypus import SimpleDocTemplate
+        
+        doc = SimpleDocTemplate(out, pagesize=A4)
+        doc.build(LazyFlowables(self._iter_pdf_flowables()))
+    
+    def _iter_pdf_flowables(self) -> Iterator[Any]:
+        """PDF content, one flowable at a time"""
+        from reportlab.platypus import Paragraph, Spacer, Table
+        from reportlab.lib.units import inch
+        
+        styles = self.template.pdf
+        
+        yield Paragraph(escape(self.template.template.title), styles.title)
+        yield Paragraph(f"Generated on: {self.generated_at.strftime('%Y-%m-%d %H:%M:%S')}", styles.body)
+        yield Spacer(1, 20)
+        
+        for compiled, content in self._sections():
+            layout = compiled.section.layout
+            
+            if layout == 'fields':
+                rows = [[compiled.section.title, '']] + [[label, value] for label, value in content]
+                table = Table(rows, colWidths=[2*inch, 4*inch])
+                table.setStyle(styles.fields_table)
+                yield table
+                yield Spacer(1, 20)
+                continue
+            
+            yield Paragraph(escape(compiled.section.title), styles.heading)
+            
+            if layout == 'paragraph':
+                yield Paragraph(escape(content), styles.body)
+            elif layout == 'inline':
+                yield Paragraph(escape(", ".join(content)), styles.body)
+            elif layout == 'qa':
+                for qa in content:
+                    yield Paragraph(f"<b>Q: {escape(qa['question'])}</b>", styles.body)
+                    yield Paragraph(escape(qa['answer']), styles.body)
+                    yield Spacer(1, 6)
+            elif layout == 'transcript':
+                for page in content:
+                    prefix = f"<b>[{escape(page['start'])}]</b> " if page['start'] else ""
+                    yield Paragraph(prefix + escape(page['text']), styles.body)
+                    yield Spacer(1, 8)
+            else:
+                for i, item in enumerate(content, 1):
+                    if layout == 'numbered':
+                        yield Paragraph(f"{i}. {escape(item)}", styles.body)
+                    elif layout == 'quotes':
+                        yield Paragraph(f'"{escape(item)}"', styles.quote)
+                    elif layout == 'timeline':
+                        yield Paragraph(f"<b>{escape(item['timestamp'])}</b> {escape(item['description'])}", styles.body)
+                    else:
+                        yield Paragraph(f"• {escape(item)}", styles.body)
+            
+            yield Spacer(1, 15)
+    
+    def _write_docx(self, out: SizeLimitedWriter) -> None:
+        """Build the Word document; style IDs are assigned directly instead of by name"""
+        from docx import Document
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+        
+        style_ids = self.template.docx
+        doc = Document()
+        
+        def add(text: str, role: Optional[str] = None):
+            paragraph = doc.add_paragraph(text)
+            if role:
+                paragraph._p.style = style_ids[role]
+            return paragraph
+        
+        title = add(self.template.template.title, 'title')
+        title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        add(f"Generated on: {self.generated_at.strftime('%Y-%m-%d %H:%M:%S')}")
+        
+        for compiled, content in self._sections():
+            add(compiled.section.title, 'heading')
+            layout = compiled.section.layout
+            
+            if layout == 'paragraph':
+                add(content)
+            elif layout == 'inline':
+                add(", ".join(content))
+            elif layout == 'fields':
+                table = doc.add_table(rows=len(content), cols=2)
+                table._tbl.tblPr.style = style_ids['table']
+                for i, (label, value) in enumerate(content):
+                    table.cell(i, 0).text = label
+                    table.cell(i, 1).text = value
+            elif layout == 'qa':
+                for qa in content:
+                    add('').add_run(f"Q: {qa['question']}").bold = True
+                    add(qa['answer'])
+            elif layout == 'transcript':
+                for page in content:
+                    add(f"[{page['start']}] {page['text']}" if page['start'] else page['text'])
+            else:
+                for item in content:
+                    if layout == 'numbered':
+                        add(item, 'numbered')
+                    elif layout == 'quotes':
+                        add(f'"{item}"', 'quotes')
+                    elif layout == 'timeline':
+                        add(f"{item['timestamp']}: {item['description']}", 'bullets')
+                    else:
+                        add(item, 'bullets')
+        
+        doc.save(out)
@@ -0,0 +1,278 @@
+# core/retention.py
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterable, Iterator
+from utils.file_ops import FSYNC_POLICIES, fsync_directory
+from config.settings import SESSION_CONFIG
+
+logger = logging.getLogger(__name__)
+
+class ArchivePack:
+    """Gzip-compressed NDJSON pack of full sessions, published atomically on close.
+    
+    Payloads shared between sessions (same transcript or analysis) are written once
+    as {"type": "payload"} records and referenced from the session records by digest.
+    Closing syncs the pack to disk per fsync_policy before publishing it, so the
+    sessions it holds can be deleted once close() returns.
+    """
+    
+    PAYLOAD_FIELDS = ('transcript', 'analysis')
+    
+    def __init__(self, archive_dir: Path, fsync_policy: str = 'file'):
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy '{fsync_policy}'. Use one of: {', '.join(FSYNC_POLICIES)}")
+        
+        self.archive_dir = Path(archive_dir)
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self.fsync_policy = fsync_policy
+        self.path = self.archive_dir / f"pack-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}.ndjson.gz"
+        self._temp_path = self.path.with_name(f".{self.path.name}.tmp")
+        self._raw = None
+        self._file = None
+        self._written_payloads = set()
+        self.session_count = 0
+    
+    @classmethod
+    def read(cls, path: Path) -> Iterator[Dict[str, Any]]:
+        """Yield the full sessions stored in a published pack, payloads resolved"""
+        payloads = {}
+        
+        with gzip.open(path, 'rb') as f:
+            for line in f:
+                record = json.loads(line)
+                if record.get('type') == 'payload':
+                    payloads[record['digest']] = record['data']
+                    continue
+                
+                session_data = {k: v for k, v in record.items() if k != 'type'}
+                for field in cls.PAYLOAD_FIELDS:
+                    if isinstance(session_data.get(field), dict) and '$payload' in session_data[field]:
+                        session_data[field] = payloads[session_data[field]['$payload']]
+                yield session_data
+    
+    def write(self, session_data: Dict[str, Any]) -> None:
+        """Append one session to the pack"""
+        if self._file is None:
+            self._raw = open(self._temp_path, 'wb')
+            self._file = gzip.GzipFile(fileobj=self._raw, mode='wb', compresslevel=9)
+        
+        record = {'type': 'session'}
+        for field, value in session_data.items():
+            if field in self.PAYLOAD_FIELDS and value is not None:
+                record[field] = {'$payload': self._write_payload(value)}
+            else:
+                record[field] = value
+        
+        self._write_line(record)
+        self.session_count += 1
+    
+    def _write_payload(self, payload: Any) -> str:
+        """Write a payload record once per pack; returns its digest"""
+        data = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+        digest = hashlib.sha256(data.encode('utf-8')).hexdigest()
+        
+        if digest not in self._written_payloads:
+            self._write_line({'type': 'payload', 'digest': digest, 'data': payload})
+            self._written_payloads.add(digest)
+        
+        return digest
+    
+    def _write_line(self, record: Dict[str, Any]) -> None:
+        """Write one NDJSON record"""
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+        self._file.write(line.encode('utf-8') + b'\n')
+    
+    def close(self) -> int:
+        """Finish the pack; returns its size in bytes (0 if nothing was archived)"""
+        if self._file is None:
+            return 0
+        
+        self._file.close()
+        self._raw.flush()
+        if self.fsync_policy != 'never':
+            os.fsync(self._raw.fileno())
+        self._raw.close()
+        self._file = self._raw = None
+        
+        os.replace(self._temp_path, self.path)
+        if self.fsync_policy == 'always':
+            fsync_directory(self.archive_dir)
+        return self.path.stat().st_size
+    
+    def discard(self) -> None:
+        """Abandon a pack that was never published; none of its sessions may have been removed"""
+        if self._file is not None:
+            self._file.close()
+            self._raw.close()
+            self._file = self._raw = None
+        self._temp_path.unlink(missing_ok=True)
+
+class RetentionService:
+    """Background enforcement of session age, count and storage quotas.
+    
+    Candidates are chosen from the session index (no directory scans) and evicted
+    in small locked batches so interactive writers are never blocked for long.
+    When backups are on, each batch is written to its own compressed archive pack,
+    which is published before any of the batch's sessions are deleted.
+    """
+    
+    REPORT_FILENAME = "retention_reports.ndjson"
+    
+    def __init__(self, session_manager, max_age_days: Optional[int] = None, max_sessions: Optional[int] = None,
+                 max_total_bytes: Optional[int] = None, archive: Optional[bool] = None,
+                 batch_size: Optional[int] = None, interval_seconds: Optional[int] = None):
+        self.session_manager = session_manager
+        self.max_age_days = max_age_days if max_age_days is not None else SESSION_CONFIG['session_timeout_days']
+        self.max_sessions = max_sessions if max_sessions is not None else SESSION_CONFIG['max_sessions_per_user']
+        self.max_total_bytes = max_total_bytes if max_total_bytes is not None else SESSION_CONFIG['max_total_bytes']
+        self.archive = archive if archive is not None else SESSION_CONFIG['backup_sessions']
+        self.batch_size = batch_size or SESSION_CONFIG['retention_batch_size']
+        self.interval_seconds = interval_seconds or SESSION_CONFIG['retention_interval']
+        
+        self.archive_dir = session_manager.sessions_dir / "archive"
+        self.last_report: Optional[Dict[str, Any]] = None
+        
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> None:
+        """Start the background retention loop (idempotent)"""
+        if self._thread and self._thread.is_alive():
+            return
+        
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run_loop, name="session-retention", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the background loop"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def run_once(self, dry_run: bool = False) -> Dict[str, Any]:
+        """Enforce all quotas once and return a report of what was reclaimed"""
+        started = time.perf_counter()
+        plan = self.plan()
+        
+        report = {
+            'run_at': datetime.now().isoformat(),
+            'dry_run': dry_run,
+            'planned': {reason: len(session_ids) for reason, session_ids in plan.items()},
+            'sessions_removed': 0,
+            'sessions_archived': 0,
+            'reclaimed_bytes': 0,
+            'archive_bytes': 0,
+            'archive_packs': []
+        }
+        
+        candidates = [session_id for session_ids in plan.values() for session_id in session_ids]
+        
+        if candidates and not dry_run:
+            for i in range(0, len(candidates), self.batch_size):
+                if self._stop_event.is_set():
+                    break
+                
+                batch = candidates[i:i + self.batch_size]
+                removed, freed = self.session_manager.evict_sessions(
+                    batch, archive=(lambda sessions: self._archive_batch(sessions, report)) if self.archive else None
+                )
+                report['sessions_removed'] += removed
+                report['reclaimed_bytes'] += freed
+        
+        report['duration_seconds'] = round(time.perf_counter() - started, 3)
+        self.last_report = report
+        
+        if not dry_run and report['sessions_removed']:
+            self._append_report(report)
+        
+        return report
+    
+    def plan(self) -> Dict[str, List[str]]:
+        """Choose sessions to evict, coldest first, grouped by the quota they violate"""
+        self.session_manager.session_index.refresh()
+        entries = self.session_manager.session_index.entries()
+        
+        # Coldest (least recently accessed) first
+        ordered = sorted(
+            entries.items(),
+            key=lambda item: item[1].get('last_accessed') or item[1].get('created_at') or ''
+        )
+        
+        plan = {'age': [], 'count': [], 'bytes': []}
+        selected = set()
+        
+        # Age quota
+        cutoff = (datetime.now() - timedelta(days=self.max_age_days)).isoformat()
+        for session_id, entry in ordered:
+            if (entry.get('last_accessed') or entry.get('created_at') or '') < cutoff:
+                plan['age'].append(session_id)
+                selected.add(session_id)
+        
+        # Count quota
+        remaining = [item for item in ordered if item[0] not in selected]
+        overflow = len(remaining) - self.max_sessions
+        if overflow > 0:
+            for session_id, _ in remaining[:overflow]:
+                plan['count'].append(session_id)
+                selected.add(session_id)
+        
+        # Storage quota - manifest sizes are exact; blob savings are estimated at the
+        # average blob bytes per session since shared blobs only free on the last reference
+        usage = self.session_manager.get_storage_usage()
+        if self.max_total_bytes and usage['bytes'] > self.max_total_bytes and usage['sessions']:
+            per_session = usage['bytes'] / usage['sessions']
+            excess = usage['bytes'] - self.max_total_bytes - per_session * len(selected)
+            
+            for session_id, _ in remaining:
+                if excess <= 0:
+                    break
+                if session_id in selected:
+                    continue
+                plan['bytes'].append(session_id)
+                selected.add(session_id)
+                excess -= per_session
+        
+        return plan
+    
+    def _archive_batch(self, sessions: Iterable[Dict[str, Any]], report: Dict[str, Any]) -> None:
+        """Write one eviction batch to a new pack and publish it; raising leaves the batch in place"""
+        pack = ArchivePack(self.archive_dir, fsync_policy=self.session_manager.fsync_policy)
+        
+        try:
+            for session_data in sessions:
+                pack.write(session_data)
+            report['archive_bytes'] += pack.close()
+        except BaseException:
+            pack.discard()
+            raise
+        
+        if pack.session_count:
+            report['sessions_archived'] += pack.session_count
+            report['archive_packs'].append(pack.path.name)
+    
+    def _run_loop(self) -> None:
+        """Background loop; waits interval_seconds between runs"""
+        while not self._stop_event.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.warning(f"Session retention run failed: {e}")
+            
+            self._stop_event.wait(self.interval_seconds)
+    
+    def _append_report(self, report: Dict[str, Any]) -> None:
+        """Keep a per-run history of reclaimed space next to the archive packs"""
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        report_file = self.archive_dir / self.REPORT_FILENAME
+        
+        with open(report_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(report) + '\n')
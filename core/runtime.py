@@ -0,0 +1,67 @@
+# core/runtime.py
+"""Host services for the core layer: user-facing messages and secrets.
+
+Core modules never import a UI framework. They report through a Reporter and
+read credentials through get_secret; the Streamlit app installs adapters for
+both (components/streamlit_adapter.py), while CLI, worker and API processes
+keep the defaults, which log messages and read secrets from the environment.
+"""
+import logging
+import os
+import time
+from typing import Any, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+class Reporter:
+    """Receives user-facing messages from core modules; the default logs them"""
+    
+    def error(self, message: str) -> None:
+        logger.error(message)
+    
+    def warning(self, message: str) -> None:
+        logger.warning(message)
+    
+    def info(self, message: str) -> None:
+        logger.info(message)
+    
+    def wait(self, seconds: int, message: str, cancel_token=None) -> None:
+        """Block for a retry delay; UIs can show a countdown while waiting.
+        
+        A CancellationToken cuts the wait short as soon as it is cancelled.
+        """
+        logger.info(message)
+        if cancel_token is not None:
+            cancel_token.wait(seconds)
+        else:
+            time.sleep(seconds)
+
+_reporter: Reporter = Reporter()
+_secrets: Optional[Mapping[str, Any]] = None
+
+def get_reporter() -> Reporter:
+    """The process-wide reporter used by core objects created without one"""
+    return _reporter
+
+def set_reporter(reporter: Optional[Reporter]) -> None:
+    """Install a process-wide reporter; None restores the logging default"""
+    global _reporter
+    _reporter = reporter or Reporter()
+
+def set_secrets(secrets: Optional[Mapping[str, Any]]) -> None:
+    """Install a secrets mapping consulted before environment variables"""
+    global _secrets
+    _secrets = secrets
+
+def get_secret(name: str, default: str = '') -> str:
+    """A secret from the installed mapping, falling back to the environment"""
+    if _secrets is not None:
+        try:
+            value = _secrets.get(name)
+        except Exception as e:
+            # Streamlit raises when no secrets.toml exists at all
+            logger.debug(f"Secrets lookup for {name} failed: {e}")
+            value = None
+        if value:
+            return value
+    return os.getenv(name, default)
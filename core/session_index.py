@@ -0,0 +1,313 @@
+# core/session_index.py
+import bisect
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Tuple
+from utils.file_ops import atomic_write_json
+from core.runtime import Reporter, get_reporter
+
+class SessionIndex:
+    """Persistent hash index over stored sessions, keyed by session ID and video ID.
+    
+    Summary statistics are kept as counters next to the entries and adjusted on
+    every add/remove, so stats queries never need to scan the sessions.
+    
+    Reads only move last_accessed, so they are appended to an access journal
+    instead of rewriting the index; the journal is replayed on load and folded
+    into the index whenever it is written or the journal grows too large.
+    """
+    
+    INDEX_FILENAME = "index.json"
+    ACCESS_LOG_FILENAME = "access.log"
+    ACCESS_LOG_COMPACT_BYTES = 256 * 1024
+    VERSION = 3
+    ROLLUP_PERIODS = ('daily', 'weekly')
+    
+    def __init__(self, sessions_dir: Path, fsync_policy: str = 'file', reporter: Optional[Reporter] = None):
+        self.index_file = Path(sessions_dir) / self.INDEX_FILENAME
+        self.access_log = Path(sessions_dir) / self.ACCESS_LOG_FILENAME
+        self.reporter = reporter or get_reporter()
+        self.fsync_policy = fsync_policy
+        self._stamp = None
+        self._access_offset = 0
+        
+        # A missing, corrupt or outdated index has to be rebuilt from the session files
+        data = self._load()
+        self.needs_rebuild = data is None
+        self._data = data or self._empty()
+        self._replay_access_log()
+        
+        # (created_at, session_id) keys in ascending order; built lazily, then kept
+        # in step with add/remove and dropped only when the index is reloaded
+        self._ordering: Optional[List[Tuple[str, str]]] = None
+    
+    def refresh(self) -> None:
+        """Reload the index if another process has changed it"""
+        if self._file_stamp() != self._stamp:
+            data = self._load()
+            if data is not None:
+                self._data = data
+                self._ordering = None
+                self._access_offset = 0
+        self._replay_access_log()
+    
+    def record_access(self, session_id: str, accessed_at: str) -> None:
+        """Note a read of a session by appending to the access journal (store lock held)"""
+        entry = self._data['sessions'].get(session_id)
+        if entry is None:
+            return
+        
+        entry['last_accessed'] = max(entry.get('last_accessed') or '', accessed_at)
+        
+        line = f"{session_id}\t{accessed_at}\n".encode('utf-8')
+        with open(self.access_log, 'ab') as f:
+            f.write(line)
+        self._access_offset += len(line)
+        
+        if self._access_offset > self.ACCESS_LOG_COMPACT_BYTES:
+            self._save()
+    
+    def add(self, session_id: str, entry: Dict[str, Any]) -> None:
+        """Insert or replace the metadata entry for a session"""
+        self._unlink_video(session_id)
+        
+        previous = self._data['sessions'].get(session_id)
+        if previous:
+            self._apply_aggregates(previous, -1)
+        
+        self._data['sessions'][session_id] = entry
+        self._apply_aggregates(entry, 1)
+        self._reorder(previous, entry)
+        
+        video_id = entry.get('video_id')
+        if video_id:
+            self._data['by_video'].setdefault(video_id, []).append(session_id)
+        
+        self._save()
+    
+    def remove(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Remove a session from the index; returns its entry if it was present"""
+        self._unlink_video(session_id)
+        entry = self._data['sessions'].pop(session_id, None)
+        
+        if entry is not None:
+            self._apply_aggregates(entry, -1)
+            self._reorder(entry, None)
+            self._save()
+        
+        return entry
+    
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Metadata entry for a session"""
+        return self._data['sessions'].get(session_id)
+    
+    def sessions_for_video(self, video_id: str) -> List[str]:
+        """Session IDs for a video, most recently created first"""
+        session_ids = self._data['by_video'].get(video_id, [])
+        return sorted(
+            session_ids,
+            key=lambda sid: self._data['sessions'].get(sid, {}).get('created_at') or '',
+            reverse=True
+        )
+    
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """All indexed session entries by session ID"""
+        return self._data['sessions']
+    
+    def iter_newest_first(self, before: Optional[Tuple[str, str]] = None,
+                          not_before: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield entries by (created_at, session_id) descending.
+        
+        before is an exclusive sort-key position (keyset cursor); iteration stops once
+        created_at drops below not_before.
+        """
+        position = tuple(before) if before else None
+        
+        # Each step re-seeks from the last key yielded, so entries added or removed
+        # while a caller is iterating never shift it onto a repeated or skipped entry
+        while True:
+            ordering = self._sorted_keys()
+            i = bisect.bisect_left(ordering, position) if position else len(ordering)
+            if i == 0:
+                return
+            
+            position = ordering[i - 1]
+            created_at, session_id = position
+            if not_before and created_at < not_before:
+                return
+            
+            entry = self._data['sessions'].get(session_id)
+            if entry is not None:
+                yield entry
+    
+    @staticmethod
+    def sort_key(entry: Dict[str, Any]) -> Tuple[str, str]:
+        """Position of an entry in the history ordering"""
+        return (entry.get('created_at') or '', entry.get('session_id') or '')
+    
+    def get_aggregates(self) -> Dict[str, Any]:
+        """Incrementally maintained counters (totals, summary types, channels, rollups)"""
+        return self._data['aggregates']
+    
+    def video_count(self) -> int:
+        """Number of distinct videos with at least one session"""
+        return len(self._data['by_video'])
+    
+    def rebuild(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """Replace the index contents; entries must carry a session_id"""
+        self._data = self._empty()
+        self._ordering = None
+        self._access_offset = 0
+        
+        for entry in entries:
+            session_id = entry.get('session_id')
+            if not session_id:
+                continue
+            
+            self._data['sessions'][session_id] = entry
+            self._apply_aggregates(entry, 1)
+            if entry.get('video_id'):
+                self._data['by_video'].setdefault(entry['video_id'], []).append(session_id)
+        
+        self._save()
+        return len(self._data['sessions'])
+    
+    def _sorted_keys(self) -> List[Tuple[str, str]]:
+        """Sorted history ordering, built on first use after a (re)load"""
+        if self._ordering is None:
+            self._ordering = sorted(self.sort_key(entry) for entry in self._data['sessions'].values())
+        return self._ordering
+    
+    def _reorder(self, old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> None:
+        """Move one entry's key in the ordering instead of re-sorting all of them"""
+        if self._ordering is None:
+            return
+        
+        if old is not None:
+            key = self.sort_key(old)
+            i = bisect.bisect_left(self._ordering, key)
+            if i < len(self._ordering) and self._ordering[i] == key:
+                del self._ordering[i]
+        if new is not None:
+            bisect.insort(self._ordering, self.sort_key(new))
+    
+    def _unlink_video(self, session_id: str) -> None:
+        """Drop a session from the video map"""
+        entry = self._data['sessions'].get(session_id)
+        if not entry or not entry.get('video_id'):
+            return
+        
+        video_id = entry['video_id']
+        session_ids = [sid for sid in self._data['by_video'].get(video_id, []) if sid != session_id]
+        
+        if session_ids:
+            self._data['by_video'][video_id] = session_ids
+        else:
+            self._data['by_video'].pop(video_id, None)
+    
+    def _apply_aggregates(self, entry: Dict[str, Any], delta: int) -> None:
+        """Add (delta=1) or subtract (delta=-1) an entry's contribution to the counters"""
+        aggregates = self._data['aggregates']
+        aggregates['total_sessions'] += delta
+        aggregates['stored_bytes'] += entry.get('stored_bytes', 0) * delta
+        
+        self._bump(aggregates['summary_types'], entry.get('summary_type') or 'Unknown', delta)
+        self._bump(aggregates['channels'], entry.get('channel') or 'Unknown', delta)
+        
+        created_at = entry.get('created_at')
+        if not created_at:
+            return
+        
+        try:
+            created_date = datetime.fromisoformat(created_at).date()
+        except ValueError:
+            return
+        
+        iso_year, iso_week, _ = created_date.isocalendar()
+        self._bump(aggregates['daily'], created_date.isoformat(), delta)
+        self._bump(aggregates['weekly'], f"{iso_year}-W{iso_week:02d}", delta)
+    
+    @staticmethod
+    def _bump(counter: Dict[str, int], key: str, delta: int) -> None:
+        """Adjust a counter, dropping keys that reach zero"""
+        value = counter.get(key, 0) + delta
+        
+        if value > 0:
+            counter[key] = value
+        else:
+            counter.pop(key, None)
+    
+    def _empty(self) -> Dict[str, Any]:
+        """Empty index structure"""
+        return {
+            'version': self.VERSION,
+            'sessions': {},
+            'by_video': {},
+            'aggregates': {
+                'total_sessions': 0,
+                'stored_bytes': 0,
+                'summary_types': {},
+                'channels': {},
+                'daily': {},
+                'weekly': {}
+            }
+        }
+    
+    def _load(self) -> Optional[Dict[str, Any]]:
+        """Load the index from disk"""
+        try:
+            self._stamp = self._file_stamp()
+            if self._stamp is None:
+                return None
+            
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            
+            if data.get('version') != self.VERSION:
+                return None
+            
+            return data
+        
+        except Exception as e:
+            self.reporter.warning(f"Error loading session index: {e}")
+            return None
+    
+    def _save(self) -> None:
+        """Persist the index, folding in and then truncating the access journal"""
+        self._replay_access_log()
+        atomic_write_json(self.index_file, self._data, self.fsync_policy, indent=2)
+        self._stamp = self._file_stamp()
+        
+        if self._access_offset:
+            self.access_log.write_bytes(b'')
+            self._access_offset = 0
+    
+    def _replay_access_log(self) -> None:
+        """Apply journal lines appended since the last replay to the entries"""
+        try:
+            if self.access_log.stat().st_size <= self._access_offset:
+                return
+            with open(self.access_log, 'rb') as f:
+                f.seek(self._access_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        
+        # A torn final line (a crashed writer) is left for the next replay
+        complete = data[:data.rfind(b'\n') + 1]
+        self._access_offset += len(complete)
+        
+        for line in complete.decode('utf-8', errors='replace').splitlines():
+            session_id, _, accessed_at = line.partition('\t')
+            entry = self._data['sessions'].get(session_id)
+            if entry is not None and accessed_at > (entry.get('last_accessed') or ''):
+                entry['last_accessed'] = accessed_at
+    
+    def _file_stamp(self) -> Optional[tuple]:
+        """Change marker for the index file"""
+        try:
+            stat = self.index_file.stat()
+            return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            return None
@@ -1,159 +1,278 @@
 # core/session_manager.py
+import base64
 import json
 import os
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Any, Optional, Callable, Iterator, Tuple, MutableMapping, Sequence
 from pathlib import Path
-import streamlit as st
 import hashlib
+from core.blob_store import BlobStore
+from core.object_store import ObjectStore, get_object_store
+from core.session_index import SessionIndex
+from core.runtime import Reporter, get_reporter
+from utils.validators import extract_canonical_video_id
+from utils.file_ops import FileLock, atomic_write_bytes, atomic_write_json, atomic_write_stream, iter_ndjson
+from config.settings import SESSION_CONFIG
 
 class SessionManager:
     """Manage user sessions and analysis history"""
     
-    def __init__(self):
-        self.sessions_dir = Path("data/sessions")
+    # Large payloads stored as content-addressed blobs instead of inline
+    PAYLOAD_FIELDS = ('transcript', 'analysis')
+    # Everything the results view reads; the transcript viewer pages through the timed segments
+    DISPLAY_FIELDS = (
+        'video_info', 'analysis', 'transcript.text', 'transcript.segments', 'transcript.language_codes',
+        'transcript.total_segments', 'transcript.total_duration'
+    )
+    PREFERENCES_FILENAME = "user_preferences.json"
+    METADATA_FILENAMES = (PREFERENCES_FILENAME, SessionIndex.INDEX_FILENAME)
+    LOCK_FILENAME = ".store.lock"
+    
+    def __init__(self, sessions_dir: Optional[Path] = None, state: Optional[MutableMapping[str, Any]] = None,
+                 reporter: Optional[Reporter] = None):
+        self.sessions_dir = Path(sessions_dir or "data/sessions")
+        self.reporter = reporter or get_reporter()
+        # Per-user history and preferences: st.session_state in the app, a plain dict elsewhere
+        self.state = state if state is not None else {}
         self.sessions_dir.mkdir(parents=True, exist_ok=True)
+        self.fsync_policy = SESSION_CONFIG['fsync_policy']
+        
+        # Writers from every server process serialize on one lock file
+        self._lock = FileLock(self.sessions_dir / self.LOCK_FILENAME, timeout=SESSION_CONFIG['lock_timeout'])
+        self.blob_store = BlobStore(
+            self.sessions_dir / "blobs",
+            codec=SESSION_CONFIG['blob_codec'],
+            fsync_policy=self.fsync_policy,
+            reporter=self.reporter
+        )
+        self.session_index = SessionIndex(self.sessions_dir, fsync_policy=self.fsync_policy, reporter=self.reporter)
+        
+        if self.blob_store.needs_rebuild:
+            self.rebuild_blob_refs()
+        if self.session_index.needs_rebuild:
+            self.rebuild_index()
         
         # Initialize session state
-        if 'session_history' not in st.session_state:
-            st.session_state.session_history = []
-        if 'current_session' not in st.session_state:
-            st.session_state.current_session = None
-        if 'user_preferences' not in st.session_state:
-            st.session_state.user_preferences = self._load_user_preferences()
+        if 'session_history' not in self.state:
+            self.state['session_history'] = []
+        if 'current_session_id' not in self.state:
+            self.state['current_session_id'] = None
+        if 'user_preferences' not in self.state:
+            self.state['user_preferences'] = self._load_user_preferences()
     
     def save_session(self, session_data: Dict[str, Any]) -> str:
         """Save a session to persistent storage"""
         try:
-            # Generate session ID
-            session_id = self._generate_session_id(session_data)
+            # Keep the ID of a session that is being re-saved
+            session_id = session_data.get('session_id') or self._generate_session_id(session_data)
             
             # Add session metadata
             session_data['session_id'] = session_id
-            session_data['created_at'] = datetime.now().isoformat()
+            session_data.setdefault('created_at', datetime.now().isoformat())
             session_data['last_accessed'] = datetime.now().isoformat()
             
-            # Save to file
+            # Store payloads as blobs before dropping references held by the old version
             session_file = self.sessions_dir / f"{session_id}.json"
-            with open(session_file, 'w', encoding='utf-8') as f:
-                json.dump(session_data, f, indent=2, ensure_ascii=False)
             
-            # Update session state
-            st.session_state.current_session = session_data
+            with self._store_lock():
+                previous = self._read_session_file(session_file) if session_file.exists() else None
+                
+                stored_bytes = self._write_session_file(session_file, self._store_payloads(session_data))
+                
+                if previous:
+                    self._release_payloads(previous)
+                
+                self.session_index.add(session_id, self._index_entry(session_data, stored_bytes))
+            
+            # Per-user state keeps the ID only; payloads are shared through the object store
+            self.state['current_session_id'] = session_id
             self._add_to_history(session_data)
             
             return session_id
-            
+        
         except Exception as e:
-            st.error(f"Error saving session: {e}")
+            self.reporter.error(f"Error saving session: {e}")
             return None
     
-    def load_session(self, session_id: str) -> Optional[Dict[str, Any]]:
-        """Load a session from persistent storage"""
+    def load_session(self, session_id: str, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """Load a session from persistent storage.
+        
+        fields selects dotted paths to load instead of the whole session, e.g.
+        ['analysis.main_summary', 'video_info']; only the payload sections those
+        paths touch are read from disk. Partial results are not made the current session.
+        """
         try:
-            session_file = self.sessions_dir / f"{session_id}.json"
-            
-            if not session_file.exists():
+            stored_data = self._touch_session(session_id)
+            if stored_data is None:
                 return None
             
-            with open(session_file, 'r', encoding='utf-8') as f:
-                session_data = json.load(f)
+            if fields is not None:
+                self._add_to_history(stored_data)
+                return self._load_fields(stored_data, fields)
             
-            # Update last accessed
-            session_data['last_accessed'] = datetime.now().isoformat()
-            self.save_session(session_data)
+            session_data = self._load_payloads(stored_data)
+            
+            self.state['current_session_id'] = session_id
+            self._add_to_history(session_data)
             
             return session_data
+        
+        except Exception as e:
+            self.reporter.error(f"Error loading session: {e}")
+            return None
+    
+    def open_shared(self, session_id: str, fields: Sequence[str] = DISPLAY_FIELDS,
+                    object_store: Optional[ObjectStore] = None) -> Optional[Dict[str, Any]]:
+        """Load a session for display with its payloads held in the shared object store.
+        
+        Like load_session(session_id, fields), except each payload ('transcript',
+        'analysis') comes back as an ObjectHandle to a dict of the top-level sections
+        the fields ask for. The store is keyed by blob key and sections, so users
+        viewing the same content share one copy, and blobs are only read on a miss.
+        """
+        object_store = object_store or get_object_store()
+        
+        try:
+            stored_data = self._touch_session(session_id)
+            if stored_data is None:
+                return None
+            
+            self._add_to_history(stored_data)
+            payload_refs = stored_data.get('payload_refs', {})
             
+            # Top-level sections wanted from each payload (None means the whole payload)
+            sections: Dict[str, Optional[set]] = {}
+            for path in fields:
+                field, _, rest = path.partition('.')
+                if field not in payload_refs or sections.get(field, ()) is None:
+                    continue
+                
+                if rest:
+                    sections.setdefault(field, set()).add(rest.split('.', 1)[0])
+                else:
+                    sections[field] = None
+            
+            result = self._load_fields(stored_data, [path for path in fields if path.partition('.')[0] not in sections])
+            for field, wanted in sections.items():
+                key = payload_refs[field]
+                names = sorted(wanted) if wanted is not None else None
+                store_key = f"{key}:{','.join(names)}" if names else key
+                
+                result[field] = object_store.acquire(
+                    store_key,
+                    lambda key=key, names=names: self.blob_store.get(key) if names is None else self.blob_store.get_sections(key, names)
+                )
+            
+            return result
+        
         except Exception as e:
-            st.error(f"Error loading session: {e}")
+            self.reporter.error(f"Error loading session: {e}")
             return None
     
-    def get_recent_sessions(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get recent sessions for the current user"""
+    def get_recent_sessions(self, limit: Optional[int] = 10) -> List[Dict[str, Any]]:
+        """Get recent sessions for the current user (limit=None returns all)"""
         try:
+            self.session_index.refresh()
+            
             sessions = []
+            for entry in self.session_index.iter_newest_first():
+                if limit is not None and len(sessions) >= limit:
+                    break
+                sessions.append(dict(entry))
             
-            # Get all session files
-            session_files = list(self.sessions_dir.glob("*.json"))
+            return sessions
+        
+        except Exception as e:
+            self.reporter.error(f"Error getting recent sessions: {e}")
+            return []
+    
+    def list_sessions(self, cursor: Optional[str] = None, page_size: int = 20,
+                      channel: Optional[str] = None, summary_type: Optional[str] = None,
+                      since: Optional[str] = None, until: Optional[str] = None) -> Dict[str, Any]:
+        """Page through session history, newest first.
+        
+        The cursor encodes the (created_at, session_id) position of the last item
+        returned, so sessions saved while paging never shift or repeat later pages.
+        since/until are ISO dates or datetimes bounding created_at (until is inclusive
+        of the whole day when a bare date is given).
+        """
+        try:
+            self.session_index.refresh()
             
-            # Sort by modification time (most recent first)
-            session_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
+            position = self._decode_cursor(cursor) if cursor else None
             
-            # Load session metadata
-            for session_file in session_files[:limit]:
-                try:
-                    with open(session_file, 'r', encoding='utf-8') as f:
-                        session_data = json.load(f)
-                    
-                    # Extract relevant metadata
-                    session_info = {
-                        'session_id': session_data.get('session_id'),
-                        'title': session_data.get('video_info', {}).get('title', 'Unknown Video'),
-                        'channel': session_data.get('video_info', {}).get('channel', 'Unknown Channel'),
-                        'duration': session_data.get('video_info', {}).get('duration', 'Unknown'),
-                        'created_at': session_data.get('created_at'),
-                        'last_accessed': session_data.get('last_accessed'),
-                        'summary_type': session_data.get('settings', {}).get('summary_type', 'Comprehensive'),
-                        'url': session_data.get('url', '')
-                    }
-                    
-                    sessions.append(session_info)
-                    
-                except Exception as e:
-                    st.warning(f"Error loading session file {session_file}: {e}")
+            # Start at the upper date bound when it is earlier than the cursor
+            if until:
+                until_key = (self._date_bound(until, end_of_day=True), "\uffff")
+                if position is None or until_key < position:
+                    position = until_key
+            not_before = self._date_bound(since, end_of_day=False) if since else None
+            
+            page = []
+            for entry in self.session_index.iter_newest_first(before=position, not_before=not_before):
+                if channel and entry.get('channel') != channel:
+                    continue
+                if summary_type and entry.get('summary_type') != summary_type:
                     continue
+                
+                page.append(dict(entry))
+                if len(page) > page_size:
+                    break
             
-            return sessions
+            has_more = len(page) > page_size
+            page = page[:page_size]
             
+            return {
+                'sessions': page,
+                'next_cursor': self._encode_cursor(page[-1]) if has_more else None
+            }
+        
         except Exception as e:
-            st.error(f"Error getting recent sessions: {e}")
-            return []
+            self.reporter.error(f"Error listing sessions: {e}")
+            return {'sessions': [], 'next_cursor': None}
     
     def delete_session(self, session_id: str) -> bool:
         """Delete a session"""
         try:
-            session_file = self.sessions_dir / f"{session_id}.json"
-            
-            if session_file.exists():
-                session_file.unlink()
-                return True
-            
-            return False
-            
+            with self._store_lock():
+                return self._remove_session(session_id) is not None
+        
         except Exception as e:
-            st.error(f"Error deleting session: {e}")
+            self.reporter.error(f"Error deleting session: {e}")
             return False
     
     def cleanup_old_sessions(self, days_old: int = 30) -> int:
         """Clean up sessions older than specified days"""
         try:
-            cutoff_date = datetime.now() - timedelta(days=days_old)
-            deleted_count = 0
+            cutoff = (datetime.now() - timedelta(days=days_old)).isoformat()
             
-            session_files = list(self.sessions_dir.glob("*.json"))
-            
-            for session_file in session_files:
-                try:
-                    # Check file modification time
-                    if session_file.stat().st_mtime < cutoff_date.timestamp():
-                        session_file.unlink()
-                        deleted_count += 1
-                        
-                except Exception as e:
-                    st.warning(f"Error cleaning up session file {session_file}: {e}")
-                    continue
-            
-            return deleted_count
+            # Select from the index rather than stat-ing every file
+            with self._store_lock():
+                expired = [
+                    session_id for session_id, entry in self.session_index.entries().items()
+                    if (entry.get('last_accessed') or entry.get('created_at') or '') < cutoff
+                ]
             
+            removed_count, _ = self.evict_sessions(expired)
+            return removed_count
+        
         except Exception as e:
-            st.error(f"Error during cleanup: {e}")
+            self.reporter.error(f"Error during cleanup: {e}")
             return 0
     
     def export_session_history(self) -> Dict[str, Any]:
         """Export all session history"""
         try:
-            sessions = self.get_recent_sessions(limit=None)  # Get all sessions
+            # Page through the index with the history cursor rather than copying it in one go
+            sessions = []
+            cursor = None
+            while True:
+                page = self.list_sessions(cursor=cursor, page_size=100)
+                sessions.extend(page['sessions'])
+                cursor = page['next_cursor']
+                if cursor is None:
+                    break
             
             export_data = {
                 'export_info': {
@@ -165,17 +284,62 @@ class SessionManager:
             }
             
             return export_data
-            
+        
         except Exception as e:
-            st.error(f"Error exporting session history: {e}")
+            self.reporter.error(f"Error exporting session history: {e}")
             return {}
     
+    def iter_session_history(self, include_payloads: bool = False, compress: bool = False) -> Iterator[bytes]:
+        """Stream the session history as NDJSON byte chunks, newest first.
+        
+        The first line is an export_info record, followed by one session record per
+        line. Only one session is held in memory at a time, so histories of any
+        size can be written to a file, stdout or a download.
+        """
+        return iter_ndjson(self._iter_history_records(include_payloads), compress=compress)
+    
+    def write_session_history(self, path: Path, include_payloads: bool = False,
+                              compress: bool = False) -> int:
+        """Stream the session history into a file atomically; returns its size in bytes"""
+        return atomic_write_stream(
+            path,
+            self.iter_session_history(include_payloads=include_payloads, compress=compress),
+            self.fsync_policy
+        )
+    
+    def _iter_history_records(self, include_payloads: bool) -> Iterator[Dict[str, Any]]:
+        """Export records for iter_session_history"""
+        self.session_index.refresh()
+        
+        yield {
+            'type': 'export_info',
+            'export_type': 'session_history',
+            'generated_at': datetime.now().isoformat(),
+            'total_sessions': self.session_index.get_aggregates()['total_sessions'],
+            'include_payloads': include_payloads
+        }
+        
+        for entry in self.session_index.iter_newest_first():
+            if not include_payloads:
+                yield {'type': 'session', **entry}
+                continue
+            
+            # Sessions deleted while the export runs are skipped rather than failing it
+            try:
+                session_data = self.read_session(entry['session_id'])
+            except (FileNotFoundError, json.JSONDecodeError):
+                session_data = None
+            
+            if session_data is not None:
+                yield {'type': 'session', **session_data}
+    
     def get_session_stats(self) -> Dict[str, Any]:
         """Get statistics about user sessions"""
         try:
-            sessions = self.get_recent_sessions(limit=None)
+            self.session_index.refresh()
+            aggregates = self.session_index.get_aggregates()
             
-            if not sessions:
+            if not aggregates['total_sessions']:
                 return {
                     'total_sessions': 0,
                     'total_videos_analyzed': 0,
@@ -184,31 +348,9 @@ class SessionManager:
                     'channels_analyzed': []
                 }
             
-            # Calculate statistics
-            total_sessions = len(sessions)
-            
-            # Count summary types
-            summary_types = {}
-            channels = {}
-            dates = {}
-            
-            for session in sessions:
-                # Summary types
-                summary_type = session.get('summary_type', 'Unknown')
-                summary_types[summary_type] = summary_types.get(summary_type, 0) + 1
-                
-                # Channels
-                channel = session.get('channel', 'Unknown')
-                channels[channel] = channels.get(channel, 0) + 1
-                
-                # Dates
-                created_at = session.get('created_at', '')
-                if created_at:
-                    try:
-                        date = datetime.fromisoformat(created_at).date()
-                        dates[date] = dates.get(date, 0) + 1
-                    except:
-                        pass
+            summary_types = aggregates['summary_types']
+            channels = aggregates['channels']
+            dates = aggregates['daily']
             
             # Find favorites
             favorite_summary_type = max(summary_types.keys(), key=summary_types.get) if summary_types else 'None'
@@ -216,47 +358,64 @@ class SessionManager:
             top_channels = sorted(channels.items(), key=lambda x: x[1], reverse=True)[:5]
             
             return {
-                'total_sessions': total_sessions,
-                'total_videos_analyzed': total_sessions,
+                'total_sessions': aggregates['total_sessions'],
+                'total_videos_analyzed': self.session_index.video_count(),
                 'favorite_summary_type': favorite_summary_type,
-                'most_active_day': str(most_active_day),
+                'most_active_day': most_active_day,
                 'channels_analyzed': [{'name': name, 'count': count} for name, count in top_channels],
-                'summary_type_distribution': summary_types,
-                'activity_by_date': {str(date): count for date, count in dates.items()}
+                'summary_type_distribution': dict(summary_types),
+                'activity_by_date': dict(dates)
             }
-            
+        
         except Exception as e:
-            st.error(f"Error getting session stats: {e}")
+            self.reporter.error(f"Error getting session stats: {e}")
             return {}
     
+    def get_activity_rollup(self, period: str = 'daily', limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Session counts per day or ISO week, oldest first (for dashboards)"""
+        try:
+            if period not in SessionIndex.ROLLUP_PERIODS:
+                raise ValueError(f"Unknown rollup period '{period}'. Use one of: {', '.join(SessionIndex.ROLLUP_PERIODS)}")
+            
+            self.session_index.refresh()
+            buckets = sorted(self.session_index.get_aggregates()[period].items())
+            if limit:
+                buckets = buckets[-limit:]
+            
+            return [{'period': bucket, 'count': count} for bucket, count in buckets]
+        
+        except Exception as e:
+            self.reporter.error(f"Error getting activity rollup: {e}")
+            return []
+    
     def save_user_preferences(self, preferences: Dict[str, Any]) -> bool:
         """Save user preferences"""
         try:
-            preferences_file = self.sessions_dir / "user_preferences.json"
+            preferences_file = self.sessions_dir / self.PREFERENCES_FILENAME
             
-            with open(preferences_file, 'w', encoding='utf-8') as f:
-                json.dump(preferences, f, indent=2, ensure_ascii=False)
+            with self._store_lock():
+                atomic_write_json(preferences_file, preferences, self.fsync_policy, indent=2)
             
-            st.session_state.user_preferences = preferences
+            self.state['user_preferences'] = preferences
             return True
-            
+        
         except Exception as e:
-            st.error(f"Error saving preferences: {e}")
+            self.reporter.error(f"Error saving preferences: {e}")
             return False
     
     def _load_user_preferences(self) -> Dict[str, Any]:
         """Load user preferences"""
         try:
-            preferences_file = self.sessions_dir / "user_preferences.json"
+            preferences_file = self.sessions_dir / self.PREFERENCES_FILENAME
             
             if not preferences_file.exists():
                 return self._get_default_preferences()
             
             with open(preferences_file, 'r', encoding='utf-8') as f:
                 return json.load(f)
-                
+        
         except Exception as e:
-            st.warning(f"Error loading preferences: {e}")
+            self.reporter.warning(f"Error loading preferences: {e}")
             return self._get_default_preferences()
     
     def _get_default_preferences(self) -> Dict[str, Any]:
@@ -284,9 +443,9 @@ class SessionManager:
             session_id = hashlib.md5(hash_input).hexdigest()[:16]
             
             return session_id
-            
+        
         except Exception as e:
-            st.error(f"Error generating session ID: {e}")
+            self.reporter.error(f"Error generating session ID: {e}")
             return datetime.now().strftime("%Y%m%d_%H%M%S")
     
     def _add_to_history(self, session_data: Dict[str, Any]) -> None:
@@ -300,25 +459,28 @@ class SessionManager:
                 'summary_type': session_data.get('settings', {}).get('summary_type', 'Comprehensive')
             }
             
-            # Add to beginning of history
-            st.session_state.session_history.insert(0, history_item)
+            # Add to beginning of history (a shared manager may serve users it did not initialize)
+            history = self.state.setdefault('session_history', [])
+            history.insert(0, history_item)
             
             # Keep only recent items
-            max_history = st.session_state.user_preferences.get('max_session_history', 50)
-            st.session_state.session_history = st.session_state.session_history[:max_history]
-            
+            preferences = self.state.get('user_preferences') or self._get_default_preferences()
+            self.state['session_history'] = history[:preferences.get('max_session_history', 50)]
+        
         except Exception as e:
-            st.warning(f"Error adding to history: {e}")
+            self.reporter.warning(f"Error adding to history: {e}")
     
     def search_sessions(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Search sessions by title, channel, or content"""
         try:
-            sessions = self.get_recent_sessions(limit=None)
+            self.session_index.refresh()
             matching_sessions = []
             
             query_lower = query.lower()
             
-            for session in sessions:
+            for session in self.session_index.iter_newest_first():
+                if len(matching_sessions) >= limit:
+                    break
                 # Search in title
                 if query_lower in session.get('title', '').lower():
                     matching_sessions.append(session)
@@ -327,23 +489,433 @@ class SessionManager:
                     matching_sessions.append(session)
                 # Could extend to search in summary content
             
-            return matching_sessions[:limit]
-            
+            return [dict(session) for session in matching_sessions]
+        
         except Exception as e:
-            st.error(f"Error searching sessions: {e}")
+            self.reporter.error(f"Error searching sessions: {e}")
             return []
     
     def get_session_by_video_url(self, url: str) -> Optional[Dict[str, Any]]:
         """Find existing session for a video URL"""
         try:
-            sessions = self.get_recent_sessions(limit=None)
+            matches = self.find_sessions_for_video(url)
             
-            for session in sessions:
-                if session.get('url') == url:
-                    return self.load_session(session['session_id'])
+            if matches:
+                return self.load_session(matches[0]['session_id'])
             
             return None
+        
+        except Exception as e:
+            self.reporter.error(f"Error finding session by URL: {e}")
+            return None
+    
+    def find_sessions_for_video(self, url: str) -> List[Dict[str, Any]]:
+        """Indexed metadata for sessions of the same video, newest first (no payload loading)"""
+        video_id = extract_canonical_video_id(url)
+        if not video_id:
+            return []
+        
+        self.session_index.refresh()
+        return [
+            self.session_index.get(session_id)
+            for session_id in self.session_index.sessions_for_video(video_id)
+        ]
+    
+    def rebuild_index(self) -> int:
+        """Rebuild the session index from the session files on disk"""
+        with self._store_lock():
+            entries = []
             
+            for session_file in self._session_files():
+                try:
+                    entries.append(self._index_entry(
+                        self._read_session_file(session_file), session_file.stat().st_size
+                    ))
+                except Exception as e:
+                    self.reporter.warning(f"Error indexing session file {session_file}: {e}")
+                    continue
+            
+            return self.session_index.rebuild(entries)
+    
+    def rebuild_blob_refs(self) -> int:
+        """Rebuild blob refcounts from the references held by the session files"""
+        with self._lock:
+            expected_refs, _ = self._manifest_refs()
+            recovered = self.blob_store.rebuild_refs(expected_refs)
+        
+        self.reporter.warning(f"Rebuilt blob reference counts for {recovered} blobs from session files")
+        return recovered
+    
+    def migrate_legacy_sessions(self) -> int:
+        """Move payloads embedded in older session files into the blob store,
+        re-key blobs that older versions keyed by video and settings, and rewrite
+        older blobs in the sectioned layout"""
+        migrated = 0
+        
+        with self._store_lock():
+            for session_file in self._session_files():
+                try:
+                    session_data = self._read_session_file(session_file)
+                    previous = None
+                    
+                    if any(not self.blob_store.is_content_key(key) for key in session_data.get('payload_refs', {}).values()):
+                        previous = session_data
+                        session_data = self._load_payloads(previous)
+                    elif not any(field in session_data for field in self.PAYLOAD_FIELDS):
+                        continue
+                    
+                    stored_data = self._store_payloads(session_data)
+                    stored_bytes = self._write_session_file(session_file, stored_data)
+                    if previous is not None:
+                        self._release_payloads(previous)
+                    self.session_index.add(session_file.stem, self._index_entry(stored_data, stored_bytes))
+                    migrated += 1
+                
+                except Exception as e:
+                    self.reporter.warning(f"Error migrating session file {session_file}: {e}")
+                    continue
+            
+            # Blobs written before partial loading existed can only be decoded whole
+            self.blob_store.upgrade_layout()
+        
+        return migrated
+    
+    def get_storage_report(self) -> Dict[str, Any]:
+        """Report on-disk usage, compression and dedup ratios for session storage"""
+        try:
+            manifest_bytes = 0
+            legacy_sessions = 0
+            legacy_bytes = 0
+            session_files = self._session_files()
+            
+            for session_file in session_files:
+                size = session_file.stat().st_size
+                
+                try:
+                    session_data = self._read_session_file(session_file)
+                except Exception:
+                    continue
+                
+                if any(field in session_data for field in self.PAYLOAD_FIELDS):
+                    legacy_sessions += 1
+                    legacy_bytes += size
+                else:
+                    manifest_bytes += size
+            
+            blob_stats = self.blob_store.get_stats()
+            
+            return {
+                'total_sessions': len(session_files),
+                'legacy_sessions': legacy_sessions,
+                'legacy_bytes': legacy_bytes,
+                'manifest_bytes': manifest_bytes,
+                'blobs': blob_stats,
+                'total_stored_bytes': manifest_bytes + legacy_bytes + blob_stats['stored_bytes']
+            }
+        
         except Exception as e:
-            st.error(f"Error finding session by URL: {e}")
-            return None
\ No newline at end of file
+            self.reporter.error(f"Error building storage report: {e}")
+            return {}
+    
+    def evict_sessions(self, session_ids: List[str],
+                       archive: Optional[Callable[[Iterator[Dict[str, Any]]], None]] = None) -> Tuple[int, int]:
+        """Remove sessions in one locked batch, optionally archiving them first.
+        
+        archive receives an iterator over the batch's full sessions and must have
+        stored them durably when it returns; only the sessions it consumed are then
+        removed. If it raises, nothing is removed. Returns (sessions removed, bytes freed).
+        """
+        removed_count = 0
+        freed_bytes = 0
+        
+        with self._store_lock():
+            if archive:
+                archived = []
+                archive(self._iter_archivable(session_ids, archived))
+                session_ids = archived
+            
+            for session_id in session_ids:
+                try:
+                    freed = self._remove_session(session_id)
+                    if freed is not None:
+                        removed_count += 1
+                        freed_bytes += freed
+                
+                except Exception as e:
+                    self.reporter.warning(f"Error removing session {session_id}: {e}")
+                    continue
+        
+        return removed_count, freed_bytes
+    
+    def _iter_archivable(self, session_ids: List[str], archived: List[str]) -> Iterator[Dict[str, Any]]:
+        """Full sessions for evict_sessions to archive, noting each one handed out"""
+        for session_id in session_ids:
+            try:
+                session_data = self.read_session(session_id)
+            except Exception as e:
+                self.reporter.warning(f"Error reading session {session_id} for archiving: {e}")
+                continue
+            
+            if session_data is not None:
+                archived.append(session_id)
+                yield session_data
+    
+    def read_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Read a full session without touching last_accessed or UI state"""
+        session_file = self.sessions_dir / f"{session_id}.json"
+        
+        if not session_file.exists():
+            return None
+        
+        return self._load_payloads(self._read_session_file(session_file))
+    
+    def get_storage_usage(self) -> Dict[str, int]:
+        """Current session count and bytes on disk, from the index and refcount table"""
+        self.session_index.refresh()
+        self.blob_store.refresh()
+        aggregates = self.session_index.get_aggregates()
+        
+        return {
+            'sessions': aggregates['total_sessions'],
+            'bytes': aggregates['stored_bytes'] + self.blob_store.get_stats()['stored_bytes']
+        }
+    
+    def verify_integrity(self) -> List[str]:
+        """Check that session files, the index and blob refcounts agree; returns problems found"""
+        problems = []
+        
+        with self._store_lock():
+            expected_refs, session_ids = self._manifest_refs(problems)
+            
+            indexed_ids = set(self.session_index.entries())
+            for session_id in sorted(session_ids - indexed_ids):
+                problems.append(f"Session {session_id} missing from index")
+            for session_id in sorted(indexed_ids - session_ids):
+                problems.append(f"Index entry {session_id} has no session file")
+            
+            problems.extend(self.blob_store.verify(expected_refs))
+            
+            for temp_file in self.sessions_dir.rglob("*.tmp"):
+                problems.append(f"Leftover temporary file {temp_file.name}")
+        
+        return problems
+    
+    def _manifest_refs(self, problems: Optional[List[str]] = None) -> Tuple[Dict[str, int], set]:
+        """Blob references held by the session files, and the IDs of the readable sessions"""
+        expected_refs = {}
+        session_ids = set()
+        
+        for session_file in self._session_files():
+            try:
+                stored_data = self._read_session_file(session_file)
+            except Exception as e:
+                if problems is not None:
+                    problems.append(f"Unreadable session file {session_file.name}: {e}")
+                continue
+            
+            session_ids.add(session_file.stem)
+            for key in stored_data.get('payload_refs', {}).values():
+                expected_refs[key] = expected_refs.get(key, 0) + 1
+        
+        return expected_refs, session_ids
+    
+    def _encode_cursor(self, entry: Dict[str, Any]) -> str:
+        """Opaque pagination cursor for the position after entry"""
+        raw = json.dumps(list(SessionIndex.sort_key(entry))).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii')
+    
+    @staticmethod
+    def _date_bound(value: str, end_of_day: bool) -> str:
+        """ISO datetime to compare created_at with; a bare date covers its whole day"""
+        try:
+            day = date.fromisoformat(value)
+        except ValueError:
+            return datetime.fromisoformat(value).isoformat()
+        return datetime.combine(day, time.max if end_of_day else time.min).isoformat()
+    
+    def _decode_cursor(self, cursor: str) -> Tuple[str, str]:
+        """Decode a cursor produced by _encode_cursor"""
+        try:
+            created_at, session_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            return (created_at, session_id)
+        except Exception:
+            raise ValueError("Invalid session history cursor")
+    
+    def _session_files(self) -> List[Path]:
+        """List session documents, excluding preferences and other metadata files"""
+        return [
+            path for path in self.sessions_dir.glob("*.json")
+            if path.name not in self.METADATA_FILENAMES
+        ]
+    
+    def _index_entry(self, session_data: Dict[str, Any], stored_bytes: int = 0) -> Dict[str, Any]:
+        """Lightweight session metadata kept in the index and shown in history lists"""
+        video_info = session_data.get('video_info', {})
+        
+        return {
+            'session_id': session_data.get('session_id'),
+            'video_id': video_info.get('video_id') or extract_canonical_video_id(session_data.get('url', '')),
+            'title': video_info.get('title', 'Unknown Video'),
+            'channel': video_info.get('channel', 'Unknown Channel'),
+            'duration': video_info.get('duration', 'Unknown'),
+            'created_at': session_data.get('created_at'),
+            'last_accessed': session_data.get('last_accessed'),
+            'summary_type': session_data.get('settings', {}).get('summary_type', 'Comprehensive'),
+            'url': session_data.get('url', ''),
+            'stored_bytes': stored_bytes
+        }
+    
+    def _read_session_file(self, session_file: Path) -> Dict[str, Any]:
+        """Read a stored session document as-is (payloads not resolved)"""
+        with open(session_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def _write_session_file(self, session_file: Path, stored_data: Dict[str, Any]) -> int:
+        """Write a stored session document atomically.
+        
+        Returns the number of bytes written, which the index records as the
+        session's stored_bytes.
+        """
+        data = json.dumps(stored_data, indent=2, ensure_ascii=False).encode('utf-8')
+        atomic_write_bytes(session_file, data, self.fsync_policy)
+        return len(data)
+    
+    def _remove_session(self, session_id: str) -> Optional[int]:
+        """Delete a session file, its index entry and blob references; returns bytes freed.
+        
+        The caller must hold the store lock. Returns None if the session does not exist.
+        """
+        session_file = self.sessions_dir / f"{session_id}.json"
+        
+        if not session_file.exists():
+            # Drop stale index entries left behind by a crashed writer
+            self.session_index.remove(session_id)
+            return None
+        
+        stored_data = self._read_session_file(session_file)
+        freed = session_file.stat().st_size
+        session_file.unlink()
+        freed += self._release_payloads(stored_data)
+        self.session_index.remove(session_id)
+        
+        return freed
+    
+    @contextmanager
+    def _store_lock(self):
+        """Hold the store-wide writer lock with the index and refcounts synced from disk"""
+        with self._lock:
+            self.session_index.refresh()
+            self.blob_store.refresh()
+            if self.blob_store.needs_rebuild:
+                self.rebuild_blob_refs()
+            yield
+    
+    def _touch_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Read a stored session and record the access in the index's access journal"""
+        session_file = self.sessions_dir / f"{session_id}.json"
+        
+        with self._store_lock():
+            if not session_file.exists():
+                return None
+            
+            stored_data = self._read_session_file(session_file)
+            stored_data['last_accessed'] = datetime.now().isoformat()
+            self.session_index.record_access(session_id, stored_data['last_accessed'])
+        
+        return stored_data
+    
+    def _store_payloads(self, session_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a copy of the session with payloads replaced by blob references"""
+        stored_data = {k: v for k, v in session_data.items() if k not in self.PAYLOAD_FIELDS}
+        payload_refs = {}
+        
+        for field in self.PAYLOAD_FIELDS:
+            if session_data.get(field) is not None:
+                payload_refs[field] = self.blob_store.put(field, session_data[field])
+        
+        stored_data['payload_refs'] = payload_refs
+        return stored_data
+    
+    def _load_payloads(self, stored_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Resolve blob references back into a full session"""
+        session_data = {k: v for k, v in stored_data.items() if k != 'payload_refs'}
+        
+        for field, key in stored_data.get('payload_refs', {}).items():
+            session_data[field] = self.blob_store.get(key)
+        
+        return session_data
+    
+    def _load_fields(self, stored_data: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+        """Resolve dotted field paths, reading only the blob sections they need"""
+        payload_refs = stored_data.get('payload_refs', {})
+        
+        # Top-level sections wanted from each payload blob (None means the whole payload)
+        wanted = {}
+        for path in fields:
+            field, _, rest = path.partition('.')
+            if field not in payload_refs or wanted.get(field, ()) is None:
+                continue
+            
+            if rest:
+                wanted.setdefault(field, set()).add(rest.split('.', 1)[0])
+            else:
+                wanted[field] = None
+        
+        source = {k: v for k, v in stored_data.items() if k != 'payload_refs'}
+        for field, sections in wanted.items():
+            key = payload_refs[field]
+            source[field] = self.blob_store.get(key) if sections is None else self.blob_store.get_sections(key, sorted(sections))
+        
+        result = {'session_id': stored_data.get('session_id')}
+        for path in fields:
+            parts = path.split('.')
+            value = source
+            
+            for part in parts:
+                if not isinstance(value, dict) or part not in value:
+                    break
+                value = value[part]
+            else:
+                target = result
+                for part in parts[:-1]:
+                    target = target.setdefault(part, {})
+                target[parts[-1]] = value
+        
+        return result
+    
+    def _release_payloads(self, stored_data: Dict[str, Any]) -> int:
+        """Drop blob references held by a stored session; returns bytes freed"""
+        return sum(
+            self.blob_store.release(key)
+            for key in stored_data.get('payload_refs', {}).values()
+        )
+
+class SessionReader:
+    """Read-only view of a session store for worker processes.
+    
+    Unlike SessionManager it takes no locks and never rebuilds the index or
+    refcount table, so every worker can open one cheaply; all writes stay with
+    the SessionManager that owns the store.
+    """
+    
+    def __init__(self, sessions_dir: Path):
+        self.sessions_dir = Path(sessions_dir)
+        self.blob_store = BlobStore(self.sessions_dir / "blobs", codec=SESSION_CONFIG['blob_codec'])
+    
+    def read_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Read a full session with its payloads resolved, or None if it does not exist"""
+        session_file = self.sessions_dir / f"{session_id}.json"
+        
+        try:
+            with open(session_file, 'r', encoding='utf-8') as f:
+                stored_data = json.load(f)
+        except FileNotFoundError:
+            return None
+        
+        # Pick up blobs written since this reader was opened
+        self.blob_store.refresh()
+        session_data = {k: v for k, v in stored_data.items() if k != 'payload_refs'}
+        for field, key in stored_data.get('payload_refs', {}).items():
+            session_data[field] = self.blob_store.get(key)
+        
+        return session_data
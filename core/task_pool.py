@@ -0,0 +1,164 @@
+# core/task_pool.py
+import atexit
+import logging
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+from config.settings import PERFORMANCE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+def _timed_call(fn: Callable, args: tuple, kwargs: dict) -> tuple:
+    """Worker body: run fn and report when it started and how long it ran"""
+    started = time.time()
+    run_started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, started, time.perf_counter() - run_started
+
+class TaskPool:
+    """Shared process pool for CPU-bound work such as document rendering.
+    
+    Script threads hand pure functions to worker processes so the GIL is no longer
+    shared between concurrent users. Functions and arguments must be picklable,
+    which in practice means module-level functions and plain data. Workers are
+    spawned on first use; with max_workers=0 tasks run inline in the caller.
+    """
+    
+    def __init__(self, max_workers: Optional[int] = None, latency_window: Optional[int] = None):
+        self.max_workers = max_workers if max_workers is not None else PERFORMANCE_CONFIG['process_pool_workers']
+        self.latency_window = latency_window or PERFORMANCE_CONFIG['task_latency_window']
+        
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self._in_flight = 0
+        self._latencies: deque = deque(maxlen=self.latency_window)
+        self._waits: deque = deque(maxlen=self.latency_window)
+        self.stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'cancelled': 0, 'restarts': 0}
+        
+        atexit.register(self.shutdown, wait=False)
+    
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Schedule fn(*args, **kwargs) on a worker process; returns a Future for its result"""
+        submitted = time.time()
+        outer = Future()
+        
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Task pool has been shut down")
+            self.stats['submitted'] += 1
+            self._in_flight += 1
+        
+        if self.max_workers <= 0:
+            outer.set_running_or_notify_cancel()
+            try:
+                self._finish(outer, submitted, _timed_call(fn, args, kwargs), None)
+            except Exception as e:
+                self._finish(outer, submitted, None, e)
+            return outer
+        
+        try:
+            inner = self._get_executor().submit(_timed_call, fn, args, kwargs)
+        except Exception as e:
+            self._finish(outer, submitted, None, e)
+            return outer
+        
+        outer.set_running_or_notify_cancel()
+        inner.add_done_callback(lambda done: self._collect(outer, submitted, done))
+        return outer
+    
+    def run(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """Run fn on a worker process and wait for its result"""
+        return self.submit(fn, *args, **kwargs).result(timeout=timeout)
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Task counters, queue depth and latency percentiles over recent tasks (seconds)"""
+        with self._lock:
+            metrics = dict(self.stats)
+            metrics['workers'] = self.max_workers
+            metrics['running'] = self._executor is not None
+            metrics['in_flight'] = self._in_flight
+            metrics['queue_depth'] = max(0, self._in_flight - max(self.max_workers, 1))
+            latencies = sorted(self._latencies)
+            waits = sorted(self._waits)
+        
+        metrics['latency'] = self._summarize(latencies)
+        metrics['queue_wait'] = self._summarize(waits)
+        return metrics
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting tasks; queued tasks are cancelled, running ones finish if wait is True"""
+        with self._lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+        
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Forking a multi-threaded Streamlit server is unsafe, so workers are spawned
+                context = multiprocessing.get_context('spawn')
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+            return self._executor
+    
+    def _collect(self, outer: Future, submitted: float, inner: Future) -> None:
+        """Done callback of a worker future: unwrap its timing and settle the caller's future"""
+        if inner.cancelled():
+            with self._lock:
+                self._in_flight -= 1
+                self.stats['cancelled'] += 1
+            outer.set_exception(RuntimeError("Task was cancelled by pool shutdown"))
+            return
+        
+        error = inner.exception()
+        if isinstance(error, BrokenProcessPool):
+            self._reset_executor()
+        self._finish(outer, submitted, None if error else inner.result(), error)
+    
+    def _finish(self, outer: Future, submitted: float, timed: Optional[tuple], error: Optional[BaseException]) -> None:
+        """Record a task's outcome and latency, then hand its result to the caller"""
+        finished = time.time()
+        
+        with self._lock:
+            self._in_flight -= 1
+            self._latencies.append(finished - submitted)
+            if error is None:
+                self.stats['completed'] += 1
+                self._waits.append(max(0.0, timed[1] - submitted))
+            else:
+                self.stats['failed'] += 1
+        
+        if error is None:
+            outer.set_result(timed[0])
+        else:
+            outer.set_exception(error)
+    
+    def _reset_executor(self) -> None:
+        """Drop a pool whose worker died so the next task starts a fresh one"""
+        with self._lock:
+            if self._executor is not None and not self._closed:
+                logger.warning("Task pool worker died; restarting the pool")
+                broken, self._executor = self._executor, None
+                self.stats['restarts'] += 1
+            else:
+                return
+        broken.shutdown(wait=False, cancel_futures=True)
+    
+    @staticmethod
+    def _summarize(samples: list) -> Dict[str, float]:
+        if not samples:
+            return {'count': 0, 'avg': 0.0, 'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+        
+        return {
+            'count': len(samples),
+            'avg': round(sum(samples) / len(samples), 4),
+            'p50': round(samples[len(samples) // 2], 4),
+            'p95': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+            'max': round(samples[-1], 4)
+        }
@@ -0,0 +1,201 @@
+# core/transcript_writer.py
+import re
+from importlib.util import find_spec
+from typing import Dict, Any, Iterator, List, Optional, BinaryIO
+from core.report_writer import SizeLimitedWriter, ExportTooLarge
+from config.settings import EXPORT_CONFIG
+
+# Columnar (Parquet / Arrow) export; pyarrow is imported on first use
+COLUMNAR_AVAILABLE = find_spec('pyarrow') is not None
+
+TIMESTAMP_PATTERN = re.compile(r'(?:(\d+):)?(\d{1,2}):(\d{2})')
+
+def parse_timestamp(value: str) -> Optional[float]:
+    """Seconds from the first MM:SS or HH:MM:SS in a string, or None"""
+    match = TIMESTAMP_PATTERN.search(value or '')
+    if not match:
+        return None
+    hours, minutes, seconds = match.groups()
+    return int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds)
+
+class TranscriptWriter:
+    """Streaming writer for transcript-only exports built from transcript_data['segments'].
+    
+    SRT, WebVTT and timestamped text are emitted as byte chunks; Parquet and Arrow
+    are written as record batches of BATCH_ROWS segments, so memory stays bounded
+    by one batch whatever the transcript length.
+    """
+    
+    FORMATS = ('TEXT FILE', 'SRT', 'WEBVTT', 'PARQUET', 'ARROW')
+    COLUMNAR_FORMATS = ('PARQUET', 'ARROW')
+    CHUNK_SIZE = 64 * 1024
+    BATCH_ROWS = 10000
+    
+    def __init__(self, transcript_data: Dict, analysis_results: Optional[Dict[str, Any]] = None,
+                 max_bytes: Optional[int] = None):
+        self.transcript_data = transcript_data or {}
+        self.analysis_results = analysis_results or {}
+        self.max_bytes = max_bytes if max_bytes is not None else EXPORT_CONFIG['max_file_size']
+    
+    def write(self, fileobj: BinaryIO, format_type: str) -> int:
+        """Stream the transcript into fileobj; returns the number of bytes written"""
+        format_type = format_type.upper()
+        out = SizeLimitedWriter(fileobj, self.max_bytes)
+        
+        if format_type in self.COLUMNAR_FORMATS:
+            self._write_columnar(out, format_type)
+        else:
+            for chunk in self.iter_chunks(format_type):
+                out.write(chunk)
+        
+        out.flush()
+        return out.written
+    
+    def iter_chunks(self, format_type: str) -> Iterator[bytes]:
+        """Byte chunks of an SRT, WebVTT or timestamped text transcript"""
+        format_type = format_type.upper()
+        pieces = {
+            'TEXT FILE': self._iter_text,
+            'SRT': self._iter_srt,
+            'WEBVTT': self._iter_webvtt
+        }.get(format_type)
+        
+        if pieces is None:
+            raise ValueError(f"Streaming is not supported for {format_type}")
+        
+        buffer = []
+        buffered = 0
+        written = 0
+        
+        for piece in pieces():
+            data = piece.encode('utf-8')
+            buffer.append(data)
+            buffered += len(data)
+            
+            if buffered >= self.CHUNK_SIZE:
+                written += buffered
+                self._check_size(written)
+                yield b''.join(buffer)
+                buffer, buffered = [], 0
+        
+        if buffer:
+            self._check_size(written + buffered)
+            yield b''.join(buffer)
+    
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        """One row per segment: start, duration, text, sentiment and topic.
+        
+        Topics come from the analysis timeline (the latest entry starting at or
+        before the segment); sentiment is only set when the segment carries one.
+        """
+        topics = self._timeline_topics()
+        topic_index = -1
+        
+        for segment in self._segments():
+            start = float(segment.get('start_time') or 0.0)
+            while topic_index + 1 < len(topics) and topics[topic_index + 1][0] <= start:
+                topic_index += 1
+            
+            sentiment = segment.get('sentiment')
+            yield {
+                'start': start,
+                'duration': float(segment.get('duration') or 0.0),
+                'text': segment.get('text', ''),
+                'sentiment': float(sentiment) if sentiment is not None else None,
+                'topic': topics[topic_index][1] if topic_index >= 0 else None
+            }
+    
+    def _segments(self) -> List[Dict[str, Any]]:
+        segments = self.transcript_data.get('segments')
+        if segments:
+            return segments
+        
+        # Transcripts without timing become a single cue spanning the video
+        text = self.transcript_data.get('text', '')
+        if not text:
+            return []
+        return [{'start_time': 0.0, 'duration': self.transcript_data.get('total_duration') or 0.0, 'text': text}]
+    
+    def _timeline_topics(self) -> List[tuple]:
+        topics = []
+        for event in self.analysis_results.get('timeline') or []:
+            start = parse_timestamp(event.get('timestamp', ''))
+            if start is not None and event.get('description'):
+                topics.append((start, event['description']))
+        return sorted(topics, key=lambda topic: topic[0])
+    
+    def _iter_text(self) -> Iterator[str]:
+        for segment in self._segments():
+            start = float(segment.get('start_time') or 0.0)
+            yield f"[{self._clock(start, '.')[:8]}] {self._cue_text(segment.get('text', ''))}\n"
+    
+    def _iter_srt(self) -> Iterator[str]:
+        for number, segment in enumerate(self._segments(), 1):
+            start = float(segment.get('start_time') or 0.0)
+            end = start + float(segment.get('duration') or 0.0)
+            yield (f"{number}\n{self._clock(start, ',')} --> {self._clock(end, ',')}\n"
+                   f"{self._cue_text(segment.get('text', ''))}\n\n")
+    
+    def _iter_webvtt(self) -> Iterator[str]:
+        yield "WEBVTT\n\n"
+        for segment in self._segments():
+            start = float(segment.get('start_time') or 0.0)
+            end = start + float(segment.get('duration') or 0.0)
+            # "-->" would be read as a cue timing line
+            text = self._cue_text(segment.get('text', '')).replace('-->', '->')
+            yield f"{self._clock(start, '.')} --> {self._clock(end, '.')}\n{text}\n\n"
+    
+    def _write_columnar(self, out: SizeLimitedWriter, format_type: str) -> None:
+        """Write Parquet or Arrow IPC file format one record batch at a time"""
+        if not COLUMNAR_AVAILABLE:
+            raise ValueError(f"{format_type.title()} export requires pyarrow")
+        
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        schema = pa.schema([
+            ('start', pa.float64()),
+            ('duration', pa.float64()),
+            ('text', pa.string()),
+            ('sentiment', pa.float64()),
+            ('topic', pa.string())
+        ])
+        sink = pa.PythonFile(out, mode='w')
+        
+        if format_type == 'PARQUET':
+            writer = pq.ParquetWriter(sink, schema, compression='zstd')
+        else:
+            writer = pa.ipc.new_file(sink, schema)
+        
+        try:
+            batch = {name: [] for name in schema.names}
+            for row in self.iter_rows():
+                for name in schema.names:
+                    batch[name].append(row[name])
+                
+                if len(batch['start']) >= self.BATCH_ROWS:
+                    writer.write_batch(pa.record_batch(list(batch.values()), schema=schema))
+                    batch = {name: [] for name in schema.names}
+            
+            if batch['start']:
+                writer.write_batch(pa.record_batch(list(batch.values()), schema=schema))
+        finally:
+            writer.close()
+    
+    def _check_size(self, size: int) -> None:
+        if self.max_bytes and size > self.max_bytes:
+            raise ExportTooLarge(f"Transcript exceeds the {self.max_bytes:,} byte export limit")
+    
+    @staticmethod
+    def _cue_text(text: str) -> str:
+        # Blank lines end a cue in both subtitle formats
+        return ' '.join(text.split()) or '...'
+    
+    @staticmethod
+    def _clock(seconds: float, separator: str) -> str:
+        """HH:MM:SS plus milliseconds after separator (',' for SRT, '.' for WebVTT)"""
+        milliseconds = int(round(max(0.0, seconds) * 1000))
+        hours, milliseconds = divmod(milliseconds, 3600000)
+        minutes, milliseconds = divmod(milliseconds, 60000)
+        secs, milliseconds = divmod(milliseconds, 1000)
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{milliseconds:03d}"
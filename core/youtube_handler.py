@@ -1,45 +1,62 @@
 # core/youtube_handler.py
 import re
 import json
-from urllib.parse import urlparse, parse_qs
-from youtube_transcript_api import YouTubeTranscriptApi
-import requests
 from datetime import datetime
-import streamlit as st
+from utils.validators import extract_canonical_video_id
+from core.runtime import get_reporter, get_secret
+from config.settings import PERFORMANCE_CONFIG
 
-class YouTubeHandler:
-    def __init__(self):
-        self.youtube_api_key = st.secrets.get("YOUTUBE_API_KEY", "")
+def format_timestamp(seconds):
+    """Format seconds to MM:SS or HH:MM:SS format"""
+    try:
+        hours = int(seconds // 3600)
+        minutes = int((seconds % 3600) // 60)
+        seconds = int(seconds % 60)
+        
+        if hours > 0:
+            return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+        else:
+            return f"{minutes:02d}:{seconds:02d}"
+    except:
+        return "00:00"
+
+def process_transcript_entries(transcript_list):
+    """Build full text and timestamped segments from raw caption entries (runs on the task pool)"""
+    texts = []
+    timestamped_segments = []
+    
+    for entry in transcript_list:
+        text = entry['text'].strip()
+        texts.append(text)
         
+        timestamped_segments.append({
+            'timestamp': format_timestamp(entry['start']),
+            'start_time': entry['start'],
+            'duration': entry['duration'],
+            'text': text
+        })
+    
+    return {
+        'text': " ".join(texts).strip(),
+        'segments': timestamped_segments,
+        'total_segments': len(timestamped_segments),
+        'total_duration': timestamped_segments[-1]['start_time'] + timestamped_segments[-1]['duration'] if timestamped_segments else 0
+    }
+
+class YouTubeHandler:
+    def __init__(self, task_pool=None, api_key=None, reporter=None):
+        self.youtube_api_key = api_key if api_key is not None else get_secret("YOUTUBE_API_KEY")
+        self.reporter = reporter or get_reporter()
+        self.task_pool = task_pool
+    
     def extract_video_id(self, youtube_url):
         """Extract video ID from various YouTube URL formats"""
         try:
-            youtube_url = youtube_url.strip()
-            
-            # Pattern for youtu.be short URLs
-            if 'youtu.be' in youtube_url:
-                video_id = youtube_url.split('youtu.be/')[-1].split('?')[0].split('&')[0]
-                return video_id
-            
-            # Pattern for youtube.com URLs
-            if 'youtube.com' in youtube_url:
-                parsed_url = urlparse(youtube_url)
-                query_params = parse_qs(parsed_url.query)
-                
-                if 'v' in query_params:
-                    video_id = query_params['v'][0]
-                    return video_id
-            
-            # Regex fallback
-            video_id_pattern = r'(?:v=|/)([a-zA-Z0-9_-]{11})'
-            match = re.search(video_id_pattern, youtube_url)
-            if match:
-                return match.group(1)
-            
-            return None
-            
+            # Shared with the session index so every URL form maps to the same ID
+            return extract_canonical_video_id(youtube_url)
+        
         except Exception as e:
-            st.error(f"Error extracting video ID: {e}")
+            self.reporter.error(f"Error extracting video ID: {e}")
             return None
     
     def get_video_info(self, youtube_url):
@@ -47,7 +64,7 @@ class YouTubeHandler:
         video_id = self.extract_video_id(youtube_url)
         if not video_id:
             return None
-            
+        
         try:
             # Basic info that we can get without API
             video_info = {
@@ -74,14 +91,16 @@ class YouTubeHandler:
                     video_info.update(basic_info)
             
             return video_info
-            
+        
         except Exception as e:
-            st.error(f"Error getting video info: {e}")
+            self.reporter.error(f"Error getting video info: {e}")
             return None
     
     def _get_video_details_from_api(self, video_id):
         """Get detailed video information using YouTube API"""
         try:
+            import requests
+            
             url = f"https://www.googleapis.com/youtube/v3/videos"
             params = {
                 'part': 'snippet,statistics,contentDetails',
@@ -113,9 +132,9 @@ class YouTubeHandler:
                 }
             
             return None
-            
+        
         except Exception as e:
-            st.warning(f"Could not fetch detailed video info: {e}")
+            self.reporter.warning(f"Could not fetch detailed video info: {e}")
             return None
     
     def _get_basic_video_info(self, video_id):
@@ -158,29 +177,19 @@ class YouTubeHandler:
         video_id = self.extract_video_id(youtube_url)
         if not video_id:
             return None
-            
+        
         try:
+            # Imported here so the page can render before the HTTP stack loads
+            from youtube_transcript_api import YouTubeTranscriptApi
+            
             # Get transcript
             transcript_list = YouTubeTranscriptApi.get_transcript(video_id)
             
-            # Process transcript
-            full_text = ""
-            timestamped_segments = []
-            
-            for entry in transcript_list:
-                timestamp = self._format_timestamp(entry['start'])
-                text = entry['text'].strip()
-                
-                # Add to full text
-                full_text += " " + text
-                
-                # Add timestamped segment
-                timestamped_segments.append({
-                    'timestamp': timestamp,
-                    'start_time': entry['start'],
-                    'duration': entry['duration'],
-                    'text': text
-                })
+            # Large transcripts are processed on the shared process pool
+            if self.task_pool is not None and len(transcript_list) >= PERFORMANCE_CONFIG['offload_min_segments']:
+                processed = self.task_pool.run(process_transcript_entries, transcript_list)
+            else:
+                processed = process_transcript_entries(transcript_list)
             
             # Language detection
             try:
@@ -189,39 +198,24 @@ class YouTubeHandler:
             except:
                 language_codes = ['en']
             
-            return {
-                'text': full_text.strip(),
-                'segments': timestamped_segments,
-                'language_codes': language_codes,
-                'total_segments': len(timestamped_segments),
-                'total_duration': timestamped_segments[-1]['start_time'] + timestamped_segments[-1]['duration'] if timestamped_segments else 0
-            }
-            
+            processed['language_codes'] = language_codes
+            return processed
+        
         except Exception as e:
             error_msg = str(e)
             if "No transcripts found" in error_msg:
-                st.error("❌ This video doesn't have captions/subtitles available")
+                self.reporter.error("❌ This video doesn't have captions/subtitles available")
             elif "private" in error_msg.lower():
-                st.error("❌ This video is private or restricted")
+                self.reporter.error("❌ This video is private or restricted")
             elif "not available" in error_msg.lower():
-                st.error("❌ Transcript not available for this video")
+                self.reporter.error("❌ Transcript not available for this video")
             else:
-                st.error(f"❌ Error extracting transcript: {error_msg}")
+                self.reporter.error(f"❌ Error extracting transcript: {error_msg}")
             return None
     
     def _format_timestamp(self, seconds):
         """Format seconds to MM:SS or HH:MM:SS format"""
-        try:
-            hours = int(seconds // 3600)
-            minutes = int((seconds % 3600) // 60)
-            seconds = int(seconds % 60)
-            
-            if hours > 0:
-                return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-            else:
-                return f"{minutes:02d}:{seconds:02d}"
-        except:
-            return "00:00"
+        return format_timestamp(seconds)
     
     def get_video_chapters(self, transcript_data):
         """Extract potential chapter information from transcript"""
@@ -244,9 +238,9 @@ class YouTubeHandler:
                     })
             
             return chapters
-            
+        
         except Exception as e:
-            st.warning(f"Could not extract chapters: {e}")
+            self.reporter.warning(f"Could not extract chapters: {e}")
             return []
     
     def search_transcript(self, transcript_data, query):
@@ -264,7 +258,7 @@ class YouTubeHandler:
                     })
             
             return results
-            
+        
         except Exception as e:
-            st.error(f"Error searching transcript: {e}")
+            self.reporter.error(f"Error searching transcript: {e}")
             return []
\ No newline at end of file
@@ -0,0 +1,75 @@
+# tests/conftest.py
+import threading
+import time
+import pytest
+from core.ai_processor import AIProcessor
+from core.analysis_jobs import AnalysisJobRunner
+from core.session_manager import SessionManager
+
+class FlakyResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+class FlakyModel:
+    """Fake Gemini model that fails prompts containing one of the fail_on phrases"""
+    
+    def __init__(self, text: str = "- \"A quote long enough to keep\"\n- Another point", fail_on=()):
+        self.text = text
+        self.fail_on = set(fail_on)
+        self.calls = 0
+        self.prompts = []
+        self._lock = threading.Lock()
+    
+    def generate_content(self, prompt: str) -> FlakyResponse:
+        instructions = prompt.split("\n\nTranscript:\n", 1)[0].lower()
+        with self._lock:
+            self.calls += 1
+            self.prompts.append(instructions)
+        
+        if any(phrase in instructions for phrase in self.fail_on):
+            raise RuntimeError("503 Service Unavailable")
+        return FlakyResponse(self.text)
+
+class FakeYouTubeHandler:
+    def __init__(self):
+        self.downloads = 0
+    
+    def extract_transcript(self, url):
+        self.downloads += 1
+        return {'text': "Welcome to the video. Today we talk about testing.", 'language_codes': ['en']}
+
+@pytest.fixture
+def flaky_model() -> FlakyModel:
+    return FlakyModel()
+
+@pytest.fixture
+def processor(flaky_model) -> AIProcessor:
+    """AIProcessor wired to the fake model, retrying without delays"""
+    ai_processor = AIProcessor(api_key="test-key")
+    ai_processor._model = flaky_model
+    ai_processor.base_delay = 0
+    return ai_processor
+
+@pytest.fixture
+def runner(tmp_path, processor):
+    """Single-worker job runner with its own session store and jobs directory"""
+    job_runner = AnalysisJobRunner(
+        FakeYouTubeHandler(), processor, SessionManager(tmp_path / "sessions"),
+        max_workers=1, jobs_dir=tmp_path / "jobs"
+    )
+    yield job_runner
+    job_runner.shutdown(wait=True)
+
+@pytest.fixture
+def wait_for_job(runner):
+    """Block until a job leaves the queued/running states; returns its status"""
+    def wait(job_id, timeout=10.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            status = runner.get_status(job_id)
+            if status['status'] not in AnalysisJobRunner.ACTIVE_STATES:
+                return status
+            time.sleep(0.01)
+        raise AssertionError(f"Job {job_id} still {status['status']} after {timeout}s")
+    
+    return wait
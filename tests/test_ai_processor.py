@@ -0,0 +1,52 @@
+# tests/test_ai_processor.py
+from core.ai_processor import SECTION_ERROR_KEY
+from core.analysis_jobs import section_failed
+
+TRANSCRIPT = "Welcome to the video. Today we talk about testing."
+
+def test_every_section_goes_through_the_retry_helper(processor, flaky_model):
+    sections = processor.analysis_sections(summary_type='Comprehensive')
+    
+    results = processor.comprehensive_analysis(TRANSCRIPT, summary_type='Comprehensive')
+    
+    assert flaky_model.calls == len(sections)
+    assert 'section_errors' not in results
+    assert results['important_quotes'] == ["A quote long enough to keep"]
+
+def test_transient_errors_are_retried(processor, flaky_model):
+    flaky_model.fail_on.add('quotes')
+    original = flaky_model.generate_content
+    
+    def heal_after_first_failure(prompt):
+        try:
+            return original(prompt)
+        finally:
+            flaky_model.fail_on.clear()
+    
+    flaky_model.generate_content = heal_after_first_failure
+    result = processor.run_analysis_section('important_quotes', TRANSCRIPT)
+    
+    assert not section_failed(result)
+    assert flaky_model.calls == 2
+
+def test_exhausted_retries_return_failure_marker(processor, flaky_model):
+    flaky_model.fail_on.add('quotes')
+    
+    result = processor.run_analysis_section('important_quotes', TRANSCRIPT)
+    
+    assert section_failed(result)
+    assert result == {SECTION_ERROR_KEY: "API service unavailable."}
+    assert flaky_model.calls == processor.max_retries
+
+def test_failed_sections_are_kept_out_of_results(processor, flaky_model):
+    flaky_model.fail_on.add('sentiment')
+    finished = {}
+    
+    results = processor.comprehensive_analysis(
+        TRANSCRIPT, on_section=finished.__setitem__, summary_type='Comprehensive'
+    )
+    
+    assert section_failed(finished['sentiment_analysis'])
+    assert 'sentiment_analysis' not in results
+    assert results['section_errors'] == {'sentiment_analysis': "API service unavailable."}
+    assert not any(section_failed(result) for name, result in finished.items() if name != 'sentiment_analysis')
@@ -0,0 +1,92 @@
+# tests/test_analysis_jobs.py
+import json
+import time
+from core.analysis_jobs import AnalysisJobRunner
+from tests.conftest import FakeYouTubeHandler
+
+URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+SETTINGS = {'summary_type': 'Comprehensive', 'language': 'English'}
+
+def test_resume_reruns_only_failed_sections(runner, flaky_model, wait_for_job):
+    flaky_model.fail_on.add('quotes')
+    job_id = runner.submit(URL, {'video_id': 'dQw4w9WgXcQ'}, SETTINGS)
+    
+    status = wait_for_job(job_id)
+    assert status['status'] == 'failed'
+    assert status['sections']['important_quotes'] == 'failed'
+    assert status['section_errors'] == {'important_quotes': "API service unavailable."}
+    assert all(state == 'done' for name, state in status['sections'].items() if name != 'important_quotes')
+    
+    flaky_model.fail_on.clear()
+    calls_before = flaky_model.calls
+    assert runner.resume(job_id)
+    
+    status = wait_for_job(job_id)
+    assert status['status'] == 'done'
+    assert flaky_model.calls == calls_before + 1
+    assert runner.youtube_handler.downloads == 1
+    
+    session = runner.session_manager.read_session(status['session_id'])
+    assert session['analysis']['important_quotes'] == ["A quote long enough to keep"]
+    assert 'section_errors' not in session['analysis']
+
+def _finished_job(runner, wait_for_job):
+    job_id = runner.submit(URL, {'video_id': 'dQw4w9WgXcQ'}, SETTINGS)
+    wait_for_job(job_id)
+    return job_id
+
+def _rewrite_job(runner, job_id, **fields):
+    path = runner._state_path(job_id)
+    job = json.loads(path.read_text(encoding='utf-8'))
+    job.update(fields)
+    path.write_text(json.dumps(job), encoding='utf-8')
+
+def _sibling(runner):
+    return AnalysisJobRunner(FakeYouTubeHandler(), runner.ai_processor, runner.session_manager,
+                             max_workers=1, jobs_dir=runner.jobs_dir)
+
+def test_sibling_leaves_live_leased_job_alone(runner, wait_for_job):
+    job_id = _finished_job(runner, wait_for_job)
+    _rewrite_job(runner, job_id, status='running', owner='other-host:1', lease_until=time.time() + 60)
+    
+    sibling = _sibling(runner)
+    try:
+        assert sibling.get_status(job_id)['status'] == 'running'
+        assert sibling.resume_interrupted() == 0
+        assert not sibling.resume(job_id)
+        assert json.loads(runner._state_path(job_id).read_text(encoding='utf-8'))['owner'] == 'other-host:1'
+    finally:
+        sibling.shutdown(wait=True)
+
+def test_sibling_takes_over_expired_lease(runner, wait_for_job):
+    job_id = _finished_job(runner, wait_for_job)
+    _rewrite_job(runner, job_id, status='running', owner='other-host:1', lease_until=time.time() - 1)
+    
+    sibling = _sibling(runner)
+    try:
+        assert sibling.get_status(job_id)['status'] == 'interrupted'
+        assert sibling.resume_interrupted() == 1
+        deadline = time.monotonic() + 10
+        while sibling.get_status(job_id)['status'] in sibling.ACTIVE_STATES and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert sibling.get_status(job_id)['status'] == 'done'
+        assert json.loads(runner._state_path(job_id).read_text(encoding='utf-8'))['owner'] == sibling.owner
+    finally:
+        sibling.shutdown(wait=True)
+
+def test_cleanup_expires_failed_and_interrupted_jobs(runner, flaky_model, wait_for_job):
+    flaky_model.fail_on.add('quotes')
+    failed_id = _finished_job(runner, wait_for_job)
+    interrupted_id = _finished_job(runner, wait_for_job)
+    runner._jobs[interrupted_id].update(status='interrupted', finished_at=None)
+    
+    old = time.time() - runner.job_ttl - 1
+    for job_id in (failed_id, interrupted_id):
+        runner._jobs[job_id].update(finished_at=runner._jobs[job_id]['finished_at'] and old, updated_at=old)
+        assert runner._transcript_path(job_id).exists()
+    
+    assert runner.cleanup_expired() == 2
+    for job_id in (failed_id, interrupted_id):
+        assert runner.get_status(job_id) is None
+        assert not runner._state_path(job_id).exists()
+        assert not runner._transcript_path(job_id).exists()
@@ -0,0 +1,80 @@
+# tests/test_blob_store.py
+import json
+import re
+from cli import build_parser
+from core.blob_store import BlobStore
+from core.session_manager import SessionManager
+from tests.test_session_store import make_session
+
+def test_distinct_content_for_same_video_and_settings_gets_distinct_blobs(tmp_path):
+    session_manager = SessionManager(tmp_path)
+    first = session_manager.save_session(make_session("FIRST"))
+    second = session_manager.save_session(make_session("SECOND"))
+    
+    refs = [session_manager._read_session_file(tmp_path / f"{sid}.json")['payload_refs'] for sid in (first, second)]
+    
+    assert refs[0]['analysis'] != refs[1]['analysis']
+    # The identical transcript is shared
+    assert refs[0]['transcript'] == refs[1]['transcript']
+    assert session_manager.read_session(first)['analysis']['main_summary'] == "FIRST"
+    assert session_manager.read_session(second)['analysis']['main_summary'] == "SECOND"
+
+def test_identical_payloads_share_one_blob_until_the_last_release(tmp_path):
+    blob_store = BlobStore(tmp_path)
+    payload = {'main_summary': "shared", 'topics': ["a", "b"]}
+    
+    key = blob_store.put('analysis', payload)
+    assert blob_store.put('analysis', dict(payload)) == key
+    blob_path = blob_store._blob_path(key, blob_store.codec)
+    assert blob_store.get_stats()['reference_count'] == 2
+    
+    assert blob_store.release(key) == 0
+    assert blob_path.exists()
+    assert blob_store.get_sections(key, ['topics']) == {'topics': ["a", "b"]}
+    
+    assert blob_store.release(key) > 0
+    assert not blob_path.exists()
+    assert blob_store.get(key) is None
+    assert blob_store.get_stats()['blob_count'] == 0
+
+def test_deleting_sessions_releases_their_blobs(tmp_path):
+    session_manager = SessionManager(tmp_path)
+    first = session_manager.save_session(make_session("FIRST"))
+    second = session_manager.save_session(make_session("SECOND"))
+    
+    assert session_manager.delete_session(first)
+    assert session_manager.read_session(second)['analysis']['main_summary'] == "SECOND"
+    assert session_manager.blob_store.get_stats()['blob_count'] == 2
+    assert session_manager.verify_integrity() == []
+    
+    assert session_manager.delete_session(second)
+    assert session_manager.blob_store.get_stats()['blob_count'] == 0
+    assert not list((tmp_path / "blobs").glob("*/*.json.*"))
+
+def test_unreadable_refcounts_are_rebuilt_not_reset(tmp_path):
+    session_manager = SessionManager(tmp_path)
+    first = session_manager.save_session(make_session("FIRST"))
+    session_manager.save_session(make_session("SECOND"))
+    refs_file = tmp_path / "blobs" / BlobStore.REFS_FILENAME
+    expected = json.loads(refs_file.read_text(encoding='utf-8'))
+    
+    refs_file.write_text('{"truncated', encoding='utf-8')
+    
+    session_manager = SessionManager(tmp_path)
+    assert json.loads(refs_file.read_text(encoding='utf-8')) == expected
+    assert session_manager.read_session(first)['analysis']['main_summary'] == "FIRST"
+    assert session_manager.verify_integrity() == []
+
+def test_verify_points_legacy_keys_at_the_real_migrate_command(tmp_path):
+    blob_store = BlobStore(tmp_path)
+    key = blob_store.put('analysis', {'main_summary': "legacy"})
+    legacy_key = "analysis-" + "0" * 32
+    entry = blob_store._refs.pop(key)
+    blob_store._blob_path(legacy_key, entry['codec']).parent.mkdir(parents=True, exist_ok=True)
+    blob_store._blob_path(key, entry['codec']).rename(blob_store._blob_path(legacy_key, entry['codec']))
+    blob_store._refs[legacy_key] = entry
+    
+    [problem] = blob_store.verify({legacy_key: 1})
+    command = re.search(r"`python cli\.py ([^`]+)`", problem).group(1)
+    args = build_parser().parse_args(command.split())
+    assert args.command == 'storage-report' and args.migrate
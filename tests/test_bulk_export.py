@@ -0,0 +1,30 @@
+# tests/test_bulk_export.py
+import json
+import zipfile
+import core.bulk_export as bulk_export
+from core.bulk_export import BulkExporter
+from core.export_cache import ExportCache
+from core.export_handler import ExportHandler
+from core.session_manager import SessionManager, SessionReader
+from core.task_pool import TaskPool
+from tests.test_session_store import make_session
+
+def test_bulk_export_renders_on_the_task_pool_with_a_read_only_reader(tmp_path, monkeypatch):
+    session_manager = SessionManager(tmp_path / "sessions")
+    session_ids = [session_manager.save_session(make_session(summary)) for summary in ("FIRST", "SECOND")]
+    monkeypatch.setattr(bulk_export, 'EXPORTS_DIR', tmp_path / "exports")
+    monkeypatch.setattr(bulk_export, '_worker_state', {'export_handler': ExportHandler(cache=ExportCache(cache_dir=tmp_path / "cache"))})
+    
+    task_pool = TaskPool(max_workers=0)
+    report = BulkExporter(session_manager, task_pool=task_pool).export(tmp_path / "out.zip", ["MARKDOWN"], kinds=['summary'])
+    
+    assert report['failures'] == []
+    assert sorted(document['session_id'] for document in report['documents']) == sorted(session_ids)
+    assert task_pool.get_metrics()['completed'] == 2
+    assert isinstance(bulk_export._worker_state['session_reader'], SessionReader)
+    
+    with zipfile.ZipFile(tmp_path / "out.zip") as archive:
+        manifest = json.loads(archive.read("manifest.json"))
+        summaries = [archive.read(name).decode('utf-8') for name in archive.namelist() if name.endswith("summary.md")]
+    assert len(manifest['documents']) == 2
+    assert any("FIRST" in summary for summary in summaries) and any("SECOND" in summary for summary in summaries)
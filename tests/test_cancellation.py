@@ -0,0 +1,68 @@
+# tests/test_cancellation.py
+import threading
+import time
+import pytest
+from core.cancellation import CancellationToken, OperationCancelled
+
+URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+SETTINGS = {'summary_type': 'Comprehensive', 'language': 'English'}
+TRANSCRIPT = "Welcome to the video. Today we talk about testing."
+
+def cancel_when_prompted(model, phrase, cancel):
+    """Call cancel() while the first prompt containing phrase is in flight"""
+    original = model.generate_content
+    pending = [cancel]
+    
+    def generate_content(prompt):
+        if pending and phrase in prompt.split("\n\nTranscript:\n", 1)[0].lower():
+            pending.pop()()
+        return original(prompt)
+    
+    model.generate_content = generate_content
+
+def test_cancel_during_backoff_skips_retries_and_later_sections(processor, flaky_model):
+    processor.base_delay = 30
+    flaky_model.fail_on.add('quotes')
+    token = CancellationToken()
+    sections = processor.analysis_sections(summary_type='Comprehensive')
+    later = len(sections) - sections.index('important_quotes') - 1
+    
+    threading.Timer(0.05, token.cancel).start()
+    start = time.monotonic()
+    results = processor.comprehensive_analysis(TRANSCRIPT, cancel_token=token, summary_type='Comprehensive')
+    
+    assert time.monotonic() - start < 5
+    assert set(results) == {'main_summary', 'key_takeaways'}
+    assert flaky_model.calls == 3
+    # The abandoned retry plus every section after the cancelled one
+    assert token.calls_avoided == 1 + later
+
+def test_every_section_checks_the_token(processor, flaky_model):
+    token = CancellationToken()
+    token.cancel()
+    
+    for section in processor.SECTIONS:
+        with pytest.raises(OperationCancelled):
+            processor.run_analysis_section(section, TRANSCRIPT, cancel_token=token, summary_type='Comprehensive')
+    
+    assert flaky_model.calls == 0
+    assert token.calls_avoided == len(processor.SECTIONS)
+
+def test_cancelled_job_keeps_finished_sections_and_resumes(runner, flaky_model, wait_for_job):
+    job_ids = []
+    cancel_when_prompted(flaky_model, 'topics', lambda: runner.cancel(job_ids[0]))
+    job_ids.append(runner.submit(URL, {'video_id': 'dQw4w9WgXcQ'}, SETTINGS))
+    
+    status = wait_for_job(job_ids[0])
+    sections = list(status['sections'])
+    finished = sections[:sections.index('topics') + 1]
+    assert status['status'] == 'cancelled'
+    assert [name for name, state in status['sections'].items() if state == 'done'] == finished
+    assert status['calls_avoided'] == len(sections) - len(finished)
+    assert runner.stats == {'cancelled': 1, 'calls_avoided': len(sections) - len(finished)}
+    
+    calls_before = flaky_model.calls
+    assert runner.resume(job_ids[0])
+    status = wait_for_job(job_ids[0])
+    assert status['status'] == 'done'
+    assert flaky_model.calls == calls_before + len(sections) - len(finished)
@@ -0,0 +1,39 @@
+# tests/test_export_cache.py
+import gc
+import weakref
+from core.export_cache import ExportCache
+from core.object_store import get_object_store
+
+class Payload(dict):
+    """dict that supports weak references, so tests can see when it is freed"""
+
+def test_shared_payload_digest_is_memoized_without_pinning(tmp_path):
+    cache = ExportCache(cache_dir=tmp_path)
+    store = get_object_store()
+    handle = store.acquire("analysis-test-memo", lambda: Payload(main_summary="text"))
+    payload = handle.get()
+    
+    digest = cache.digest(payload)
+    assert cache.digest(payload) == digest
+    assert list(cache._digests.items()) == [("analysis-test-memo", digest)]
+    
+    freed = weakref.ref(payload)
+    del payload, handle
+    gc.collect()
+    store.collect()
+    assert freed() is None
+
+def test_unshared_payloads_are_not_memoized(tmp_path):
+    cache = ExportCache(cache_dir=tmp_path)
+    payload = Payload(main_summary="text")
+    
+    digest = cache.digest(payload)
+    payload['main_summary'] = "changed"
+    
+    assert cache.digest(payload) != digest
+    assert not cache._digests
+    
+    freed = weakref.ref(payload)
+    del payload
+    gc.collect()
+    assert freed() is None
@@ -0,0 +1,14 @@
+# tests/test_export_handler.py
+from core.export_cache import ExportCache
+from core.export_handler import ExportHandler
+
+def test_markdown_summary_renders_markdown_headings(tmp_path):
+    handler = ExportHandler(cache=ExportCache(cache_dir=tmp_path))
+    analysis = {'main_summary': "A short summary.", 'key_takeaways': ["First point", "Second point"]}
+    
+    summary = handler.export_summary(analysis, "MARKDOWN").decode('utf-8')
+    
+    assert summary.startswith("# Video Analysis Summary")
+    assert "## Main Summary" in summary
+    assert "## Key Takeaways" in summary
+    assert "=" * 20 not in summary
@@ -0,0 +1,65 @@
+# tests/test_retention.py
+import pytest
+from core.retention import ArchivePack, RetentionService
+from core.session_manager import SessionManager
+from tests.test_session_store import make_session
+
+@pytest.fixture
+def session_manager(tmp_path):
+    manager = SessionManager(tmp_path)
+    for i in range(5):
+        session_data = make_session(f"session {i}")
+        session_data['created_at'] = f"2026-01-0{i + 1}T00:00:00"
+        manager.save_session(session_data)
+    return manager
+
+def archived_sessions(service):
+    return {
+        session_data['session_id']: session_data
+        for pack_path in sorted(service.archive_dir.glob("pack-*.ndjson.gz"))
+        for session_data in ArchivePack.read(pack_path)
+    }
+
+def test_each_batch_is_archived_before_it_is_evicted(session_manager):
+    originals = {sid: session_manager.read_session(sid) for sid in session_manager.session_index.entries()}
+    service = RetentionService(session_manager, max_sessions=0, archive=True, batch_size=2)
+    
+    report = service.run_once()
+    
+    assert report['sessions_removed'] == report['sessions_archived'] == 5
+    assert len(report['archive_packs']) == 3
+    assert archived_sessions(service) == originals
+
+def test_failure_in_a_later_batch_keeps_earlier_batches_recoverable(session_manager, monkeypatch):
+    originals = {sid: session_manager.read_session(sid) for sid in session_manager.session_index.entries()}
+    service = RetentionService(session_manager, max_sessions=0, archive=True, batch_size=2)
+    evict_sessions = session_manager.evict_sessions
+    batches = []
+    
+    def fail_second_batch(session_ids, archive=None):
+        batches.append(list(session_ids))
+        if len(batches) == 2:
+            raise TimeoutError("Timed out waiting for lock")
+        return evict_sessions(session_ids, archive=archive)
+    
+    monkeypatch.setattr(session_manager, 'evict_sessions', fail_second_batch)
+    with pytest.raises(TimeoutError):
+        service.run_once()
+    
+    remaining = set(session_manager.session_index.entries())
+    assert remaining.isdisjoint(batches[0])
+    assert archived_sessions(service) == {sid: originals[sid] for sid in batches[0]}
+    assert not list(service.archive_dir.glob(".*.tmp"))
+
+def test_failed_archive_write_removes_nothing(session_manager, monkeypatch):
+    service = RetentionService(session_manager, max_sessions=0, archive=True, batch_size=2)
+    
+    def disk_full(self, session_data):
+        raise OSError("No space left on device")
+    
+    monkeypatch.setattr(ArchivePack, 'write', disk_full)
+    with pytest.raises(OSError):
+        service.run_once()
+    
+    assert len(session_manager.session_index.entries()) == 5
+    assert not list(service.archive_dir.glob("*pack-*"))
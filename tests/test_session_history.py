@@ -0,0 +1,58 @@
+# tests/test_session_history.py
+import pytest
+from core.session_manager import SessionManager
+from tests.test_session_store import make_session
+
+@pytest.fixture
+def session_manager(tmp_path):
+    manager = SessionManager(tmp_path)
+    # Two sessions a day from 2026-03-01 to 2026-03-05, the last one at the very end of its day
+    for day in range(1, 6):
+        for hour, minute in ((9, "00:00"), (23, "59:59.999999")):
+            session_data = make_session(f"day {day} hour {hour}")
+            session_data['created_at'] = f"2026-03-{day:02d}T{hour:02d}:{minute}"
+            manager.save_session(session_data)
+    return manager
+
+def page_through(session_manager, **filters):
+    created, cursor = [], None
+    while True:
+        page = session_manager.list_sessions(cursor=cursor, page_size=3, **filters)
+        created.extend(entry['created_at'] for entry in page['sessions'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            return created
+
+def test_pages_cover_history_newest_first_without_repeats(session_manager):
+    created = page_through(session_manager)
+    
+    assert len(created) == 10
+    assert created == sorted(created, reverse=True)
+
+def test_new_sessions_do_not_shift_later_pages(session_manager):
+    first = session_manager.list_sessions(page_size=4)
+    session_manager.save_session(make_session("newest"))
+    
+    second = session_manager.list_sessions(cursor=first['next_cursor'], page_size=4)
+    
+    assert second['sessions'][0]['created_at'] < first['sessions'][-1]['created_at']
+
+def test_bare_until_date_includes_the_whole_day(session_manager):
+    created = page_through(session_manager, until="2026-03-03")
+    
+    assert created[0] == "2026-03-03T23:59:59.999999"
+    assert len(created) == 6
+
+def test_since_and_until_datetimes_are_inclusive(session_manager):
+    created = page_through(session_manager, since="2026-03-02T09:00:00", until="2026-03-04T09:00:00")
+    
+    assert created == [
+        "2026-03-04T09:00:00", "2026-03-03T23:59:59.999999", "2026-03-03T09:00:00",
+        "2026-03-02T23:59:59.999999", "2026-03-02T09:00:00"
+    ]
+
+def test_export_session_history_pages_through_everything(session_manager):
+    export = session_manager.export_session_history()
+    
+    assert export['export_info']['total_sessions'] == 10
+    assert [entry['created_at'] for entry in export['sessions']] == page_through(session_manager)
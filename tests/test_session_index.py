@@ -0,0 +1,66 @@
+# tests/test_session_index.py
+import json
+from core.session_index import SessionIndex
+from core.session_manager import SessionManager
+from tests.test_session_store import make_session
+
+def test_loading_a_session_appends_to_the_access_journal(tmp_path):
+    session_manager = SessionManager(tmp_path)
+    session_id = session_manager.save_session(make_session("journal"))
+    session_file = tmp_path / f"{session_id}.json"
+    index_file = tmp_path / SessionIndex.INDEX_FILENAME
+    before = (session_file.read_bytes(), index_file.read_bytes())
+    
+    loaded = session_manager.load_session(session_id)
+    
+    assert (session_file.read_bytes(), index_file.read_bytes()) == before
+    assert (tmp_path / SessionIndex.ACCESS_LOG_FILENAME).read_text().startswith(session_id)
+    assert session_manager.session_index.get(session_id)['last_accessed'] == loaded['last_accessed']
+    # Other processes see the access by replaying the journal
+    assert SessionManager(tmp_path).session_index.get(session_id)['last_accessed'] == loaded['last_accessed']
+
+def test_access_journal_is_compacted_into_the_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(SessionIndex, 'ACCESS_LOG_COMPACT_BYTES', 200)
+    session_manager = SessionManager(tmp_path)
+    session_id = session_manager.save_session(make_session("compact"))
+    saved_at = session_manager.session_index.get(session_id)['last_accessed']
+    access_log = tmp_path / SessionIndex.ACCESS_LOG_FILENAME
+    
+    for _ in range(10):
+        last_accessed = session_manager.load_session(session_id)['last_accessed']
+        assert access_log.stat().st_size <= 200
+    
+    index = json.loads((tmp_path / SessionIndex.INDEX_FILENAME).read_text(encoding='utf-8'))
+    assert index['sessions'][session_id]['last_accessed'] > saved_at
+    assert SessionIndex(tmp_path).get(session_id)['last_accessed'] == last_accessed
+
+def index_entry(session_id: str, created_at: str) -> dict:
+    return {'session_id': session_id, 'created_at': created_at, 'video_id': session_id[:11], 'stored_bytes': 10}
+
+def test_ordering_is_kept_in_step_with_adds_and_removes(tmp_path):
+    index = SessionIndex(tmp_path)
+    for i in range(20):
+        index.add(f"s{i:02d}", index_entry(f"s{i:02d}", f"2026-01-{(i * 7) % 28 + 1:02d}T10:00:00"))
+    list(index.iter_newest_first())
+    
+    index.remove("s03")
+    index.add("s05", index_entry("s05", "2026-02-01T00:00:00"))
+    index.add("s99", index_entry("s99", "2025-12-31T00:00:00"))
+    
+    assert index._ordering == sorted(SessionIndex.sort_key(entry) for entry in index.entries().values())
+    assert [entry['session_id'] for entry in index.iter_newest_first()][:1] == ["s05"]
+
+def test_iteration_survives_concurrent_changes(tmp_path):
+    index = SessionIndex(tmp_path)
+    for i in range(10):
+        index.add(f"s{i}", index_entry(f"s{i}", f"2026-01-{i + 1:02d}T00:00:00"))
+    
+    seen = []
+    for entry in index.iter_newest_first():
+        seen.append(entry['session_id'])
+        if entry['session_id'] == "s7":
+            # A newer session and the removal of an older one, mid-iteration
+            index.add("new", index_entry("new", "2026-03-01T00:00:00"))
+            index.remove("s2")
+    
+    assert seen == ["s9", "s8", "s7", "s6", "s5", "s4", "s3", "s1", "s0"]
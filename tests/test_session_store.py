@@ -0,0 +1,84 @@
+# tests/test_session_store.py
+import json
+import multiprocessing
+from pathlib import Path
+from core.session_manager import SessionManager
+
+VIDEO_ID = "dQw4w9WgXcQ"
+SETTINGS = {'summary_type': 'Comprehensive', 'language': 'English'}
+
+def make_session(summary: str) -> dict:
+    """Sessions differing only in their analysis: same video, settings and transcript"""
+    return {
+        'url': f"https://www.youtube.com/watch?v={VIDEO_ID}",
+        'video_info': {'video_id': VIDEO_ID, 'title': "Test video", 'channel': "Test channel"},
+        'transcript': {'text': "shared transcript " * 50, 'language_codes': ['en']},
+        'analysis': {'main_summary': summary, 'key_takeaways': [summary]},
+        'settings': dict(SETTINGS)
+    }
+
+def _writer(sessions_dir: str, worker_id: int, iterations: int) -> dict:
+    """Save distinct analyses of one video, deleting every third session again"""
+    session_manager = SessionManager(Path(sessions_dir))
+    saved = {}
+    
+    for i in range(iterations):
+        session_data = make_session(f"worker {worker_id} iteration {i}")
+        session_id = session_manager.save_session(session_data)
+        if i % 3 == 2:
+            session_manager.delete_session(session_id)
+        else:
+            saved[session_id] = session_data['analysis']
+    
+    return saved
+
+def test_concurrent_writers_read_back_what_they_saved(tmp_path):
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(3) as pool:
+        results = pool.starmap(_writer, [(str(tmp_path), worker_id, 12) for worker_id in range(3)])
+    
+    expected = {session_id: analysis for saved in results for session_id, analysis in saved.items()}
+    session_manager = SessionManager(tmp_path)
+    
+    assert len(expected) == 3 * 8
+    for session_id, analysis in expected.items():
+        assert session_manager.read_session(session_id)['analysis'] == analysis
+    assert set(session_manager.session_index.entries()) == set(expected)
+    assert session_manager.verify_integrity() == []
+
+def test_verify_detects_blob_content_changed_on_disk(tmp_path):
+    session_manager = SessionManager(tmp_path)
+    session_id = session_manager.save_session(make_session("original"))
+    key = session_manager._read_session_file(tmp_path / f"{session_id}.json")['payload_refs']['analysis']
+    entry = session_manager.blob_store._refs[key]
+    
+    # Another blob's bytes under this key, as a writer overwriting it in place would leave them
+    other = session_manager.blob_store.put('analysis', {'main_summary': "replacement", 'key_takeaways': []})
+    blob_path = session_manager.blob_store._blob_path(key, entry['codec'])
+    blob_path.write_bytes(session_manager.blob_store._blob_path(other, entry['codec']).read_bytes())
+    
+    assert f"Blob {key} content does not match its recorded digest" in session_manager.verify_integrity()
+
+def test_migrate_rekeys_blobs_not_addressed_by_content(tmp_path):
+    session_manager = SessionManager(tmp_path)
+    session_id = session_manager.save_session(make_session("legacy"))
+    session_file = tmp_path / f"{session_id}.json"
+    
+    # Rename the analysis blob to a key derived from the video and settings, as older versions did
+    blob_store = session_manager.blob_store
+    stored_data = session_manager._read_session_file(session_file)
+    key = stored_data['payload_refs']['analysis']
+    legacy_key = "analysis-" + "0" * 32
+    entry = blob_store._refs.pop(key)
+    blob_store._blob_path(legacy_key, entry['codec']).parent.mkdir(parents=True, exist_ok=True)
+    blob_store._blob_path(key, entry['codec']).rename(blob_store._blob_path(legacy_key, entry['codec']))
+    blob_store._refs[legacy_key] = entry
+    blob_store._save_refs()
+    stored_data['payload_refs']['analysis'] = legacy_key
+    session_file.write_text(json.dumps(stored_data), encoding='utf-8')
+    
+    assert any("is not keyed by its content" in problem for problem in session_manager.verify_integrity())
+    assert session_manager.migrate_legacy_sessions() == 1
+    assert session_manager._read_session_file(session_file)['payload_refs']['analysis'] == key
+    assert session_manager.read_session(session_id)['analysis']['main_summary'] == "legacy"
+    assert session_manager.verify_integrity() == []
@@ -0,0 +1,190 @@
+# utils/file_ops.py
+import json
+import os
+import tempfile
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator, Optional, Union
+
+# Platform-specific advisory locking
+try:
+    import fcntl
+    _LOCK_BACKEND = 'fcntl'
+except ImportError:
+    import msvcrt
+    _LOCK_BACKEND = 'msvcrt'
+
+# fsync policies for atomic writes:
+#   'always' - fsync the file and its directory (survives power loss)
+#   'file'   - fsync the file only (rename may be lost on power loss, never torn)
+#   'never'  - rely on the OS page cache (atomic against other processes only)
+FSYNC_POLICIES = ('always', 'file', 'never')
+
+# Output is flushed in chunks of about this size when streaming
+STREAM_CHUNK_SIZE = 64 * 1024
+
+def atomic_write_bytes(path: Union[str, Path], data: bytes, fsync_policy: str = 'file') -> None:
+    """Write a file via temp-file-and-rename so readers never see partial content"""
+    atomic_write_stream(path, [data], fsync_policy)
+
+def atomic_write_stream(path: Union[str, Path], chunks: Iterable[bytes], fsync_policy: str = 'file') -> int:
+    """Write an iterable of byte chunks atomically; returns the number of bytes written"""
+    written = 0
+    
+    with atomic_open(path, fsync_policy) as f:
+        for chunk in chunks:
+            f.write(chunk)
+            written += len(chunk)
+    
+    return written
+
+@contextmanager
+def atomic_open(path: Union[str, Path], fsync_policy: str = 'file') -> Iterator[BinaryIO]:
+    """Binary file handle whose contents replace path only if the block completes"""
+    if fsync_policy not in FSYNC_POLICIES:
+        raise ValueError(f"Unknown fsync policy '{fsync_policy}'. Use one of: {', '.join(FSYNC_POLICIES)}")
+    
+    path = Path(path)
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            yield f
+            f.flush()
+            if fsync_policy != 'never':
+                os.fsync(f.fileno())
+        
+        os.replace(temp_name, path)
+    
+    except BaseException:
+        try:
+            os.unlink(temp_name)
+        except OSError:
+            pass
+        raise
+    
+    if fsync_policy == 'always':
+        fsync_directory(path.parent)
+
+def atomic_write_json(path: Union[str, Path], data: Any, fsync_policy: str = 'file', **json_kwargs) -> None:
+    """Serialize JSON and write it atomically"""
+    json_kwargs.setdefault('ensure_ascii', False)
+    atomic_write_bytes(path, json.dumps(data, **json_kwargs).encode('utf-8'), fsync_policy)
+
+def iter_ndjson(records: Iterable[Any], compress: bool = False,
+                chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """Encode records as NDJSON (optionally gzip'd), yielding byte chunks.
+    
+    Records are serialized one at a time, so memory stays bounded by the largest
+    single record no matter how many records are streamed.
+    """
+    # wbits=31 produces a standard gzip container readable by gzip/zcat
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    buffer = bytearray()
+    
+    for record in records:
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+        buffer += compressor.compress(line) if compressor else line
+        
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    
+    if compressor:
+        buffer += compressor.flush()
+    
+    if buffer:
+        yield bytes(buffer)
+
+def fsync_directory(directory: Path) -> None:
+    """Persist a rename by syncing the containing directory (POSIX only)"""
+    if os.name != 'posix':
+        return
+    
+    dir_fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+class FileLock:
+    """Advisory inter-process lock backed by a lock file.
+    
+    Re-entrant within a thread and exclusive across threads and processes.
+    """
+    
+    def __init__(self, lock_path: Union[str, Path], timeout: float = 30.0, poll_interval: float = 0.01):
+        self.lock_path = Path(lock_path)
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd: Optional[int] = None
+    
+    def acquire(self) -> None:
+        """Block until the lock is held, raising TimeoutError after timeout seconds"""
+        deadline = time.monotonic() + self.timeout
+        
+        if not self._thread_lock.acquire(timeout=self.timeout):
+            raise TimeoutError(f"Timed out waiting for lock {self.lock_path}")
+        
+        try:
+            if self._depth == 0:
+                self._fd = self._acquire_file_lock(deadline)
+            self._depth += 1
+        except BaseException:
+            self._thread_lock.release()
+            raise
+    
+    def release(self) -> None:
+        """Release one level of the lock"""
+        self._depth -= 1
+        
+        if self._depth == 0 and self._fd is not None:
+            try:
+                self._unlock(self._fd)
+            finally:
+                os.close(self._fd)
+                self._fd = None
+        
+        self._thread_lock.release()
+    
+    def __enter__(self) -> 'FileLock':
+        self.acquire()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.release()
+    
+    def _acquire_file_lock(self, deadline: float) -> int:
+        """Poll for the OS-level lock until the deadline"""
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        
+        while True:
+            try:
+                self._try_lock(fd)
+                return fd
+            except OSError:
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise TimeoutError(f"Timed out waiting for lock {self.lock_path}")
+                time.sleep(self.poll_interval)
+    
+    @staticmethod
+    def _try_lock(fd: int) -> None:
+        if _LOCK_BACKEND == 'fcntl':
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    
+    @staticmethod
+    def _unlock(fd: int) -> None:
+        if _LOCK_BACKEND == 'fcntl':
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
@@ -1,6 +1,6 @@
 # utils/validators.py
 import re
-from urllib.parse import urlparse
+from urllib.parse import urlparse, parse_qs
 from typing import Optional, Dict, Any
 
 def validate_youtube_url(url: str) -> bool:
@@ -48,6 +48,42 @@ def validate_video_id(video_id: str) -> bool:
     
     return bool(re.match(pattern, video_id))
 
+def extract_canonical_video_id(url: str) -> Optional[str]:
+    """Extract the canonical 11-character video ID from any YouTube URL form"""
+    if not url or not isinstance(url, str):
+        return None
+    
+    url = url.strip()
+    if '://' not in url:
+        url = 'https://' + url
+    
+    try:
+        parsed_url = urlparse(url)
+        domain = parsed_url.netloc.lower().split(':')[0]
+        path_parts = [part for part in parsed_url.path.split('/') if part]
+        candidate = None
+        
+        if domain == 'youtu.be' or domain.endswith('.youtu.be'):
+            # https://youtu.be/VIDEO_ID?si=...&t=30
+            candidate = path_parts[0] if path_parts else None
+        elif 'youtube' in domain:
+            # watch?v=VIDEO_ID, /shorts/VIDEO_ID, /embed/VIDEO_ID, /live/VIDEO_ID, /v/VIDEO_ID
+            query_params = parse_qs(parsed_url.query)
+            if 'v' in query_params:
+                candidate = query_params['v'][0]
+            elif len(path_parts) >= 2 and path_parts[0] in ('shorts', 'embed', 'live', 'v', 'e'):
+                candidate = path_parts[1]
+        
+        if candidate and validate_video_id(candidate):
+            return candidate
+        
+        # Regex fallback
+        match = re.search(r'(?:v=|/)([a-zA-Z0-9_-]{11})(?![a-zA-Z0-9_-])', url)
+        return match.group(1) if match else None
+        
+    except Exception:
+        return None
+
 def validate_analysis_settings(settings: Dict[str, Any]) -> Dict[str, Any]:
     """Validate and sanitize analysis settings"""
     
@@ -81,7 +117,7 @@ def validate_analysis_settings(settings: Dict[str, Any]) -> Dict[str, Any]:
         validated_settings[setting] = bool(value) if isinstance(value, (bool, int, str)) else default_settings[setting]
     
     # Export format validation
-    valid_export_formats = ['PDF', 'Word Document', 'Text File', 'JSON']
+    valid_export_formats = ['PDF', 'Word Document', 'Text File', 'Markdown', 'JSON']
     export_format = settings.get('export_format', default_settings['export_format'])
     validated_settings['export_format'] = export_format if export_format in valid_export_formats else default_settings['export_format']
     
@@ -183,7 +219,7 @@ def validate_export_format(format_type: str) -> str:
     
     format_type = format_type.strip().title()
     
-    valid_formats = ["PDF", "Word Document", "Text File", "JSON"]
+    valid_formats = ["PDF", "Word Document", "Text File", "Markdown", "JSON"]
     
     # Direct match
     if format_type in valid_formats:
@@ -198,6 +234,8 @@ def validate_export_format(format_type: str) -> str:
         return "Word Document"
     elif 'json' in format_lower:
         return "JSON"
+    elif 'markdown' in format_lower or format_lower == 'md':
+        return "Markdown"
     else:
         return "Text File"
 